@@ -5,11 +5,28 @@ Add this to Django's MIDDLEWARE setting to capture real request data
 import json
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 # Log file path - shared with security dashboard
 SECURITY_LOGS_DIR = Path(__file__).resolve().parent.parent.parent.parent / "security" / "logs"
 
+# Path fragments that mark a request as security-relevant, checked in order
+PATH_CATEGORIES = (
+    ("authentication", ('/auth/', '/login', '/token')),
+    ("admin_action", ('/admin/',)),
+)
+
+
+@lru_cache(maxsize=2048)
+def classify_path(path):
+    """Return the SIEM category for a request path, or None if it isn't auth/admin"""
+    for category, fragments in PATH_CATEGORIES:
+        for fragment in fragments:
+            if fragment in path:
+                return category
+    return None
+
 
 class SecurityLoggingMiddleware:
     """
@@ -21,8 +38,8 @@ class SecurityLoggingMiddleware:
         SECURITY_LOGS_DIR.mkdir(parents=True, exist_ok=True)
     
     def __call__(self, request):
-        # Record start time
-        start_time = time.time()
+        # Record start time (monotonic, for the duration only)
+        start_ns = time.perf_counter_ns()
         
         # Get client IP
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -35,14 +52,17 @@ class SecurityLoggingMiddleware:
         response = self.get_response(request)
         
         # Calculate response time
-        response_time_ms = (time.time() - start_time) * 1000
+        response_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+        
+        # Wall-clock timestamp formatted once, shared by both log entries
+        timestamp = datetime.now().isoformat()
         
         # Get user
         user = str(request.user) if hasattr(request, 'user') and request.user.is_authenticated else 'anonymous'
         
         # Log the request
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "method": request.method,
             "path": request.path,
             "status_code": response.status_code,
@@ -65,7 +85,7 @@ class SecurityLoggingMiddleware:
             conn_file = SECURITY_LOGS_DIR / "connections.jsonl"
             try:
                 conn_entry = {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": timestamp,
                     "ip": ip,
                     "endpoint": request.path,
                     "user_agent": request.META.get('HTTP_USER_AGENT', '')[:200],
@@ -93,26 +113,21 @@ class SecurityEventMiddleware:
         response = self.get_response(request)
         
         # Log security-relevant events
-        category = None
+        path = request.path
+        status_code = response.status_code
         action = None
         outcome = "success"
         
-        # Authentication events
-        if '/auth/' in request.path or '/login' in request.path or '/token' in request.path:
-            category = "authentication"
-            action = f"{request.method} {request.path}"
-            outcome = "success" if response.status_code < 400 else "failure"
-        
-        # Admin events
-        elif '/admin/' in request.path:
-            category = "admin_action"
-            action = f"{request.method} {request.path}"
-            outcome = "success" if response.status_code < 400 else "failure"
+        # Authentication / admin events (classification cached per path)
+        category = classify_path(path)
+        if category:
+            action = f"{request.method} {path}"
+            outcome = "success" if status_code < 400 else "failure"
         
         # Error events
-        elif response.status_code >= 400:
+        elif status_code >= 400:
             category = "api_error"
-            action = f"{request.method} {request.path} -> {response.status_code}"
+            action = f"{request.method} {path} -> {status_code}"
             outcome = "failure"
         
         # Log if relevant
@@ -127,7 +142,7 @@ class SecurityEventMiddleware:
                 "source_ip": ip,
                 "user": str(request.user) if hasattr(request, 'user') and request.user.is_authenticated else 'anonymous',
                 "outcome": outcome,
-                "details": {"status_code": response.status_code}
+                "details": {"status_code": status_code}
             }
             
             log_file = SECURITY_LOGS_DIR / "siem_events.jsonl"
@@ -21,10 +21,12 @@ app_name = 'api'
 from .auth_views import WalletLoginView
 from .views_faucet import ClaimTokensView
 
+# Explicit routes come first so the resolver matches them before scanning
+# the router's (format-suffixed) list/detail/action patterns.
 urlpatterns = [
-    path('', include(router.urls)),
     # path('users/', ...), # REMOVED
     path('auth/wallet/', WalletLoginView.as_view(), name='wallet-login'),
     path('wallets/<uuid:wallet_id>/update/', views.WalletUpdateView.as_view(), name='wallet-update'),
     path('faucet/', ClaimTokensView.as_view(), name='faucet'),
+    path('', include(router.urls)),
 ]
@@ -1,7 +1,7 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum, Count, Q, F
+from django.db.models import Sum, Count, Q, F, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from decimal import Decimal
 
@@ -15,6 +15,9 @@ from rest_framework import generics
 
 # NOTE: UserViewSet, UserCreateView, UserListView REMOVED as per refactor.
 
+# Relations walked by DonationSerializer (donor_details, proposal_title, round_id)
+DONATION_RELATED = ('donor__wallet', 'proposal__round')
+
 
 class WalletUpdateView(generics.UpdateAPIView):
     queryset = Wallet.objects.all()
@@ -152,7 +155,9 @@ class RoundViewSet(viewsets.ModelViewSet):
     def donations(self, request, pk=None):
         """Get all donations in this round"""
         round_obj = self.get_object()
-        donations = Donation.objects.filter(proposal__round=round_obj).order_by('-created_at')
+        donations = Donation.objects.filter(proposal__round=round_obj).select_related(
+            *DONATION_RELATED
+        ).order_by('-created_at')
         serializer = DonationSerializer(donations, many=True)
         return Response(serializer.data)
 
@@ -160,24 +165,29 @@ class RoundViewSet(viewsets.ModelViewSet):
     def donations_summary(self, request, pk=None):
         """Get summary of donations for all proposals in this round"""
         round_obj = self.get_object()
-        proposals = round_obj.proposals.annotate(
+        # values() rows skip model instantiation; the proposer columns are joined in
+        proposals = round_obj.proposals.values(
+            'proposal_id', 'title', 'status',
+            'proposer__username', 'proposer__wallet__address'
+        ).annotate(
             total_donated=Sum('donations__amount'),
             donation_count=Count('donations'),
             unique_donors=Count('donations__donor', distinct=True)
         )
         
-        data = []
-        for proposal in proposals:
-            data.append({
-                'proposal_id': proposal.proposal_id,
-                'title': proposal.title,
-                'status': proposal.status,
-                'total_donated': proposal.total_donated or 0,
-                'donation_count': proposal.donation_count,
-                'unique_donors': proposal.unique_donors,
+        data = [
+            {
+                'proposal_id': row['proposal_id'],
+                'title': row['title'],
+                'status': row['status'],
+                'total_donated': row['total_donated'] or 0,
+                'donation_count': row['donation_count'],
+                'unique_donors': row['unique_donors'],
                 # Use username or address for proposer
-                'proposer': proposal.proposer.username or proposal.proposer.address
-            })
+                'proposer': row['proposer__username'] or row['proposer__wallet__address']
+            }
+            for row in proposals
+        ]
         
         total_round_donations = sum(item['total_donated'] for item in data)
         
@@ -205,6 +215,8 @@ class RoundViewSet(viewsets.ModelViewSet):
         proposals = round_obj.proposals.annotate(
             total_donated=Sum('donations__amount'),
             # donation_count=Count('donations') # Removed unused annotation
+        ).prefetch_related(
+            Prefetch('donations', queryset=Donation.objects.only('proposal_id', 'amount'))
         )
         
         # Calculate quadratic funding matches
@@ -325,7 +337,7 @@ class ProposalViewSet(viewsets.ModelViewSet):
     def donations(self, request, pk=None):
         """Get all donations for this proposal"""
         proposal = self.get_object()
-        donations = proposal.donations.all().order_by('-created_at')
+        donations = proposal.donations.select_related(*DONATION_RELATED).order_by('-created_at')
         serializer = DonationSerializer(donations, many=True)
         return Response(serializer.data)
 
@@ -341,10 +353,14 @@ class ProposalViewSet(viewsets.ModelViewSet):
     def funding_summary(self, request, pk=None):
         """Get detailed funding summary for this proposal"""
         proposal = self.get_object()
-        total_donations = proposal.donations.aggregate(total=Sum('amount'))['total'] or 0
+        # One aggregate query per related table
+        donation_stats = proposal.donations.aggregate(
+            total=Sum('amount'),
+            count=Count('pk'),
+            unique_donors=Count('donor', distinct=True)
+        )
+        total_donations = donation_stats['total'] or 0
         total_matches = proposal.matches.aggregate(total=Sum('matched_amount'))['total'] or 0
-        donation_count = proposal.donations.count()
-        unique_donors = proposal.donations.values('donor').distinct().count()
         
         return Response({
             'proposal_id': proposal.proposal_id,
@@ -352,8 +368,8 @@ class ProposalViewSet(viewsets.ModelViewSet):
             'total_donations': total_donations,
             'total_matches': total_matches,
             'total_funding': total_donations + total_matches,
-            'donation_count': donation_count,
-            'unique_donors': unique_donors,
+            'donation_count': donation_stats['count'],
+            'unique_donors': donation_stats['unique_donors'],
             'status': proposal.status
         })
 
@@ -391,7 +407,7 @@ class ProposalViewSet(viewsets.ModelViewSet):
 
 
 class DonationViewSet(viewsets.ModelViewSet):
-    queryset = Donation.objects.all().order_by('-created_at')
+    queryset = Donation.objects.select_related(*DONATION_RELATED).order_by('-created_at')
     serializer_class = DonationSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['proposal', 'donor', 'proposal__round']
@@ -436,7 +452,7 @@ class DonationViewSet(viewsets.ModelViewSet):
         threshold = request.query_params.get('threshold', 100)
         large_donations = Donation.objects.filter(
             amount__gte=threshold
-        ).order_by('-created_at')[:20]
+        ).select_related(*DONATION_RELATED).order_by('-created_at')[:20]
         serializer = DonationSerializer(large_donations, many=True)
         return Response(serializer.data)
 
@@ -0,0 +1,32 @@
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0006_chain_session_block_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=BrinIndex(fields=['created_at'], name='donation_created_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donor', '-created_at'], name='donation_donor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['proposal', '-created_at'], name='donation_prop_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contractevent',
+            index=BrinIndex(fields=['timestamp'], name='contractevent_ts_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='contractevent',
+            index=models.Index(fields=['chain_session', '-timestamp'], name='contractevent_session_ts_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Now
+from django.contrib.postgres.indexes import BrinIndex
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.core.validators import MinValueValidator
 import uuid
@@ -42,7 +44,7 @@ class ChainSession(models.Model):
     grant_registry_address = models.CharField(max_length=255, help_text="Address of GrantRegistry contract for this session")
     deployment_block = models.IntegerField(default=0, help_text="Block number when GrantRegistry was deployed")
     deployment_block_hash = models.CharField(max_length=66, default='', help_text="Hash of deployment block - unique per node session")
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     is_active = models.BooleanField(default=True, db_index=True)
 
     class Meta:
@@ -96,7 +98,7 @@ class Donor(AbstractBaseUser, PermissionsMixin):
     
     # Profile
     reputation_score = models.FloatField(default=0.0)
-    joined_at = models.DateTimeField(auto_now_add=True)
+    joined_at = models.DateTimeField(db_default=Now(), editable=False)
 
     # Permissions
     is_active = models.BooleanField(default=True)
@@ -160,7 +162,7 @@ class Proposal(models.Model):
     
     funding_goal = models.DecimalField(max_digits=20, decimal_places=8, default=0.0)
     total_donations = models.DecimalField(max_digits=20, decimal_places=8, default=0.0)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
 
     def __str__(self):
         return self.title
@@ -171,7 +173,16 @@ class Donation(models.Model):
     proposal = models.ForeignKey(Proposal, on_delete=models.CASCADE, related_name='donations')
     amount = models.DecimalField(max_digits=20, decimal_places=8, validators=[MinValueValidator(0)])
     description = models.TextField(blank=True, default="")
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    class Meta:
+        indexes = [
+            # Donations are append-only, so created_at tracks physical order;
+            # BRIN serves the dashboard time-window scans at a fraction of a btree's size
+            BrinIndex(fields=['created_at'], name='donation_created_brin'),
+            models.Index(fields=['donor', '-created_at'], name='donation_donor_created_idx'),
+            models.Index(fields=['proposal', '-created_at'], name='donation_prop_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.amount} from {self.donor} to {self.proposal}"
@@ -201,7 +212,7 @@ class Payout(models.Model):
     round = models.ForeignKey(Round, on_delete=models.CASCADE, related_name='payouts')
     amount = models.DecimalField(max_digits=20, decimal_places=8, validators=[MinValueValidator(0)])
     tx_hash = models.CharField(max_length=255, unique=True, db_index=True)
-    distributed_at = models.DateTimeField(auto_now_add=True)
+    distributed_at = models.DateTimeField(db_default=Now(), editable=False)
 
 class ContractEvent(models.Model):
     event_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -212,6 +223,13 @@ class ContractEvent(models.Model):
     timestamp = models.DateTimeField()
     tx_hash = models.CharField(max_length=255, db_index=True)  # Removed unique - can repeat across sessions
 
+    class Meta:
+        indexes = [
+            BrinIndex(fields=['timestamp'], name='contractevent_ts_brin'),
+            # Event feed: active session's events, newest first
+            models.Index(fields=['chain_session', '-timestamp'], name='contractevent_session_ts_idx'),
+        ]
+
 # --- Sybil Resistance (Optional) ---
 class SybilScore(models.Model):
     score_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -1,3 +1,95 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.models import (
+    ChainSession, Wallet, Donor, MatchingPool, Round, Proposal, Donation, Match
+)
+
+
+class FundingSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        session = ChainSession.objects.create(grant_registry_address='0xregistry')
+        pool = MatchingPool.objects.create(total_funds=Decimal('1000'), replenished_by='Grant DAO')
+        now = timezone.now()
+        self.round = Round.objects.create(
+            matching_pool=pool, start_date=now, end_date=now + timedelta(days=7), status='active'
+        )
+        self.donors = [
+            Donor.objects.create(wallet=Wallet.objects.create(address=f'0xdonor{i}'))
+            for i in range(2)
+        ]
+        self.proposal = Proposal.objects.create(
+            proposer=self.donors[0], round=self.round, chain_session=session,
+            title='Proposal', description='Description'
+        )
+        Donation.objects.create(donor=self.donors[0], proposal=self.proposal, amount=Decimal('10'))
+        Donation.objects.create(donor=self.donors[0], proposal=self.proposal, amount=Decimal('5'))
+        Donation.objects.create(donor=self.donors[1], proposal=self.proposal, amount=Decimal('2.5'))
+        Match.objects.create(proposal=self.proposal, round=self.round, matched_amount=Decimal('7.5'))
+        self.url = f'/proposals/{self.proposal.pk}/funding_summary/'
+
+    def test_summary_aggregates(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Decimal(response.data['total_donations']), Decimal('17.5'))
+        self.assertEqual(Decimal(response.data['total_matches']), Decimal('7.5'))
+        self.assertEqual(Decimal(response.data['total_funding']), Decimal('25'))
+        self.assertEqual(response.data['donation_count'], 3)
+        self.assertEqual(response.data['unique_donors'], 2)
+
+    def test_summary_reflects_new_donation(self):
+        self.client.get(self.url)
+        Donation.objects.create(donor=self.donors[1], proposal=self.proposal, amount=Decimal('100'))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['donation_count'], 4)
+        self.assertEqual(Decimal(response.data['total_donations']), Decimal('117.5'))
+
+
+class RoundDonationsSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        session = ChainSession.objects.create(grant_registry_address='0xregistry')
+        pool = MatchingPool.objects.create(total_funds=Decimal('1000'), replenished_by='Grant DAO')
+        now = timezone.now()
+        self.round = Round.objects.create(
+            matching_pool=pool, start_date=now, end_date=now + timedelta(days=7), status='active'
+        )
+        named = Donor.objects.create(wallet=Wallet.objects.create(address='0xnamed'), username='alice')
+        anonymous = Donor.objects.create(wallet=Wallet.objects.create(address='0xanon'))
+        self.funded = Proposal.objects.create(
+            proposer=named, round=self.round, chain_session=session,
+            title='Funded', description='Description'
+        )
+        self.unfunded = Proposal.objects.create(
+            proposer=anonymous, round=self.round, chain_session=session,
+            title='Unfunded', description='Description'
+        )
+        Donation.objects.create(donor=named, proposal=self.funded, amount=Decimal('4'))
+        Donation.objects.create(donor=anonymous, proposal=self.funded, amount=Decimal('6'))
+        Donation.objects.create(donor=anonymous, proposal=self.funded, amount=Decimal('1'))
+
+    def test_summary_rows(self):
+        response = self.client.get(f'/rounds/{self.round.pk}/donations_summary/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_proposals'], 2)
+        self.assertEqual(Decimal(response.data['total_donations']), Decimal('11'))
+
+        rows = {row['title']: row for row in response.data['proposals']}
+        self.assertEqual(rows['Funded']['proposal_id'], self.funded.pk)
+        self.assertEqual(Decimal(rows['Funded']['total_donated']), Decimal('11'))
+        self.assertEqual(rows['Funded']['donation_count'], 3)
+        self.assertEqual(rows['Funded']['unique_donors'], 2)
+        self.assertEqual(rows['Funded']['proposer'], 'alice')
 
-# Create your tests here.
+        # No donations sums to 0, and a proposer without a username is shown by address
+        self.assertEqual(rows['Unfunded']['total_donated'], 0)
+        self.assertEqual(rows['Unfunded']['donation_count'], 0)
+        self.assertEqual(rows['Unfunded']['proposer'], '0xanon')
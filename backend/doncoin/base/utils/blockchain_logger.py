@@ -22,6 +22,8 @@ class BlockchainLogger:
     def log_web3_call(method: str, params: Optional[Dict] = None, result: Any = None, 
                       duration_ms: float = 0, error: Optional[str] = None):
         """Log a Web3 RPC call"""
+        if not logger.isEnabledFor(logging.ERROR if error else logging.INFO):
+            return
         log_data = {
             "type": "WEB3_CALL",
             "method": method,
@@ -31,16 +33,18 @@ class BlockchainLogger:
         
         if error:
             log_data["error"] = str(error)
-            logger.error(f"Web3 call failed: {method} | {json.dumps(log_data)}")
+            logger.error("Web3 call failed: %s | %s", method, json.dumps(log_data))
         else:
             log_data["result_preview"] = str(result)[:200] if result else None
-            logger.info(f"Web3 call: {method} | {json.dumps(log_data)}")
+            logger.info("Web3 call: %s | %s", method, json.dumps(log_data))
     
     @staticmethod
     def log_contract_call(contract_name: str, method: str, args: tuple = (), 
                           tx_hash: Optional[str] = None, duration_ms: float = 0,
                           error: Optional[str] = None):
         """Log a smart contract method call"""
+        if not logger.isEnabledFor(logging.ERROR if error else logging.INFO):
+            return
         log_data = {
             "type": "CONTRACT_CALL",
             "contract": contract_name,
@@ -54,14 +58,16 @@ class BlockchainLogger:
             
         if error:
             log_data["error"] = str(error)
-            logger.error(f"Contract call failed: {contract_name}.{method} | {json.dumps(log_data)}")
+            logger.error("Contract call failed: %s.%s | %s", contract_name, method, json.dumps(log_data))
         else:
-            logger.info(f"Contract call: {contract_name}.{method} | {json.dumps(log_data)}")
+            logger.info("Contract call: %s.%s | %s", contract_name, method, json.dumps(log_data))
     
     @staticmethod
     def log_event(contract_name: str, event_name: str, event_data: Dict,
                   block_number: int, tx_hash: str):
         """Log a blockchain event detection"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         log_data = {
             "type": "EVENT",
             "contract": contract_name,
@@ -70,12 +76,14 @@ class BlockchainLogger:
             "tx_hash": tx_hash,
             "data": {k: str(v)[:100] for k, v in event_data.items()},  # Truncate
         }
-        logger.info(f"Event detected: {contract_name}.{event_name} at block {block_number} | {json.dumps(log_data)}")
+        logger.info("Event detected: %s.%s at block %s | %s", contract_name, event_name, block_number, json.dumps(log_data))
     
     @staticmethod
     def log_transaction(tx_hash: str, from_addr: str, to_addr: str, 
                         value: str, status: str = "pending"):
         """Log a blockchain transaction"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         log_data = {
             "type": "TRANSACTION",
             "tx_hash": tx_hash,
@@ -84,28 +92,30 @@ class BlockchainLogger:
             "value": value,
             "status": status,
         }
-        logger.info(f"Transaction {status}: {tx_hash[:16]}... | {json.dumps(log_data)}")
+        logger.info("Transaction %s: %s... | %s", status, tx_hash[:16], json.dumps(log_data))
     
     @staticmethod
     def log_indexer_event(action: str, details: Dict, duration_ms: float = 0):
         """Log indexer-specific events"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         log_data = {
             "type": "INDEXER",
             "action": action,
             "details": details,
             "duration_ms": round(duration_ms, 2),
         }
-        logger.info(f"Indexer: {action} | {json.dumps(log_data)}")
+        logger.info("Indexer: %s | %s", action, json.dumps(log_data))
 
 
 def log_blockchain_call(func):
     """Decorator to automatically log blockchain function calls"""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
+        start = time.perf_counter_ns()
         try:
             result = func(*args, **kwargs)
-            duration = (time.time() - start) * 1000
+            duration = (time.perf_counter_ns() - start) / 1_000_000
             BlockchainLogger.log_web3_call(
                 method=func.__name__,
                 params={"args": str(args)[:200], "kwargs": str(kwargs)[:200]},
@@ -114,7 +124,7 @@ def log_blockchain_call(func):
             )
             return result
         except Exception as e:
-            duration = (time.time() - start) * 1000
+            duration = (time.perf_counter_ns() - start) / 1_000_000
             BlockchainLogger.log_web3_call(
                 method=func.__name__,
                 params={"args": str(args)[:200], "kwargs": str(kwargs)[:200]},
@@ -1,21 +1,78 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import time
 import json
 from django.utils.deprecation import MiddlewareMixin
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Use the 'api' logger configured in settings.py
 logger = logging.getLogger("api")
 
 
+def enqueue_handlers(target):
+    """
+    Move a logger's handlers behind a QueueHandler.
+    
+    The request thread only enqueues the record; a single QueueListener thread
+    does the file/console writes. Returns the started listener (None if the
+    logger has no handlers or is already queued).
+    """
+    handlers = [h for h in target.handlers if not isinstance(h, logging.handlers.QueueHandler)]
+    if not handlers or len(handlers) != len(target.handlers):
+        return None
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+# settings.LOGGING has been applied by the time middleware is imported
+_listener = enqueue_handlers(logger)
+
+
+if ORJSON_AVAILABLE:
+    def _dumps(data):
+        return orjson.dumps(data, default=str).decode()
+    
+    _loads = orjson.loads
+else:
+    def _dumps(data):
+        return json.dumps(data, default=str)
+    
+    _loads = json.loads
+
+
 class LogEverythingMiddleware(MiddlewareMixin):
     """
     Comprehensive request/response logging middleware.
     Logs all HTTP requests with timing, headers, and response details.
     """
     
+    # Only text bodies are previewed; uploads and other binary payloads are skipped
+    BODY_LOG_CONTENT_TYPES = frozenset({'application/json', 'application/x-www-form-urlencoded'})
+    BODY_PREVIEW_BYTES = 500
+    # Bodies larger than this are not read at all just to be logged
+    BODY_LOG_MAX_CONTENT_LENGTH = 64 * 1024
+    
     def process_request(self, request):
         """Called before view - start timing and log request details"""
-        request._start_time = time.time()
+        request._start_ns = time.perf_counter_ns()
+        
+        # Nothing below is needed unless the record would actually be emitted
+        if not logger.isEnabledFor(logging.INFO):
+            return None
         
         # Build request log data
         log_data = {
@@ -30,44 +87,66 @@ class LogEverythingMiddleware(MiddlewareMixin):
         
         # Log request body for POST/PUT/PATCH (truncated)
         if request.method in ['POST', 'PUT', 'PATCH']:
-            try:
-                body = request.body.decode('utf-8')[:500]
-                # Try to parse as JSON for cleaner logging
-                if request.content_type == 'application/json' and body:
-                    log_data["body_preview"] = json.loads(body)
-                else:
-                    log_data["body_preview"] = body
-            except Exception:
-                log_data["body_preview"] = "[Unable to decode body]"
+            log_data["body_preview"] = self.get_body_preview(request)
         
-        logger.info(f"→ {request.method} {request.path} | {json.dumps(log_data)}")
+        logger.info("→ %s %s | %s", request.method, request.path, _dumps(log_data))
         return None
     
     def process_response(self, request, response):
         """Called after view - log response details and timing"""
+        # Log level based on status code
+        status_code = response.status_code
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        if not logger.isEnabledFor(level):
+            return response
+        
         # Calculate response time
-        start_time = getattr(request, '_start_time', None)
-        duration_ms = (time.time() - start_time) * 1000 if start_time else 0
+        start_ns = getattr(request, '_start_ns', None)
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000 if start_ns is not None else 0
         
         log_data = {
             "type": "RESPONSE",
             "method": request.method,
             "path": request.path,
-            "status": response.status_code,
+            "status": status_code,
             "duration_ms": round(duration_ms, 2),
             "content_length": len(response.content) if hasattr(response, 'content') else 0,
         }
         
-        # Log level based on status code
-        if response.status_code >= 500:
-            logger.error(f"← {response.status_code} {request.path} ({duration_ms:.2f}ms) | {json.dumps(log_data)}")
-        elif response.status_code >= 400:
-            logger.warning(f"← {response.status_code} {request.path} ({duration_ms:.2f}ms) | {json.dumps(log_data)}")
-        else:
-            logger.info(f"← {response.status_code} {request.path} ({duration_ms:.2f}ms) | {json.dumps(log_data)}")
+        logger.log(level, "← %s %s (%.2fms) | %s", status_code, request.path, duration_ms, _dumps(log_data))
         
         return response
     
+    def get_body_preview(self, request):
+        """Decode at most BODY_PREVIEW_BYTES of a small text request body"""
+        content_type = request.content_type
+        if content_type not in self.BODY_LOG_CONTENT_TYPES:
+            return f"[{content_type or 'unknown'} body not logged]"
+        
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > self.BODY_LOG_MAX_CONTENT_LENGTH:
+            return f"[{content_length} byte body not logged]"
+        
+        try:
+            raw = request.body
+            # Try to parse as JSON for cleaner logging when the whole body fits
+            if content_type == 'application/json' and raw and len(raw) <= self.BODY_PREVIEW_BYTES:
+                try:
+                    return _loads(raw)
+                except ValueError:
+                    pass
+            return raw[:self.BODY_PREVIEW_BYTES].decode('utf-8', errors='replace')
+        except Exception:
+            return "[Unable to decode body]"
+    
     def get_client_ip(self, request):
         """Extract client IP from request headers"""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
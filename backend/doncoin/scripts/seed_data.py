@@ -14,7 +14,7 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 import django
 django.setup()
 
-
+from django.db import transaction
 from base.models import (
     Wallet, Donor, SybilScore, MatchingPool, Round,
     Proposal, Donation, Match, QFResult, Payout, ContractEvent,
@@ -30,51 +30,51 @@ NUM_ROUNDS = 5
 NUM_PROPOSALS = 20
 NUM_DONATIONS = 50
 NUM_EVENTS = 30
-import uuid
 
 
+# Primary keys are client-side uuid4 defaults, so each table is written with
+# one bulk_create and the returned instances can be referenced as FKs directly.
+
 def create_wallets():
-    wallets = []
-    for _ in range(NUM_WALLETS):
-        wallet = Wallet.objects.create(
+    return Wallet.objects.bulk_create([
+        Wallet(
             address=str(uuid.uuid4()),
             balance=Decimal(random.uniform(0, 10000)).quantize(Decimal('0.00000001')),
             status=random.choice(['active', 'frozen', 'flagged'])
         )
-        wallets.append(wallet)
-    return wallets
+        for _ in range(NUM_WALLETS)
+    ])
 
 def create_donors(wallets):
-    donors = []
-    for _ in range(NUM_DONORS):
-        wallet = random.choice(wallets)
-        donor = Donor.objects.create(
-            wallet=wallet,
+    return Donor.objects.bulk_create([
+        Donor(
+            wallet=random.choice(wallets),
             username=fake.unique.user_name(),
             reputation_score=round(random.uniform(0, 100), 2)
         )
-        donors.append(donor)
-    return donors
+        for _ in range(NUM_DONORS)
+    ])
 
 def create_sybil_scores(wallets):
-    for wallet in wallets:
-        for _ in range(random.randint(1, 3)):
-            SybilScore.objects.create(
-                wallet=wallet,
-                score=round(random.uniform(0, 1), 2),
-                verified_by=fake.name()
-            )
+    SybilScore.objects.bulk_create([
+        SybilScore(
+            wallet=wallet,
+            score=round(random.uniform(0, 1), 2),
+            verified_by=fake.name()
+        )
+        for wallet in wallets
+        for _ in range(random.randint(1, 3))
+    ])
 
 def create_matching_pools():
-    pools = []
-    for _ in range(NUM_POOLS):
-        pool = MatchingPool.objects.create(
+    return MatchingPool.objects.bulk_create([
+        MatchingPool(
             total_funds=Decimal(random.uniform(10000, 50000)).quantize(Decimal('0.00000001')),
             allocated_funds=Decimal(random.uniform(0, 10000)).quantize(Decimal('0.00000001')),
             replenished_by=fake.name()
         )
-        pools.append(pool)
-    return pools
+        for _ in range(NUM_POOLS)
+    ])
 
 def create_rounds(pools):
     rounds = []
@@ -82,108 +82,110 @@ def create_rounds(pools):
         for _ in range(random.randint(1, NUM_ROUNDS)):
             start = fake.date_time_this_year()
             end = start + timedelta(days=random.randint(1, 30))
-            rnd = Round.objects.create(
+            rounds.append(Round(
                 start_date=start,
                 end_date=end,
                 matching_pool=pool,
                 status=random.choice(['active', 'closed', 'upcoming'])
-            )
-            rounds.append(rnd)
-    return rounds
+            ))
+    return Round.objects.bulk_create(rounds)
 
 def create_proposals(donors, rounds):
-    proposals = []
-    for _ in range(NUM_PROPOSALS):
-        donor = random.choice(donors)
-        rnd = random.choice(rounds)
-        proposal = Proposal.objects.create(
+    return Proposal.objects.bulk_create([
+        Proposal(
             title=fake.sentence(nb_words=6),
             description=fake.paragraph(nb_sentences=3),
-            proposer=donor,
-            round=rnd,
+            proposer=random.choice(donors),
+            round=random.choice(rounds),
             status=random.choice(['pending', 'approved', 'rejected', 'funded']),
             total_donations=Decimal(random.uniform(0, 5000)).quantize(Decimal('0.00000001'))
         )
-        proposals.append(proposal)
-    return proposals
+        for _ in range(NUM_PROPOSALS)
+    ])
 
 def create_donations(donors, proposals):
-    for _ in range(NUM_DONATIONS):
-        donor = random.choice(donors)
-        proposal = random.choice(proposals)
-        Donation.objects.create(
-            donor=donor,
-            proposal=proposal,
+    Donation.objects.bulk_create([
+        Donation(
+            donor=random.choice(donors),
+            proposal=random.choice(proposals),
             amount=Decimal(random.uniform(10, 1000)).quantize(Decimal('0.00000001')),
             sybil_score=round(random.uniform(0, 1), 2),
             tx_hash=fake.unique.sha256()
         )
+        for _ in range(NUM_DONATIONS)
+    ])
 
 def create_matches(proposals, rounds):
-    for proposal in proposals:
-        rnd = random.choice(rounds)
-        Match.objects.create(
+    Match.objects.bulk_create([
+        Match(
             proposal=proposal,
-            round=rnd,
+            round=random.choice(rounds),
             matched_amount=Decimal(random.uniform(0, 1000)).quantize(Decimal('0.00000001'))
         )
+        for proposal in proposals
+    ])
 
 def create_qf_results(proposals, rounds):
-    for proposal in proposals:
-        rnd = random.choice(rounds)
-        QFResult.objects.create(
+    QFResult.objects.bulk_create([
+        QFResult(
             proposal=proposal,
-            round=rnd,
+            round=random.choice(rounds),
             calculated_match=Decimal(random.uniform(0, 500)).quantize(Decimal('0.00000001')),
             verified=random.choice([True, False])
         )
+        for proposal in proposals
+    ])
 
 def create_payouts(proposals, rounds):
-    for proposal in proposals:
-        rnd = random.choice(rounds)
-        Payout.objects.create(
+    Payout.objects.bulk_create([
+        Payout(
             proposal=proposal,
-            round=rnd,
+            round=random.choice(rounds),
             amount=Decimal(random.uniform(10, 500)).quantize(Decimal('0.00000001')),
             tx_hash=fake.unique.sha256()
         )
+        for proposal in proposals
+    ])
 
 def create_contract_events(proposals, rounds):
-    for _ in range(NUM_EVENTS):
-        proposal = random.choice(proposals + [None])
-        rnd = random.choice(rounds + [None])
-        ContractEvent.objects.create(
+    ContractEvent.objects.bulk_create([
+        ContractEvent(
             event_type=fake.word(),
-            round=rnd,
-            proposal=proposal,
+            round=random.choice(rounds + [None]),
+            proposal=random.choice(proposals + [None]),
             timestamp=fake.date_time_this_year(),
             tx_hash=fake.unique.sha256()
         )
+        for _ in range(NUM_EVENTS)
+    ])
 
 def create_governance_tokens(wallets):
     roles = ['member', 'admin', 'council']
-    for wallet in wallets:
-        for role in roles:
-            GovernanceToken.objects.create(
-                wallet=wallet,
-                voting_power=Decimal(random.uniform(0, 1000)).quantize(Decimal('0.00000001')),
-                role=role
-            )
+    GovernanceToken.objects.bulk_create([
+        GovernanceToken(
+            wallet=wallet,
+            voting_power=Decimal(random.uniform(0, 1000)).quantize(Decimal('0.00000001')),
+            role=role
+        )
+        for wallet in wallets
+        for role in roles
+    ])
 
 if __name__ == "__main__":
     print("Seeding data...")
-    wallets = create_wallets()
-    donors = create_donors(wallets)
-    create_sybil_scores(wallets)
-    pools = create_matching_pools()
-    rounds = create_rounds(pools)
-    proposals = create_proposals(donors, rounds)
-    create_donations(donors, proposals)
-    create_matches(proposals, rounds)
-    create_qf_results(proposals, rounds)
-    create_payouts(proposals, rounds)
-    create_contract_events(proposals, rounds)
-    create_governance_tokens(wallets)
+    with transaction.atomic():
+        wallets = create_wallets()
+        donors = create_donors(wallets)
+        create_sybil_scores(wallets)
+        pools = create_matching_pools()
+        rounds = create_rounds(pools)
+        proposals = create_proposals(donors, rounds)
+        create_donations(donors, proposals)
+        create_matches(proposals, rounds)
+        create_qf_results(proposals, rounds)
+        create_payouts(proposals, rounds)
+        create_contract_events(proposals, rounds)
+        create_governance_tokens(wallets)
     print("Seeding complete!")
 
 
@@ -3,41 +3,85 @@ import socketserver
 import json
 import os
 import re
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
 
 PORT = 8080
+
+# Standard logging format: 2023-10-27 10:00:00,000 - LEVEL - Message
+LOG_LINE_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\w+) - (.*)')
 LOG_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'security_logs', 'security.log')
 
+# Encoded /api/logs body, reused while the log file and limit are unchanged:
+# ((mtime_ns, size, limit), bytes)
+_payload_cache = None
+
+
+def _parse_log_lines(limit=None):
+    logs = []
+    with open(LOG_FILE_PATH, 'r') as f:
+        # Newest first; with a limit only that many lines from the end are kept
+        lines = deque(f, maxlen=limit)
+        for line in reversed(lines):
+            match = LOG_LINE_RE.match(line)
+            if match:
+                timestamp, level, message = match.groups()
+                logs.append({
+                    'timestamp': timestamp,
+                    'level': level,
+                    'message': message
+                })
+            else:
+                 # Handle unformatted lines or stack traces gracefully
+                logs.append({
+                    'timestamp': '',
+                    'level': 'UNKNOWN',
+                    'message': line.strip()
+                })
+    return logs
+
+
+def get_logs_payload(limit=None):
+    """Return the JSON-encoded log, or its newest `limit` lines, re-parsing only on change"""
+    global _payload_cache
+    try:
+        st = os.stat(LOG_FILE_PATH)
+    except FileNotFoundError:
+        return b'[]'
+    
+    version = (st.st_mtime_ns, st.st_size, limit)
+    if _payload_cache is None or _payload_cache[0] != version:
+        _payload_cache = (version, json.dumps(_parse_log_lines(limit)).encode())
+    return _payload_cache[1]
+
+
+def _parse_limit(query):
+    """?limit=N caps the response to the newest N lines; absent means the whole log"""
+    values = parse_qs(query).get('limit')
+    if not values:
+        return None
+    limit = int(values[-1])
+    if limit < 0:
+        raise ValueError('limit must be non-negative')
+    return limit
+
+
 class LogViewerHandler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
-        if self.path == '/api/logs':
+        url = urlsplit(self.path)
+        if url.path == '/api/logs':
+            try:
+                limit = _parse_limit(url.query)
+            except ValueError:
+                self.send_error(400, 'limit must be a non-negative integer')
+                return
+            # Every open viewer polls this every 2s; they share one encoded body
+            payload = get_logs_payload(limit)
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
             self.end_headers()
-            
-            logs = []
-            if os.path.exists(LOG_FILE_PATH):
-                with open(LOG_FILE_PATH, 'r') as f:
-                    # Read lines in reverse order to show newest first
-                    lines = f.readlines()[::-1]
-                    for line in lines:
-                        # Simple regex to parse standard logging format
-                        # 2023-10-27 10:00:00,000 - LEVEL - Message
-                        match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\w+) - (.*)', line)
-                        if match:
-                            logs.append({
-                                'timestamp': match.group(1),
-                                'level': match.group(2),
-                                'message': match.group(3)
-                            })
-                        else:
-                             # Handle unformatted lines or stack traces gracefully
-                            logs.append({
-                                'timestamp': '',
-                                'level': 'UNKNOWN',
-                                'message': line.strip()
-                            })
-            
-            self.wfile.write(json.dumps(logs).encode())
+            self.wfile.write(payload)
         elif self.path == '/':
             self.path = '/index.html'
             return http.server.SimpleHTTPRequestHandler.do_GET(self)
@@ -2,6 +2,14 @@ import logging
 import os
 from datetime import datetime
 
+# Accepted level names; anything else is logged at INFO
+_LOG_LEVELS = {
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL,
+}
+
 def get_security_logger():
     """
     Configures and returns a logger for security events.
@@ -28,13 +36,4 @@ def log_security_event(message, level='info'):
     Logs a security event with the specified message and level.
     """
     logger = get_security_logger()
-    if level.lower() == 'info':
-        logger.info(message)
-    elif level.lower() == 'warning':
-        logger.warning(message)
-    elif level.lower() == 'error':
-        logger.error(message)
-    elif level.lower() == 'critical':
-        logger.critical(message)
-    else:
-        logger.info(message)
+    logger.log(_LOG_LEVELS.get(level.lower(), logging.INFO), message)
@@ -6,15 +6,29 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
+import hashlib
 import time
 import os
 import sys
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from ds_logging.model_logger import ModelLogger
+from config.settings import API_USE_NUMBA
+
+# Try to import numba for the scoring kernel when enabled, fall back to NumPy
+# if disabled (the default) or not installed
+NUMBA_AVAILABLE = False
+if API_USE_NUMBA:
+    try:
+        from numba import njit
+        NUMBA_AVAILABLE = True
+    except ImportError:
+        pass
 
 # ============================================================
 # PYDANTIC MODELS
@@ -34,6 +48,18 @@ class WalletRiskResponse(BaseModel):
     request_id: str
 
 
+# Upper bound on wallets per batch call, so one request cannot pin a worker
+MAX_RISK_BATCH_SIZE = 1000
+
+
+class WalletRiskBatchRequest(BaseModel):
+    wallets: List[WalletRiskRequest] = Field(..., max_length=MAX_RISK_BATCH_SIZE)
+
+
+class WalletRiskBatchResponse(BaseModel):
+    results: List[WalletRiskResponse]
+
+
 class RecommendationRequest(BaseModel):
     donor_id: str
     n_recommendations: int = 5
@@ -78,17 +104,118 @@ class ConversionRequest(BaseModel):
     value: float = 1.0
 
 
+class ConversionResponse(BaseModel):
+    status: str
+    request_id: str
+
+
 class KPIResponse(BaseModel):
     kpis: Dict[str, Dict[str, Any]]
     timestamp: str
 
 
+class KPIHistoryPoint(BaseModel):
+    date: str
+    value: float
+
+
+class KPIDetailResponse(BaseModel):
+    kpi_name: str
+    current_value: float
+    history: List[KPIHistoryPoint]
+    trend: str
+
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
     models: Dict[str, str]
 
 
+# ============================================================
+# SCORING HELPERS
+# ============================================================
+
+RISK_THRESHOLD = 0.7
+
+# Proposal ids the simulated recommender samples from, built once
+RECOMMENDATION_CANDIDATES = np.arange(1, 50)
+
+
+def compute_risk_scores(sybil_scores: np.ndarray,
+                        tx_counts: np.ndarray,
+                        total_amounts: np.ndarray,
+                        jitter: np.ndarray) -> np.ndarray:
+    """
+    Heuristic wallet risk scores for a batch of wallets.
+    
+    All arguments are 1-D arrays of equal length; wallets without
+    transactions should have a tx_count of 0.
+    """
+    if NUMBA_AVAILABLE:
+        return _risk_kernel(
+            np.ascontiguousarray(sybil_scores, dtype=np.float64),
+            np.ascontiguousarray(tx_counts, dtype=np.int64),
+            np.ascontiguousarray(total_amounts, dtype=np.float64),
+            np.ascontiguousarray(jitter, dtype=np.float64)
+        )
+    
+    has_tx = tx_counts > 0
+    risk = sybil_scores * 0.5
+    risk += np.where(tx_counts > 50, 0.2, 0.0)
+    risk += np.where(has_tx & (total_amounts < 10), 0.1, 0.0)
+    return np.clip(risk + jitter, 0.0, 1.0)
+
+
+if NUMBA_AVAILABLE:
+    @njit('float64[:](float64[:], int64[:], float64[:], float64[:])', cache=True)
+    def _risk_kernel(sybil_scores, tx_counts, total_amounts, jitter):
+        """Fused single-pass version of compute_risk_scores (same arithmetic order)"""
+        n = sybil_scores.shape[0]
+        out = np.empty(n)
+        for i in range(n):
+            risk = sybil_scores[i] * 0.5
+            if tx_counts[i] > 50:
+                risk += 0.2
+            if tx_counts[i] > 0 and total_amounts[i] < 10:
+                risk += 0.1
+            out[i] = min(1.0, max(0.0, risk + jitter[i]))
+        return out
+
+
+def _wallet_jitter(wallet_addresses: List[str]) -> np.ndarray:
+    """
+    Per-wallet noise in [-0.1, 0.1) standing in for model variance.
+    
+    Each address seeds its own value; the seeds are mixed with the
+    splitmix64 finalizer in one vectorized pass instead of building a
+    RandomState per wallet.
+    """
+    z = np.fromiter((hash(a) % 2**32 for a in wallet_addresses),
+                    dtype=np.uint64, count=len(wallet_addresses))
+    z = z + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    # Top 53 bits as a uniform double in [0, 1), scaled to [-0.1, 0.1)
+    return (z >> np.uint64(11)) * (0.2 / 2**53) - 0.1
+
+
+def _risk_inputs(requests: List[WalletRiskRequest]):
+    """Column arrays for compute_risk_scores from a list of requests"""
+    n = len(requests)
+    sybil_scores = np.empty(n)
+    tx_counts = np.zeros(n, dtype=np.int64)
+    total_amounts = np.zeros(n)
+    for i, req in enumerate(requests):
+        sybil_scores[i] = req.sybil_score
+        if req.transactions:
+            tx_counts[i] = len(req.transactions)
+            total_amounts[i] = sum(tx.get('amount', 0) for tx in req.transactions)
+    jitter = _wallet_jitter([req.wallet_address for req in requests])
+    return sybil_scores, tx_counts, total_amounts, jitter
+
+
 # ============================================================
 # FASTAPI APP
 # ============================================================
@@ -161,43 +288,45 @@ def create_api_app() -> FastAPI:
         
         Returns a score from 0.0 (low risk) to 1.0 (high risk).
         """
+        return _score_wallets([request])[0]
+    
+    @app.post("/api/v1/risk/score/batch", response_model=WalletRiskBatchResponse)
+    async def get_risk_scores_batch(request: WalletRiskBatchRequest):
+        """
+        Get risk scores for several wallets in one call.
+        
+        Scores are computed as a single vectorized batch.
+        """
+        return WalletRiskBatchResponse(results=_score_wallets(request.wallets))
+    
+    def _score_wallets(requests: List[WalletRiskRequest]) -> List[WalletRiskResponse]:
+        """Score a batch of wallets and log one prediction per wallet"""
         start_time = time.time()
         
         # Simulate prediction (replace with actual model)
-        import numpy as np
-        np.random.seed(hash(request.wallet_address) % 2**32)
-        
-        # Risk score based on features
-        base_risk = request.sybil_score * 0.5
-        if request.transactions:
-            tx_count = len(request.transactions)
-            if tx_count > 50:
-                base_risk += 0.2
-            total_amount = sum(tx.get('amount', 0) for tx in request.transactions)
-            if total_amount < 10:
-                base_risk += 0.1
+        risk_scores = compute_risk_scores(*_risk_inputs(requests))
         
-        risk_score = min(1.0, max(0.0, base_risk + np.random.uniform(-0.1, 0.1)))
-        threshold = 0.7
+        # Amortize batch latency across the wallets it scored
+        latency_ms = (time.time() - start_time) * 1000 / max(len(requests), 1)
         
-        latency_ms = (time.time() - start_time) * 1000
-        
-        # Log prediction
-        request_id = logger.log_prediction(
-            model_name='risk_scorer',
-            model_version='1.0',
-            input_features={'wallet_address': request.wallet_address, 'sybil_score': request.sybil_score},
-            output=risk_score,
-            latency_ms=latency_ms
-        )
-        
-        return WalletRiskResponse(
-            wallet_address=request.wallet_address,
-            risk_score=round(risk_score, 4),
-            is_risky=risk_score >= threshold,
-            threshold=threshold,
-            request_id=request_id
-        )
+        responses = []
+        for req, risk_score in zip(requests, risk_scores.tolist()):
+            # Log prediction
+            request_id = logger.log_prediction(
+                model_name='risk_scorer',
+                model_version='1.0',
+                input_features={'wallet_address': req.wallet_address, 'sybil_score': req.sybil_score},
+                output=risk_score,
+                latency_ms=latency_ms
+            )
+            responses.append(WalletRiskResponse(
+                wallet_address=req.wallet_address,
+                risk_score=round(risk_score, 4),
+                is_risky=risk_score >= RISK_THRESHOLD,
+                threshold=RISK_THRESHOLD,
+                request_id=request_id
+            ))
+        return responses
     
     # ============================================================
     # RECOMMENDATIONS
@@ -213,7 +342,6 @@ def create_api_app() -> FastAPI:
         start_time = time.time()
         
         # Simulate recommendations (replace with actual model)
-        import numpy as np
         np.random.seed(hash(request.donor_id) % 2**32)
         
         recommendations = [
@@ -222,7 +350,7 @@ def create_api_app() -> FastAPI:
                 'score': float(np.random.uniform(0.3, 0.9)),
                 'reason': 'Similar to past donations'
             }
-            for i in np.random.choice(range(1, 50), size=min(request.n_recommendations, 5), replace=False)
+            for i in np.random.choice(RECOMMENDATION_CANDIDATES, size=min(request.n_recommendations, 5), replace=False)
         ]
         recommendations.sort(key=lambda x: x['score'], reverse=True)
         
@@ -313,11 +441,10 @@ def create_api_app() -> FastAPI:
         
         Uses deterministic hashing for consistent assignment.
         """
-        import hashlib
-        
         # Deterministic assignment
         hash_input = f"{request.user_id}:{request.experiment_name}"
-        hash_value = int(hashlib.md5(hash_input.encode()).hexdigest(), 16)
+        digest = hashlib.md5(hash_input.encode(), usedforsecurity=False).digest()
+        hash_value = int.from_bytes(digest, 'big')
         variant = 'treatment' if (hash_value % 100) < 50 else 'control'
         
         # Log impression
@@ -335,7 +462,7 @@ def create_api_app() -> FastAPI:
             request_id=request_id
         )
     
-    @app.post("/api/v1/experiment/convert")
+    @app.post("/api/v1/experiment/convert", response_model=ConversionResponse)
     async def record_conversion(request: ConversionRequest):
         """Record a conversion event for an experiment"""
         request_id = logger.log_experiment_conversion(
@@ -372,11 +499,9 @@ def create_api_app() -> FastAPI:
             timestamp=datetime.now().isoformat()
         )
     
-    @app.get("/api/v1/kpis/{kpi_name}")
+    @app.get("/api/v1/kpis/{kpi_name}", response_model=KPIDetailResponse)
     async def get_kpi_detail(kpi_name: str, days: int = Query(30, ge=1, le=365)):
         """Get detailed KPI data with history"""
-        import numpy as np
-        
         # Simulated time series (replace with actual database query)
         dates = [(datetime.now() - timedelta(days=i)).isoformat()[:10] for i in range(days)]
         values = np.random.uniform(50, 70, days).tolist()
@@ -395,7 +520,7 @@ def create_api_app() -> FastAPI:
     # MODEL STATS
     # ============================================================
     
-    @app.get("/api/v1/models/stats")
+    @app.get("/api/v1/models/stats", response_model=Dict[str, Any])
     async def get_model_stats():
         """Get model performance statistics"""
         return logger.get_model_stats()
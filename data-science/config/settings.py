@@ -18,6 +18,9 @@ DATABASE_CONFIG = {
 # API Configuration
 API_HOST = os.getenv('DS_API_HOST', '0.0.0.0')
 API_PORT = int(os.getenv('DS_API_PORT', 8051))
+# Set DS_USE_NUMBA=1 (with numba installed) to use the JIT scoring kernel;
+# the NumPy path is the default and avoids numba's import/compile cost
+API_USE_NUMBA = os.getenv('DS_USE_NUMBA', '0') == '1'
 
 # Dashboard Configuration
 DASHBOARD_HOST = os.getenv('DASHBOARD_HOST', '0.0.0.0')
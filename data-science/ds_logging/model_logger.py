@@ -7,17 +7,37 @@ import os
 import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 import threading
-from queue import Queue
+from queue import SimpleQueue
 import time
 
+# Use orjson for log (de)serialization when installed, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+
+def _dumps(obj: Dict[str, Any]) -> str:
+    """Serialize a log entry to a single JSON line (without newline)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass  # Types orjson rejects (e.g. ints > 64 bit) go through json
+    return json.dumps(obj)
+
+
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+@dataclass(slots=True)
 class ModelPrediction:
     """Represents a single model prediction log entry"""
     request_id: str
-    timestamp: str
+    timestamp: float  # epoch seconds; written out as local ISO-8601
     model_name: str
     model_version: str
     input_features: Dict[str, Any]
@@ -26,11 +46,11 @@ class ModelPrediction:
     metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExperimentEvent:
     """Represents an experiment event (A/B test, MAB)"""
     event_id: str
-    timestamp: str
+    timestamp: float  # epoch seconds; written out as local ISO-8601
     experiment_name: str
     experiment_type: str  # 'ab_test' or 'mab'
     user_id: str
@@ -40,6 +60,17 @@ class ExperimentEvent:
     metadata: Optional[Dict[str, Any]] = None
 
 
+# Field order is fixed per record type, so entries are built from these
+# tuples with a shallow getattr instead of dataclasses.asdict's recursive copy.
+_PREDICTION_FIELDS = tuple(f.name for f in fields(ModelPrediction))
+_EXPERIMENT_FIELDS = tuple(f.name for f in fields(ExperimentEvent))
+
+
+def _to_entry(record: Any, field_names: tuple) -> Dict[str, Any]:
+    """Convert a log record dataclass to a JSON-ready dict"""
+    return {name: getattr(record, name) for name in field_names}
+
+
 class ModelLogger:
     """
     Logger for model predictions and experiments.
@@ -67,9 +98,10 @@ class ModelLogger:
         # Create log directory
         os.makedirs(log_dir, exist_ok=True)
         
-        # Async write queue
+        # Async write queue. SimpleQueue's put is a single C-level append with
+        # no Condition/mutex round-trip; nothing here needs task_done/join.
         if async_write:
-            self.write_queue: Queue = Queue()
+            self.write_queue: SimpleQueue = SimpleQueue()
             self.writer_thread = threading.Thread(target=self._async_writer, daemon=True)
             self.writer_thread.start()
     
@@ -84,13 +116,17 @@ class ModelLogger:
     
     def _write_log(self, log_entry: Dict[str, Any], log_path: str):
         """Write a single log entry to file"""
+        # Callers stamp a raw time.time(); formatting it here keeps the
+        # datetime + isoformat cost on the writer thread in async mode
+        log_entry['timestamp'] = datetime.fromtimestamp(log_entry['timestamp']).isoformat()
+        
         # Check for rotation
         if os.path.exists(log_path):
             if os.path.getsize(log_path) > self.max_file_size:
                 self._rotate_log(log_path)
         
         with open(log_path, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
+            f.write(_dumps(log_entry) + '\n')
     
     def _rotate_log(self, log_path: str):
         """Rotate log file when it exceeds max size"""
@@ -124,7 +160,7 @@ class ModelLogger:
         
         prediction = ModelPrediction(
             request_id=request_id,
-            timestamp=datetime.now().isoformat(),
+            timestamp=time.time(),
             model_name=model_name,
             model_version=model_version,
             input_features=input_features,
@@ -133,7 +169,7 @@ class ModelLogger:
             metadata=metadata
         )
         
-        log_entry = asdict(prediction)
+        log_entry = _to_entry(prediction, _PREDICTION_FIELDS)
         
         if self.async_write:
             self.write_queue.put((log_entry, self.model_log_path))
@@ -153,7 +189,7 @@ class ModelLogger:
         
         event = ExperimentEvent(
             event_id=event_id,
-            timestamp=datetime.now().isoformat(),
+            timestamp=time.time(),
             experiment_name=experiment_name,
             experiment_type=experiment_type,
             user_id=user_id,
@@ -162,7 +198,7 @@ class ModelLogger:
             metadata=metadata
         )
         
-        log_entry = asdict(event)
+        log_entry = _to_entry(event, _EXPERIMENT_FIELDS)
         
         if self.async_write:
             self.write_queue.put((log_entry, self.experiment_log_path))
@@ -183,7 +219,7 @@ class ModelLogger:
         
         event = ExperimentEvent(
             event_id=event_id,
-            timestamp=datetime.now().isoformat(),
+            timestamp=time.time(),
             experiment_name=experiment_name,
             experiment_type=experiment_type,
             user_id=user_id,
@@ -193,7 +229,7 @@ class ModelLogger:
             metadata=metadata
         )
         
-        log_entry = asdict(event)
+        log_entry = _to_entry(event, _EXPERIMENT_FIELDS)
         
         if self.async_write:
             self.write_queue.put((log_entry, self.experiment_log_path))
@@ -218,13 +254,19 @@ class ModelLogger:
         if not os.path.exists(self.model_log_path):
             return logs
         
+        # Entries are written with local isoformat() timestamps, which sort
+        # chronologically as text, so the bounds are formatted once and
+        # compared as strings instead of parsing every entry.
+        start_iso = start_time.isoformat() if start_time else None
+        end_iso = end_time.isoformat() if end_time else None
+        
         with open(self.model_log_path, 'r') as f:
             for line in f:
                 if not line.strip():
                     continue
                 
                 try:
-                    entry = json.loads(line)
+                    entry = _loads(line)
                 except json.JSONDecodeError:
                     continue
                 
@@ -232,12 +274,10 @@ class ModelLogger:
                 if model_name and entry.get('model_name') != model_name:
                     continue
                 
-                entry_time = datetime.fromisoformat(entry['timestamp'])
-                
-                if start_time and entry_time < start_time:
+                if start_iso and entry['timestamp'] < start_iso:
                     continue
                 
-                if end_time and entry_time > end_time:
+                if end_iso and entry['timestamp'] > end_iso:
                     continue
                 
                 logs.append(entry)
@@ -263,7 +303,7 @@ class ModelLogger:
                     continue
                 
                 try:
-                    entry = json.loads(line)
+                    entry = _loads(line)
                 except json.JSONDecodeError:
                     continue
                 
@@ -287,30 +327,35 @@ class ModelLogger:
         if not logs:
             return {'error': 'No logs found'}
         
-        latencies = [log['latency_ms'] for log in logs]
+        latencies = []
         
-        # Group by model
+        # Group by model: only count and latency sum are needed per model
         models = {}
         for log in logs:
-            name = log['model_name']
-            if name not in models:
-                models[name] = {'count': 0, 'latencies': []}
-            models[name]['count'] += 1
-            models[name]['latencies'].append(log['latency_ms'])
+            latency = log['latency_ms']
+            latencies.append(latency)
+            data = models.get(log['model_name'])
+            if data is None:
+                data = models[log['model_name']] = [0, 0.0]
+            data[0] += 1
+            data[1] += latency
+        
+        latencies.sort()
+        n = len(latencies)
         
         stats = {
             'total_predictions': len(logs),
-            'avg_latency_ms': sum(latencies) / len(latencies),
-            'p50_latency_ms': sorted(latencies)[len(latencies) // 2],
-            'p95_latency_ms': sorted(latencies)[int(len(latencies) * 0.95)],
-            'max_latency_ms': max(latencies),
-            'min_latency_ms': min(latencies),
+            'avg_latency_ms': sum(latencies) / n,
+            'p50_latency_ms': latencies[n // 2],
+            'p95_latency_ms': latencies[int(n * 0.95)],
+            'max_latency_ms': latencies[-1],
+            'min_latency_ms': latencies[0],
             'models': {
                 name: {
-                    'count': data['count'],
-                    'avg_latency': sum(data['latencies']) / len(data['latencies'])
+                    'count': count,
+                    'avg_latency': total / count
                 }
-                for name, data in models.items()
+                for name, (count, total) in models.items()
             }
         }
         
@@ -326,18 +371,19 @@ class ModelLogger:
         # Aggregate by variant
         variants = {}
         for log in logs:
-            variant = log['variant']
-            if variant not in variants:
-                variants[variant] = {'impressions': 0, 'conversions': 0, 'value': 0}
+            data = variants.get(log['variant'])
+            if data is None:
+                data = variants[log['variant']] = {'impressions': 0, 'conversions': 0, 'value': 0}
             
-            if log['event_type'] == 'impression':
-                variants[variant]['impressions'] += 1
-            elif log['event_type'] == 'conversion':
-                variants[variant]['conversions'] += 1
-                variants[variant]['value'] += log.get('value', 1.0)
+            event_type = log['event_type']
+            if event_type == 'impression':
+                data['impressions'] += 1
+            elif event_type == 'conversion':
+                data['conversions'] += 1
+                data['value'] += log.get('value', 1.0)
         
         # Calculate conversion rates
-        for variant, data in variants.items():
+        for data in variants.values():
             if data['impressions'] > 0:
                 data['conversion_rate'] = data['conversions'] / data['impressions']
             else:
@@ -63,9 +63,12 @@ class ABTest:
         Deterministically assign user to a variant based on hash.
         Same user always gets same variant.
         """
-        # Create hash from user_id + test name for consistency
+        # Create hash from user_id + test name for consistency. The digest is
+        # read as a big-endian int directly (same value as int(hexdigest, 16)),
+        # so existing assignments are unchanged.
         hash_input = f"{user_id}:{self.name}"
-        hash_value = int(hashlib.md5(hash_input.encode()).hexdigest(), 16)
+        digest = hashlib.md5(hash_input.encode(), usedforsecurity=False).digest()
+        hash_value = int.from_bytes(digest, 'big')
         
         # Normalize to [0, 1]
         normalized = (hash_value % 10000) / 10000
@@ -367,6 +370,25 @@ class ABTestManager:
         return tests
 
 
+# Static report sections, identical for every test
+_REPORT_METHODOLOGY = """## Assumptions and Limitations
+
+1. **Random Assignment:** Users are assigned to variants using a hash-based deterministic function, ensuring consistent experience.
+2. **Sample Size:** Results are most reliable when each variant has at least 100 impressions.
+3. **Selection Bias:** No known selection bias in variant assignment.
+4. **Time Effects:** Test does not account for day-of-week or time effects that may influence behavior.
+
+## Feature Derivation
+
+- **Conversion Rate:** Conversions / Impressions
+- **Confidence Intervals:** Wilson score interval (95%)
+- **Statistical Test:** Chi-squared test for proportions
+
+## Recommendations
+
+"""
+
+
 def generate_evaluation_report(test: ABTest) -> str:
     """
     Generate a markdown evaluation report for an A/B test.
@@ -378,7 +400,7 @@ def generate_evaluation_report(test: ABTest) -> str:
     """
     results = test.get_results()
     
-    report = f"""# A/B Test Evaluation Report: {test.name}
+    sections = [f"""# A/B Test Evaluation Report: {test.name}
 
 ## Summary
 
@@ -391,55 +413,46 @@ def generate_evaluation_report(test: ABTest) -> str:
 
 | Variant | Impressions | Conversions | Conv. Rate | 95% CI |
 |---------|-------------|-------------|------------|--------|
-"""
+"""]
     
-    for v in results['variants']:
-        ci_str = f"[{v['ci_lower']:.2%}, {v['ci_upper']:.2%}]"
-        report += f"| {v['name']} | {v['impressions']} | {v['conversions']} | {v['conversion_rate']:.2%} | {ci_str} |\n"
+    sections.extend(
+        f"| {v['name']} | {v['impressions']} | {v['conversions']} | {v['conversion_rate']:.2%} | "
+        f"[{v['ci_lower']:.2%}, {v['ci_upper']:.2%}] |\n"
+        for v in results['variants']
+    )
     
-    report += "\n## Statistical Analysis\n\n"
+    sections.append("\n## Statistical Analysis\n\n")
     
     if 'significance' in results:
         sig = results['significance']
         if 'error' in sig:
-            report += f"**Error:** {sig['error']}\n"
+            sections.append(f"**Error:** {sig['error']}\n")
         elif 'message' in sig:
-            report += f"**Status:** {sig['message']}\n"
+            sections.append(f"**Status:** {sig['message']}\n")
         else:
-            report += f"""- **Chi-squared statistic:** {sig['chi2']:.4f}
+            sections.append(f"""- **Chi-squared statistic:** {sig['chi2']:.4f}
 - **P-value:** {sig['p_value']:.4f}
 - **Statistically Significant:** {'Yes' if sig['is_significant'] else 'No'}
 - **Winner:** {sig['winner']}
 - **Lift:** {sig['lift']:.2f}%
 
-"""
+""")
     
-    report += """## Assumptions and Limitations
-
-1. **Random Assignment:** Users are assigned to variants using a hash-based deterministic function, ensuring consistent experience.
-2. **Sample Size:** Results are most reliable when each variant has at least 100 impressions.
-3. **Selection Bias:** No known selection bias in variant assignment.
-4. **Time Effects:** Test does not account for day-of-week or time effects that may influence behavior.
-
-## Feature Derivation
-
-- **Conversion Rate:** Conversions / Impressions
-- **Confidence Intervals:** Wilson score interval (95%)
-- **Statistical Test:** Chi-squared test for proportions
-
-## Recommendations
-
-"""
+    sections.append(_REPORT_METHODOLOGY)
     
     if 'significance' in results and results['significance'].get('is_significant'):
         winner = results['significance']['winner']
-        report += f"- **Implement the winning variant ({winner})** in production.\n"
-        report += f"- Monitor for any regression in performance after full rollout.\n"
+        sections.append(
+            f"- **Implement the winning variant ({winner})** in production.\n"
+            "- Monitor for any regression in performance after full rollout.\n"
+        )
     else:
-        report += "- **Continue testing** to gather more data.\n"
-        report += "- Consider extending the test duration or increasing traffic.\n"
+        sections.append(
+            "- **Continue testing** to gather more data.\n"
+            "- Consider extending the test duration or increasing traffic.\n"
+        )
     
-    return report
+    return "".join(sections)
 
 
 if __name__ == "__main__":
@@ -157,19 +157,18 @@ class MultiArmedBandit:
         Useful for understanding current state.
         """
         if self.strategy == 'thompson':
-            # Simulate many samples to estimate selection probability
+            # Simulate many samples to estimate selection probability.
+            # All rounds are drawn as one (n_samples, n_arms) matrix, in the
+            # same row-major order the per-round loop consumed them.
             n_samples = 1000
-            selections = {name: 0 for name in self.arms}
+            names = list(self.arms)
+            alphas = np.array([arm.alpha for arm in self.arms.values()])
+            betas = np.array([arm.beta for arm in self.arms.values()])
             
-            for _ in range(n_samples):
-                samples = {
-                    name: arm.sample_thompson()
-                    for name, arm in self.arms.items()
-                }
-                winner = max(samples, key=samples.get)
-                selections[winner] += 1
+            samples = np.random.beta(alphas, betas, size=(n_samples, len(names)))
+            selections = np.bincount(samples.argmax(axis=1), minlength=len(names))
             
-            return {name: count / n_samples for name, count in selections.items()}
+            return {name: count / n_samples for name, count in zip(names, selections.tolist())}
         
         elif self.strategy == 'epsilon_greedy':
             best_arm = max(
@@ -2,12 +2,15 @@
 Feature Engineering Pipeline for DonCoin DAO
 Creates derived features for ML models and dashboards.
 """
+import math
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
+from features.timestamps import parse_timestamps
+
 
 @dataclass
 class FeatureDefinition:
@@ -116,6 +119,21 @@ FEATURE_DEFINITIONS = [
 ]
 
 
+# Output columns of FeatureEngineer.compute_wallet_features (besides wallet_id/address)
+WALLET_FEATURE_COLUMNS = [
+    'total_donations', 'donation_count', 'avg_donation', 'max_donation',
+    'min_donation', 'std_donation', 'unique_proposals', 'wallet_age_days',
+    'avg_tx_per_day', 'donations_1d', 'donations_7d', 'donations_30d',
+    'amount_1d', 'amount_7d', 'amount_30d', 'days_since_last_tx', 'recency_score',
+]
+
+# Count/day features, int64 like the per-wallet dicts they replaced
+WALLET_INT_COLUMNS = [
+    'donation_count', 'unique_proposals', 'wallet_age_days',
+    'donations_1d', 'donations_7d', 'donations_30d', 'days_since_last_tx',
+]
+
+
 class FeatureEngineer:
     """
     Feature Engineering pipeline for creating derived features.
@@ -155,95 +173,75 @@ class FeatureEngineer:
         
         # Convert timestamp
         if 'timestamp' in donation_with_wallet.columns:
-            donation_with_wallet['timestamp'] = pd.to_datetime(donation_with_wallet['timestamp'])
+            donation_with_wallet['timestamp'] = parse_timestamps(donation_with_wallet['timestamp'])
         elif 'created_at' in donation_with_wallet.columns:
-            donation_with_wallet['timestamp'] = pd.to_datetime(donation_with_wallet['created_at'])
+            donation_with_wallet['timestamp'] = parse_timestamps(donation_with_wallet['created_at'])
         
         current_time = datetime.now()
         
-        # Calculate features per wallet
-        features_list = []
-        
-        for wallet_id in result['wallet_id'].unique():
-            wallet_donations = donation_with_wallet[
-                donation_with_wallet['wallet_id'] == wallet_id
-            ]
-            
-            if len(wallet_donations) == 0:
-                features_list.append({
-                    'wallet_id': wallet_id,
-                    'total_donations': 0,
-                    'donation_count': 0,
-                    'avg_donation': 0,
-                    'max_donation': 0,
-                    'min_donation': 0,
-                    'std_donation': 0,
-                    'unique_proposals': 0,
-                    'wallet_age_days': 0,
-                    'avg_tx_per_day': 0,
-                    'donations_1d': 0,
-                    'donations_7d': 0,
-                    'donations_30d': 0,
-                    'amount_1d': 0,
-                    'amount_7d': 0,
-                    'amount_30d': 0,
-                    'days_since_last_tx': 365,
-                    'recency_score': 0
-                })
-                continue
-            
-            amounts = wallet_donations['amount'].values
-            timestamps = wallet_donations['timestamp']
-            
-            first_tx = timestamps.min()
-            last_tx = timestamps.max()
-            wallet_age = (current_time - first_tx.to_pydatetime().replace(tzinfo=None)).days
-            days_since_last = (current_time - last_tx.to_pydatetime().replace(tzinfo=None)).days
-            
-            # Time-windowed features
-            donations_1d = len(wallet_donations[
-                timestamps >= current_time - timedelta(days=1)
-            ])
-            donations_7d = len(wallet_donations[
-                timestamps >= current_time - timedelta(days=7)
-            ])
-            donations_30d = len(wallet_donations[
-                timestamps >= current_time - timedelta(days=30)
-            ])
-            
-            amount_1d = wallet_donations[
-                timestamps >= current_time - timedelta(days=1)
-            ]['amount'].sum()
-            amount_7d = wallet_donations[
-                timestamps >= current_time - timedelta(days=7)
-            ]['amount'].sum()
-            amount_30d = wallet_donations[
-                timestamps >= current_time - timedelta(days=30)
-            ]['amount'].sum()
-            
-            features_list.append({
-                'wallet_id': wallet_id,
-                'total_donations': float(np.sum(amounts)),
-                'donation_count': len(amounts),
-                'avg_donation': float(np.mean(amounts)),
-                'max_donation': float(np.max(amounts)),
-                'min_donation': float(np.min(amounts)),
-                'std_donation': float(np.std(amounts)) if len(amounts) > 1 else 0,
-                'unique_proposals': wallet_donations['proposal_id'].nunique() if 'proposal_id' in wallet_donations.columns else 0,
-                'wallet_age_days': wallet_age,
-                'avg_tx_per_day': len(amounts) / max(wallet_age, 1),
-                'donations_1d': donations_1d,
-                'donations_7d': donations_7d,
-                'donations_30d': donations_30d,
-                'amount_1d': float(amount_1d),
-                'amount_7d': float(amount_7d),
-                'amount_30d': float(amount_30d),
-                'days_since_last_tx': days_since_last,
-                'recency_score': max(0, 1 - days_since_last / 365)
-            })
-        
-        features_df = pd.DataFrame(features_list)
-        result = result.merge(features_df, on='wallet_id', how='left')
+        # Per-wallet aggregation: one groupby pass instead of a boolean mask per wallet
+        timestamps = donation_with_wallet['timestamp']
+        if getattr(timestamps.dt, 'tz', None) is not None:
+            timestamps = timestamps.dt.tz_localize(None)
+        amounts = donation_with_wallet['amount'].astype('float64')
+        
+        frame = pd.DataFrame({
+            'wallet_id': donation_with_wallet['wallet_id'],
+            'amount': amounts,
+            'timestamp': timestamps,
+        })
+        for days in (1, 7, 30):
+            in_window = timestamps >= current_time - timedelta(days=days)
+            frame[f'donations_{days}d'] = in_window.astype('int64')
+            frame[f'amount_{days}d'] = amounts.where(in_window, 0.0)
+        
+        grouped = frame.groupby('wallet_id', sort=False)
+        features_df = grouped.agg(
+            total_donations=('amount', 'sum'),
+            donation_count=('amount', 'size'),
+            avg_donation=('amount', 'mean'),
+            max_donation=('amount', 'max'),
+            min_donation=('amount', 'min'),
+            std_donation=('amount', 'std'),
+            first_tx=('timestamp', 'min'),
+            last_tx=('timestamp', 'max'),
+            donations_1d=('donations_1d', 'sum'),
+            donations_7d=('donations_7d', 'sum'),
+            donations_30d=('donations_30d', 'sum'),
+            amount_1d=('amount_1d', 'sum'),
+            amount_7d=('amount_7d', 'sum'),
+            amount_30d=('amount_30d', 'sum'),
+        )
+        # Population std (ddof=0) from the sample std, 0 for single donations
+        counts = features_df['donation_count']
+        features_df['std_donation'] = (
+            features_df['std_donation'] * np.sqrt((counts - 1) / counts)
+        ).where(counts > 1, 0.0)
+        
+        if 'proposal_id' in donation_with_wallet.columns:
+            features_df['unique_proposals'] = (
+                donation_with_wallet.groupby('wallet_id', sort=False)['proposal_id'].nunique()
+            )
+        else:
+            features_df['unique_proposals'] = 0
+        
+        features_df['wallet_age_days'] = (current_time - features_df['first_tx']).dt.days
+        features_df['days_since_last_tx'] = (current_time - features_df['last_tx']).dt.days
+        features_df['avg_tx_per_day'] = (
+            features_df['donation_count'] / features_df['wallet_age_days'].clip(lower=1)
+        )
+        features_df['recency_score'] = (1 - features_df['days_since_last_tx'] / 365).clip(lower=0)
+        
+        # Wallets without donations get neutral defaults
+        wallet_ids = pd.Index(result['wallet_id'].unique(), name='wallet_id')
+        features_df = features_df[WALLET_FEATURE_COLUMNS].reindex(wallet_ids)
+        defaults = {col: 0 for col in WALLET_FEATURE_COLUMNS}
+        defaults['days_since_last_tx'] = 365
+        features_df = features_df.fillna(defaults).astype(
+            {col: 'int64' for col in WALLET_INT_COLUMNS}
+        )
+        
+        result = result.merge(features_df.reset_index(), on='wallet_id', how='left')
         
         return result
     
@@ -253,28 +251,29 @@ class FeatureEngineer:
         """
         Compute all proposal-level features.
         """
-        result = proposals.copy()
-        
-        # Convert timestamps
-        if 'created_at' in donations.columns:
-            donations['timestamp'] = pd.to_datetime(donations['created_at'])
+        # Only the columns the aggregation reads; the caller's frame is not mutated
+        timestamp_col = 'created_at' if 'created_at' in donations.columns else 'timestamp'
+        frame = pd.DataFrame({
+            'proposal_id': donations['proposal_id'],
+            'amount': donations['amount'],
+            'donor_id': donations['donor_id'],
+            'timestamp': parse_timestamps(donations[timestamp_col]),
+        })
         
         current_time = datetime.now()
         
-        # Aggregate donation features per proposal
-        proposal_stats = donations.groupby('proposal_id').agg({
-            'amount': ['sum', 'mean', 'std', 'count', 'max', 'min'],
-            'donor_id': 'nunique',
-            'timestamp': ['min', 'max']
-        }).reset_index()
-        
-        # Flatten column names
-        proposal_stats.columns = [
-            'proposal_id', 
-            'total_donated', 'avg_donation', 'std_donation', 'donation_count', 'max_donation', 'min_donation',
-            'unique_donors',
-            'first_donation', 'last_donation'
-        ]
+        # Aggregate donation features per proposal in one named-aggregation pass
+        proposal_stats = frame.groupby('proposal_id', sort=False).agg(
+            total_donated=('amount', 'sum'),
+            avg_donation=('amount', 'mean'),
+            std_donation=('amount', 'std'),
+            donation_count=('amount', 'count'),
+            max_donation=('amount', 'max'),
+            min_donation=('amount', 'min'),
+            unique_donors=('donor_id', 'nunique'),
+            first_donation=('timestamp', 'min'),
+            last_donation=('timestamp', 'max'),
+        ).reset_index()
         
         # Calculate time-based features
         proposal_stats['days_active'] = (
@@ -290,7 +289,7 @@ class FeatureEngineer:
         )
         
         # Merge with proposals
-        result = result.merge(proposal_stats, on='proposal_id', how='left')
+        result = proposals.merge(proposal_stats, on='proposal_id', how='left')
         
         # Calculate funding progress
         if 'funding_goal' in result.columns:
@@ -315,16 +314,31 @@ class FeatureEngineer:
             Dict of computed features
         """
         amount = transaction.get('amount', 0)
-        timestamp = pd.to_datetime(transaction.get('timestamp', datetime.now()))
+        timestamp = transaction.get('timestamp')
+        
+        # Single-transaction hot path: stay on scalar stdlib calls and only
+        # fall back to pandas for timestamp formats fromisoformat rejects
+        if timestamp is None:
+            timestamp = datetime.now()
+        elif isinstance(timestamp, str):
+            try:
+                timestamp = datetime.fromisoformat(timestamp)
+            except ValueError:
+                timestamp = pd.to_datetime(timestamp)
+        elif not isinstance(timestamp, datetime):
+            timestamp = pd.to_datetime(timestamp)
+        
+        hour = timestamp.hour
+        weekday = timestamp.weekday()
         
         features = {
             'amount': amount,
-            'amount_log': np.log1p(amount),
-            'hour_of_day': timestamp.hour,
-            'day_of_week': timestamp.weekday(),
-            'is_weekend': 1 if timestamp.weekday() >= 5 else 0,
-            'is_night': 1 if timestamp.hour >= 22 or timestamp.hour <= 6 else 0,
-            'is_business_hours': 1 if 9 <= timestamp.hour <= 17 else 0,
+            'amount_log': math.log1p(amount) if amount > -1 else float('nan'),
+            'hour_of_day': hour,
+            'day_of_week': weekday,
+            'is_weekend': 1 if weekday >= 5 else 0,
+            'is_night': 1 if hour >= 22 or hour <= 6 else 0,
+            'is_business_hours': 1 if 9 <= hour <= 17 else 0,
             'month': timestamp.month,
             'day_of_month': timestamp.day
         }
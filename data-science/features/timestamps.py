@@ -0,0 +1,17 @@
+"""
+Timestamp parsing shared by the feature pipeline and the models.
+"""
+import pandas as pd
+
+
+def parse_timestamps(values) -> pd.Series:
+    """
+    Parse a column of timestamps.
+    
+    ISO 8601 strings (what the backend and the logs emit) go through pandas'
+    dedicated ISO parser; any other input falls back to the inferred parse.
+    """
+    try:
+        return pd.to_datetime(values, format='ISO8601', cache=True)
+    except ValueError:
+        return pd.to_datetime(values, cache=True)
@@ -8,10 +8,20 @@ from sklearn.cluster import KMeans, DBSCAN
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import silhouette_score, calinski_harabasz_score
 from typing import Dict, Any, Optional, List, Tuple
+from joblib import Parallel, delayed
 import pickle
 import os
 from datetime import datetime
 
+from features.timestamps import parse_timestamps
+
+
+def _score_k(X_scaled: np.ndarray, k: int, random_state: int) -> Tuple[float, float]:
+    """Fit K-Means for one k and return (inertia, silhouette)"""
+    kmeans = KMeans(n_clusters=k, random_state=random_state, n_init=10)
+    labels = kmeans.fit_predict(X_scaled)
+    return float(kmeans.inertia_), float(silhouette_score(X_scaled, labels))
+
 
 class DonorClustering:
     """
@@ -78,68 +88,74 @@ class DonorClustering:
         - donor_id: str
         - donations: list of donation dicts with amount, timestamp, proposal_id
         """
-        features = []
+        n_donors = len(donor_data)
+        features = np.zeros((n_donors, len(self.feature_names)), dtype=np.float64)
+        if n_donors == 0 or 'donations' not in donor_data.columns:
+            return features
+        
+        donation_lists = [d if isinstance(d, list) else [] for d in donor_data['donations']]
+        donation_counts = np.fromiter(
+            (len(d) for d in donation_lists), dtype=np.int64, count=n_donors
+        )
+        if not donation_counts.any():
+            return features
         
-        current_time = datetime.now()
+        # Flatten every donor's donations into one columnar frame; `codes` maps
+        # each donation row back to its donor's row index, so all features
+        # come from a few grouped passes instead of a DataFrame per donor.
+        don_df = pd.DataFrame([d for donations in donation_lists for d in donations])
+        codes = np.repeat(np.arange(n_donors), donation_counts)
         
-        for _, row in donor_data.iterrows():
-            donations = row.get('donations', [])
-            
-            if not donations:
-                features.append([0] * len(self.feature_names))
-                continue
-            
-            # Convert to DataFrame for easier processing
-            don_df = pd.DataFrame(donations)
-            if 'timestamp' in don_df.columns:
-                don_df['timestamp'] = pd.to_datetime(don_df['timestamp'])
-            
-            amounts = don_df['amount'].values
-            
-            # Calculate features
-            total_donated = np.sum(amounts)
-            donation_count = len(donations)
-            avg_donation = np.mean(amounts)
-            max_donation = np.max(amounts)
-            donation_std = np.std(amounts) if len(amounts) > 1 else 0
-            unique_proposals = don_df['proposal_id'].nunique() if 'proposal_id' in don_df.columns else 1
+        amount_stats = don_df['amount'].astype(np.float64).groupby(codes, sort=True).agg(
+            ['sum', 'max', 'std']
+        )
+        idx = amount_stats.index.to_numpy()
+        counts = donation_counts[idx]
+        
+        features[idx, 0] = amount_stats['sum'].to_numpy()
+        features[idx, 1] = counts
+        features[idx, 2] = amount_stats['sum'].to_numpy() / counts
+        features[idx, 7] = amount_stats['max'].to_numpy()
+        features[idx, 8] = np.where(
+            counts > 1,
+            np.nan_to_num(amount_stats['std'].to_numpy() * np.sqrt((counts - 1) / counts)),
+            0.0,
+        )  # population std, as np.std
+        
+        # Unique proposals (donors whose donations carry no proposal_id count as 1)
+        features[idx, 5] = 1
+        if 'proposal_id' in don_df.columns:
+            unique_proposals = don_df['proposal_id'].groupby(codes, sort=True).nunique()
+            unique_proposals = unique_proposals[unique_proposals > 0]
+            features[unique_proposals.index.to_numpy(), 5] = unique_proposals.to_numpy()
+        
+        # Time-based features (donors without timestamps keep these defaults)
+        features[idx, 3] = 30
+        features[idx, 4] = 30
+        features[idx, 6] = 1
+        features[idx, 9] = 0.5
+        if 'timestamp' in don_df.columns:
+            timestamps = parse_timestamps(don_df['timestamp'])
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_localize(None)
+            time_stats = timestamps.groupby(codes, sort=True).agg(['min', 'max', 'count'])
+            time_stats = time_stats[time_stats['count'] > 0]
+            idx = time_stats.index.to_numpy()
             
-            # Time-based features
-            if 'timestamp' in don_df.columns and len(don_df) > 0:
-                last_donation = don_df['timestamp'].max()
-                first_donation = don_df['timestamp'].min()
-                
-                days_since_last = (current_time - last_donation.to_pydatetime().replace(tzinfo=None)).days
-                days_since_first = (current_time - first_donation.to_pydatetime().replace(tzinfo=None)).days
-                
-                # Donation frequency (donations per month)
-                months_active = max((days_since_first / 30), 1)
-                donation_frequency = donation_count / months_active
-                
-                # Recency score (0-1, higher = more recent)
-                recency_score = max(0, 1 - (days_since_last / 365))
-            else:
-                days_since_last = 30
-                days_since_first = 30
-                donation_frequency = 1
-                recency_score = 0.5
+            current_time = datetime.now()
+            days_since_last = (current_time - time_stats['max']).dt.days.to_numpy()
+            days_since_first = (current_time - time_stats['min']).dt.days.to_numpy()
             
-            feature_vector = [
-                total_donated,
-                donation_count,
-                avg_donation,
-                days_since_last,
-                days_since_first,
-                unique_proposals,
-                donation_frequency,
-                max_donation,
-                donation_std,
-                recency_score
-            ]
+            # Donation frequency (donations per month)
+            months_active = np.maximum(days_since_first / 30, 1)
             
-            features.append(feature_vector)
+            features[idx, 3] = days_since_last
+            features[idx, 4] = days_since_first
+            features[idx, 6] = donation_counts[idx] / months_active
+            # Recency score (0-1, higher = more recent)
+            features[idx, 9] = np.maximum(0, 1 - days_since_last / 365)
         
-        return np.array(features)
+        return features
     
     def _compute_cluster_profiles(self, features: np.ndarray, labels: np.ndarray):
         """Compute profile statistics for each cluster"""
@@ -294,25 +310,32 @@ class DonorClustering:
         """Get profiles for all clusters"""
         return self.cluster_profiles
     
-    def get_optimal_k(self, donor_data: pd.DataFrame, k_range: range = range(2, 10)) -> Dict[str, Any]:
+    def get_optimal_k(self,
+                      donor_data: pd.DataFrame,
+                      k_range: range = range(2, 10),
+                      n_jobs: Optional[int] = None) -> Dict[str, Any]:
         """
         Find optimal number of clusters using elbow method.
         
+        Candidate k values are independent fits, so they can run in parallel
+        worker processes (n_jobs as in scikit-learn). The default runs
+        sequentially; pass n_jobs=-1 to use every core.
+        
         Returns:
             Dictionary with scores for each k
         """
         X = self.prepare_features(donor_data)
         X_scaled = self.scaler.fit_transform(X)
         
-        results = {'k': [], 'inertia': [], 'silhouette': []}
+        scores = Parallel(n_jobs=n_jobs)(
+            delayed(_score_k)(X_scaled, k, self.random_state) for k in k_range
+        )
         
-        for k in k_range:
-            kmeans = KMeans(n_clusters=k, random_state=self.random_state, n_init=10)
-            labels = kmeans.fit_predict(X_scaled)
-            
-            results['k'].append(k)
-            results['inertia'].append(float(kmeans.inertia_))
-            results['silhouette'].append(float(silhouette_score(X_scaled, labels)))
+        results = {
+            'k': list(k_range),
+            'inertia': [inertia for inertia, _ in scores],
+            'silhouette': [silhouette for _, silhouette in scores]
+        }
         
         # Find optimal k (highest silhouette)
         optimal_idx = np.argmax(results['silhouette'])
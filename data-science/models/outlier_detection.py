@@ -12,6 +12,8 @@ import pickle
 import os
 from datetime import datetime
 
+from features.timestamps import parse_timestamps
+
 
 class OutlierDetector:
     """
@@ -84,80 +86,138 @@ class OutlierDetector:
         - recipient_wallet/proposal_id: str (optional)
         """
         transactions = transactions.copy()
-        transactions['timestamp'] = pd.to_datetime(transactions['timestamp'])
+        transactions['timestamp'] = parse_timestamps(transactions['timestamp'])
         transactions = transactions.sort_values('timestamp')
         
-        features = []
-        
-        for idx, row in transactions.iterrows():
-            amount = row['amount']
-            timestamp = row['timestamp']
-            
-            # Amount features
-            amount_zscore = (
-                (amount - self.historical_stats['mean_amount']) / 
-                (self.historical_stats['std_amount'] + 1e-6)
+        n = len(transactions)
+        amount = transactions['amount'].to_numpy(dtype=np.float64)
+        timestamps = transactions['timestamp']
+        
+        # Amount features
+        amount_zscore = (
+            (amount - self.historical_stats['mean_amount']) / 
+            (self.historical_stats['std_amount'] + 1e-6)
+        )
+        amount_vs_avg = amount / (self.historical_stats['mean_amount'] + 1e-6)
+        
+        # Time features as mask arithmetic over whole columns
+        hour_of_day = timestamps.dt.hour.to_numpy()
+        day_of_week = timestamps.dt.weekday.to_numpy()
+        is_weekend = (day_of_week >= 5).astype(np.int64)
+        is_night = ((hour_of_day >= 22) | (hour_of_day <= 6)).astype(np.int64)
+        
+        # Transaction velocity (using historical if available)
+        time_since_last = np.full(n, 24.0)  # Default
+        tx_count_24h = np.zeros(n)
+        tx_count_7d = np.zeros(n)
+        unique_recipients_24h = np.zeros(n)
+        
+        if historical_transactions is not None and len(historical_transactions) > 0:
+            senders = (
+                transactions['sender_wallet']
+                if 'sender_wallet' in transactions.columns else pd.Series([''] * n)
             )
+            (time_since_last, tx_count_24h,
+             tx_count_7d, unique_recipients_24h) = self._history_features(
+                timestamps, senders, historical_transactions
+            )
+        
+        return np.column_stack([
+            amount,
+            amount_zscore,
+            time_since_last,
+            hour_of_day,
+            day_of_week,
+            is_weekend,
+            is_night,
+            tx_count_24h,
+            tx_count_7d,
+            amount_vs_avg,
+            unique_recipients_24h
+        ]).astype(np.float64, copy=False)
+    
+    @staticmethod
+    def _history_features(timestamps: pd.Series,
+                          senders: pd.Series,
+                          historical_transactions: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+        """
+        Per-transaction sender history: hours since the sender's previous
+        transaction, counts in the last 24h/7d and unique recipients in the
+        last 24h, counting only history strictly before each transaction.
+        
+        Senders are factorized to integer codes once, each sender's history
+        is sorted once, and the windows are located with searchsorted.
+        """
+        n = len(timestamps)
+        time_since_last = np.full(n, 168.0)  # 1 week default
+        tx_count_24h = np.zeros(n)
+        tx_count_7d = np.zeros(n)
+        unique_recipients_24h = np.zeros(n)
+        
+        hist = historical_transactions
+        hist_senders = hist['sender_wallet'] if 'sender_wallet' in hist.columns else pd.Series([''] * len(hist))
+        hist_ts = parse_timestamps(hist['timestamp'])
+        hist_ns = hist_ts.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        tx_ns = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        
+        recipient_col = 'proposal_id' if 'proposal_id' in hist.columns else 'recipient_wallet'
+        if recipient_col in hist.columns:
+            recipient_codes, _ = pd.factorize(hist[recipient_col])  # NaN -> -1
+        else:
+            recipient_codes = None
+        
+        # One hash pass over all senders; -1 marks missing values, which never match
+        codes, _ = pd.factorize(
+            pd.concat([pd.Series(senders).reset_index(drop=True),
+                       pd.Series(hist_senders).reset_index(drop=True)], ignore_index=True)
+        )
+        tx_codes, hist_codes = codes[:n], codes[n:]
+        
+        valid_hist = (hist_codes >= 0) & ~np.isnat(hist_ts.to_numpy(dtype='datetime64[ns]'))
+        order = np.lexsort((hist_ns, hist_codes))
+        order = order[valid_hist[order]]
+        sorted_codes = hist_codes[order]
+        sorted_ns = hist_ns[order]
+        sorted_recipients = recipient_codes[order] if recipient_codes is not None else None
+        
+        valid_tx = (tx_codes >= 0) & ~np.isnat(timestamps.to_numpy(dtype='datetime64[ns]'))
+        day_ns = np.int64(24 * 3600 * 10**9)
+        
+        for code in np.unique(tx_codes[valid_tx]):
+            start, stop = np.searchsorted(sorted_codes, [code, code + 1])
+            group_ns = sorted_ns[start:stop]
+            rows = np.flatnonzero(valid_tx & (tx_codes == code))
+            t = tx_ns[rows]
             
-            amount_vs_avg = amount / (self.historical_stats['mean_amount'] + 1e-6)
-            
-            # Time features
-            hour_of_day = timestamp.hour
-            day_of_week = timestamp.weekday()
-            is_weekend = 1 if day_of_week >= 5 else 0
-            is_night = 1 if (hour_of_day >= 22 or hour_of_day <= 6) else 0
-            
-            # Transaction velocity (using historical if available)
-            if historical_transactions is not None and len(historical_transactions) > 0:
-                sender = row.get('sender_wallet', '')
-                hist = historical_transactions[
-                    (historical_transactions.get('sender_wallet', '') == sender) &
-                    (historical_transactions['timestamp'] < timestamp)
-                ]
-                
-                # Time since last transaction
-                if len(hist) > 0:
-                    last_tx_time = hist['timestamp'].max()
-                    time_since_last = (timestamp - last_tx_time).total_seconds() / 3600
-                else:
-                    time_since_last = 168  # 1 week default
-                
-                # Transaction counts
-                last_24h = hist[hist['timestamp'] >= timestamp - pd.Timedelta(hours=24)]
-                last_7d = hist[hist['timestamp'] >= timestamp - pd.Timedelta(days=7)]
-                
-                tx_count_24h = len(last_24h)
-                tx_count_7d = len(last_7d)
-                
-                # Unique recipients in last 24h
-                recipient_col = 'proposal_id' if 'proposal_id' in last_24h.columns else 'recipient_wallet'
-                if recipient_col in last_24h.columns:
-                    unique_recipients_24h = last_24h[recipient_col].nunique()
-                else:
-                    unique_recipients_24h = 0
-            else:
-                time_since_last = 24  # Default
-                tx_count_24h = 0
-                tx_count_7d = 0
-                unique_recipients_24h = 0
+            hi = np.searchsorted(group_ns, t, side='left')  # history strictly before t
+            lo_24h = np.searchsorted(group_ns, t - day_ns, side='left')
+            lo_7d = np.searchsorted(group_ns, t - 7 * day_ns, side='left')
             
-            feature_vector = [
-                amount,
-                amount_zscore,
-                time_since_last,
-                hour_of_day,
-                day_of_week,
-                is_weekend,
-                is_night,
-                tx_count_24h,
-                tx_count_7d,
-                amount_vs_avg,
-                unique_recipients_24h
-            ]
+            has_hist = hi > 0
+            last_ns = group_ns[np.maximum(hi - 1, 0)] if len(group_ns) else t
+            time_since_last[rows] = np.where(has_hist, (t - last_ns) / 3.6e12, 168.0)
+            tx_count_24h[rows] = hi - lo_24h
+            tx_count_7d[rows] = hi - lo_7d
             
-            features.append(feature_vector)
-        
-        return np.array(features)
+            if sorted_recipients is not None:
+                group_recipients = sorted_recipients[start:stop]
+                for row, lo, up in zip(rows, lo_24h, hi):
+                    if up > lo:
+                        window = group_recipients[lo:up]
+                        unique_recipients_24h[row] = len(np.unique(window[window >= 0]))
+        
+        return time_since_last, tx_count_24h, tx_count_7d, unique_recipients_24h
+    
+    def _scale(self, X: np.ndarray, fit: bool = False) -> np.ndarray:
+        """
+        Standardize features. Isolation Forest trees compare in float32, so
+        its input is downcast once here, C-ordered, instead of being copied
+        and downcast again inside every fit/score_samples call.
+        """
+        X_scaled = self.scaler.fit_transform(X) if fit else self.scaler.transform(X)
+        if self.method == 'isolation_forest':
+            return np.ascontiguousarray(X_scaled, dtype=np.float32)
+        return X_scaled
     
     def fit(self, transactions: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -178,7 +238,7 @@ class OutlierDetector:
         
         # Prepare features
         X = self.prepare_features(transactions, transactions)
-        X_scaled = self.scaler.fit_transform(X)
+        X_scaled = self._scale(X, fit=True)
         
         # Create and fit model
         self.model = self._create_model()
@@ -223,7 +283,7 @@ class OutlierDetector:
             raise ValueError("Model not fitted. Call fit() first.")
         
         X = self.prepare_features(transactions, historical_transactions)
-        X_scaled = self.scaler.transform(X)
+        X_scaled = self._scale(X)
         
         return self.model.predict(X_scaled)
     
@@ -241,7 +301,7 @@ class OutlierDetector:
             raise ValueError("Model not fitted")
         
         X = self.prepare_features(transactions, historical_transactions)
-        X_scaled = self.scaler.transform(X)
+        X_scaled = self._scale(X)
         
         if self.method == 'isolation_forest':
             return self.model.score_samples(X_scaled)
@@ -258,23 +318,42 @@ class OutlierDetector:
         Returns:
             List of dicts with transaction info and anomaly flags
         """
-        predictions = self.predict(transactions, historical_transactions)
-        scores = self.get_anomaly_scores(transactions, historical_transactions)
+        if not self.is_fitted:
+            raise ValueError("Model not fitted. Call fit() first.")
+        
+        # Build and scale the feature matrix once for both predictions and scores
+        X = self.prepare_features(transactions, historical_transactions)
+        X_scaled = self._scale(X)
+        
+        if self.method == 'isolation_forest':
+            scores = self.model.score_samples(X_scaled)
+            # Same rule as IsolationForest.predict, without a second pass over the trees
+            predictions = np.where(scores - self.model.offset_ < 0, -1, 1)
+        else:
+            scores = self.model.decision_function(X_scaled)
+            predictions = self.model.predict(X_scaled)
+        
+        is_anomaly = (predictions == -1).tolist()
+        anomaly_scores = scores.astype(float).tolist()
+        amounts = transactions['amount'].astype(float).tolist()
+        timestamps = transactions['timestamp'].astype(str).tolist()
+        senders = (
+            transactions['sender_wallet'].tolist()
+            if 'sender_wallet' in transactions.columns else None
+        )
         
         results = []
-        for i, (_, row) in enumerate(transactions.iterrows()):
-            is_anomaly = predictions[i] == -1
-            
+        for i in range(len(transactions)):
             result = {
                 'index': i,
-                'is_anomaly': bool(is_anomaly),
-                'anomaly_score': float(scores[i]),
-                'amount': float(row['amount']),
-                'timestamp': str(row['timestamp'])
+                'is_anomaly': is_anomaly[i],
+                'anomaly_score': anomaly_scores[i],
+                'amount': amounts[i],
+                'timestamp': timestamps[i]
             }
             
-            if 'sender_wallet' in row:
-                result['sender_wallet'] = row['sender_wallet']
+            if senders is not None:
+                result['sender_wallet'] = senders[i]
             
             results.append(result)
         
@@ -289,7 +368,7 @@ class OutlierDetector:
             return {}
         
         X = self.prepare_features(transactions, transactions)
-        X_scaled = self.scaler.transform(X)
+        X_scaled = self._scale(X)
         
         base_scores = self.model.score_samples(X_scaled)
         base_outlier_rate = np.mean(base_scores < np.percentile(base_scores, self.contamination * 100))
@@ -345,50 +424,45 @@ class OutlierDetector:
 
 def generate_synthetic_transactions(n_normal: int = 1000, n_anomalous: int = 50) -> pd.DataFrame:
     """Generate synthetic transaction data with known anomalies"""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
+    base_time = pd.Timestamp(datetime.now())
     
-    transactions = []
-    base_time = datetime.now()
+    # Wallet/proposal labels are formatted once and indexed, not per row
+    wallet_labels = np.array([f'0x{i:040x}' for i in range(100)], dtype=object)
+    proposal_labels = np.array([f'proposal_{i}' for i in range(20)], dtype=object)
     
     # Normal transactions
-    for i in range(n_normal):
-        amount = np.random.lognormal(5, 1)  # Log-normal distribution
-        hour = np.random.choice(range(8, 22))  # Business hours mostly
-        day_offset = np.random.randint(0, 90)
-        
-        transactions.append({
-            'amount': amount,
-            'timestamp': base_time - pd.Timedelta(days=day_offset, hours=24-hour),
-            'sender_wallet': f'0x{np.random.randint(0, 100):040x}',
-            'proposal_id': f'proposal_{np.random.randint(1, 20)}',
-            'is_anomaly': False
-        })
+    normal_amount = rng.lognormal(5, 1, size=n_normal)  # Log-normal distribution
+    normal_hour = rng.integers(8, 22, size=n_normal)  # Business hours mostly
+    normal_wallet = rng.integers(0, 100, size=n_normal)
+    normal_proposal = rng.integers(1, 20, size=n_normal)
+    
+    # Anomalous transactions: 0 = high_amount, 1 = rapid_fire, 2 = odd_timing
+    anomaly_type = rng.integers(0, 3, size=n_anomalous)
+    anomalous_amount = np.select(
+        [anomaly_type == 0, anomaly_type == 1],
+        [rng.lognormal(8, 0.5, size=n_anomalous),  # Much higher
+         rng.lognormal(3, 0.5, size=n_anomalous)],  # Small but many
+        default=rng.lognormal(5, 1, size=n_anomalous)
+    )
+    anomalous_hour = np.where(
+        anomaly_type == 2,
+        rng.integers(2, 6, size=n_anomalous),  # Late night
+        rng.integers(0, 24, size=n_anomalous)
+    )
+    anomalous_wallet = rng.integers(0, 10, size=n_anomalous)  # Fewer unique wallets
+    anomalous_proposal = rng.integers(1, 5, size=n_anomalous)
     
-    # Anomalous transactions
-    for i in range(n_anomalous):
-        anomaly_type = np.random.choice(['high_amount', 'rapid_fire', 'odd_timing'])
-        
-        if anomaly_type == 'high_amount':
-            amount = np.random.lognormal(8, 0.5)  # Much higher
-            hour = np.random.randint(0, 24)
-        elif anomaly_type == 'rapid_fire':
-            amount = np.random.lognormal(3, 0.5)  # Small but many
-            hour = np.random.randint(0, 24)
-        else:  # odd_timing
-            amount = np.random.lognormal(5, 1)
-            hour = np.random.choice([2, 3, 4, 5])  # Late night
-        
-        day_offset = np.random.randint(0, 90)
-        
-        transactions.append({
-            'amount': amount,
-            'timestamp': base_time - pd.Timedelta(days=day_offset, hours=24-hour),
-            'sender_wallet': f'0x{np.random.randint(0, 10):040x}',  # Fewer unique wallets
-            'proposal_id': f'proposal_{np.random.randint(1, 5)}',
-            'is_anomaly': True
-        })
+    hour = np.concatenate([normal_hour, anomalous_hour])
+    day_offset = rng.integers(0, 90, size=n_normal + n_anomalous)
     
-    return pd.DataFrame(transactions)
+    return pd.DataFrame({
+        'amount': np.concatenate([normal_amount, anomalous_amount]),
+        'timestamp': base_time - pd.to_timedelta(day_offset * 24 + 24 - hour, unit='h'),
+        'sender_wallet': wallet_labels[np.concatenate([normal_wallet, anomalous_wallet])],
+        'proposal_id': proposal_labels[np.concatenate([normal_proposal, anomalous_proposal])],
+        'is_anomaly': np.repeat([False, True], [n_normal, n_anomalous])
+    })
 
 
 if __name__ == "__main__":
@@ -33,6 +33,7 @@ class ProposalRecommender:
         self.donor_similarity = None
         self.donor_ids = []
         self.proposal_ids = []
+        self.donor_index: Dict[str, int] = {}  # donor_id -> row in donor_proposal_matrix
         
         # Content-based components
         self.proposal_features = None
@@ -41,6 +42,7 @@ class ProposalRecommender:
         
         # Popularity baseline
         self.proposal_popularity = {}
+        self.popularity_ranking: List[Tuple[str, float]] = []  # (proposal_id, score), most popular first
         
         self.is_fitted = False
         self.training_info = {}
@@ -56,6 +58,7 @@ class ProposalRecommender:
         
         donor_idx = {d: i for i, d in enumerate(self.donor_ids)}
         proposal_idx = {p: i for i, p in enumerate(self.proposal_ids)}
+        self.donor_index = donor_idx
         
         # Build sparse matrix
         rows, cols, data = [], [], []
@@ -129,6 +132,15 @@ class ProposalRecommender:
         )
         
         self.proposal_popularity = popularity['score'].to_dict()
+        self.popularity_ranking = self._rank_by_popularity()
+    
+    def _rank_by_popularity(self) -> List[Tuple[str, float]]:
+        """Order proposals by popularity once; the scores only change on fit/load"""
+        return sorted(
+            self.proposal_popularity.items(),
+            key=lambda x: x[1],
+            reverse=True
+        )
     
     def fit(self, donations: pd.DataFrame, proposals: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -170,11 +182,10 @@ class ProposalRecommender:
     
     def _collaborative_scores(self, donor_id: str) -> Dict[str, float]:
         """Get collaborative filtering scores for a donor"""
-        if donor_id not in self.donor_ids:
+        donor_idx = self.donor_index.get(donor_id)
+        if donor_idx is None:
             return {}
         
-        donor_idx = self.donor_ids.index(donor_id)
-        
         # Get similar donors
         similarities = self.donor_similarity[donor_idx]
         similar_donors_idx = np.argsort(similarities)[::-1][1:11]  # Top 10 similar
@@ -204,35 +215,27 @@ class ProposalRecommender:
     
     def _content_scores(self, donor_id: str) -> Dict[str, float]:
         """Get content-based scores based on donor's past funded proposals"""
-        if donor_id not in self.donor_ids:
+        donor_idx = self.donor_index.get(donor_id)
+        if donor_idx is None:
             return {}
         
-        donor_idx = self.donor_ids.index(donor_id)
-        
         # Get proposals this donor has funded
         funded_proposal_indices = self.donor_proposal_matrix[donor_idx].nonzero()[1]
         
         if len(funded_proposal_indices) == 0:
             return {}
         
-        # Calculate average similarity to funded proposals
-        scores = {}
-        funded_proposals = set(self.proposal_ids[i] for i in funded_proposal_indices)
+        # Average similarity of every proposal to the funded ones, in one
+        # slice of the precomputed similarity matrix
+        avg_similarity = self.proposal_similarity[
+            :len(self.proposal_ids), funded_proposal_indices
+        ].mean(axis=1)
+        avg_similarity[funded_proposal_indices] = -np.inf  # already funded
         
-        for p_idx, proposal_id in enumerate(self.proposal_ids):
-            if proposal_id in funded_proposals:
-                continue
-            
-            # Average similarity to all funded proposals
-            avg_similarity = np.mean([
-                self.proposal_similarity[p_idx, fp_idx]
-                for fp_idx in funded_proposal_indices
-            ])
-            
-            if avg_similarity >= self.min_similarity:
-                scores[proposal_id] = avg_similarity
-        
-        return scores
+        return {
+            self.proposal_ids[p_idx]: avg_similarity[p_idx]
+            for p_idx in np.flatnonzero(avg_similarity >= self.min_similarity)
+        }
     
     def recommend(self, donor_id: str, exclude_funded: bool = True) -> List[Dict[str, Any]]:
         """
@@ -290,19 +293,13 @@ class ProposalRecommender:
     
     def recommend_for_new_donor(self) -> List[Dict[str, Any]]:
         """Cold-start recommendations for new donors (popularity-based)"""
-        sorted_proposals = sorted(
-            self.proposal_popularity.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:self.n_recommendations]
-        
         return [
             {
                 'proposal_id': pid,
                 'score': float(score),
                 'method': 'popularity'
             }
-            for pid, score in sorted_proposals
+            for pid, score in self.popularity_ranking[:self.n_recommendations]
         ]
     
     def save(self, path: str):
@@ -331,9 +328,11 @@ class ProposalRecommender:
             self.donor_similarity = data['donor_similarity']
             self.donor_ids = data['donor_ids']
             self.proposal_ids = data['proposal_ids']
+            self.donor_index = {d: i for i, d in enumerate(self.donor_ids)}
             self.proposal_features = data['proposal_features']
             self.proposal_similarity = data['proposal_similarity']
             self.proposal_popularity = data['proposal_popularity']
+            self.popularity_ranking = self._rank_by_popularity()
             self.category_encoder = data['category_encoder']
             self.n_recommendations = data['n_recommendations']
             self.min_similarity = data['min_similarity']
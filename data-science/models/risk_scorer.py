@@ -9,11 +9,13 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import classification_report, roc_auc_score, precision_recall_curve
 from typing import Dict, Any, Optional, List, Tuple
-import pickle
+import joblib
 import os
 from datetime import datetime
 import json
 
+from features.timestamps import parse_timestamps
+
 
 class RiskScorer:
     """
@@ -51,6 +53,12 @@ class RiskScorer:
         ]
         self.is_fitted = False
         self.training_metrics = {}
+        # Per-leaf P(risky) for every tree, flattened, plus each tree's offset
+        self._leaf_proba: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    
+    # Batches up to this size are scored through the leaf table; larger ones
+    # amortize sklearn's validation/dispatch and use predict_proba directly.
+    LEAF_TABLE_MAX_BATCH = 1024
     
     def _create_model(self):
         """Create the underlying ML model"""
@@ -84,88 +92,98 @@ class RiskScorer:
         - sybil_score: float (optional)
         - balance_history: list of balance snapshots
         """
-        features = []
+        n_wallets = len(wallet_data)
+        features = np.zeros((n_wallets, len(self.feature_names)), dtype=np.float64)
+        if n_wallets == 0:
+            return features
         
-        for _, row in wallet_data.iterrows():
-            transactions = row.get('transactions', [])
-            
-            if not transactions:
-                # No transactions - assign neutral features
-                features.append([0] * len(self.feature_names))
-                continue
-            
-            tx_df = pd.DataFrame(transactions)
-            if 'timestamp' in tx_df.columns:
-                tx_df['timestamp'] = pd.to_datetime(tx_df['timestamp'])
-                tx_df = tx_df.sort_values('timestamp')
-            
-            # Calculate features
-            tx_count = len(transactions)
-            amounts = tx_df['amount'].values if 'amount' in tx_df.columns else [0]
-            avg_tx_amount = np.mean(amounts)
-            max_tx_amount = np.max(amounts)
-            min_tx_amount = np.min(amounts)
-            tx_amount_std = np.std(amounts) if len(amounts) > 1 else 0
-            
-            # Time-based features
-            if 'timestamp' in tx_df.columns and len(tx_df) > 0:
-                first_tx = tx_df['timestamp'].min()
-                last_tx = tx_df['timestamp'].max()
-                days_active = (last_tx - first_tx).days + 1
-                days_since_first_tx = (datetime.now() - first_tx.to_pydatetime().replace(tzinfo=None)).days
-                tx_frequency_per_day = tx_count / max(days_active, 1)
-                
-                # Time between transactions
-                if len(tx_df) > 1:
-                    time_diffs = tx_df['timestamp'].diff().dropna()
-                    avg_time_between_tx_hours = time_diffs.mean().total_seconds() / 3600
-                else:
-                    avg_time_between_tx_hours = 0
-                
-                # Weekend/night patterns
-                tx_df['hour'] = tx_df['timestamp'].dt.hour
-                tx_df['dayofweek'] = tx_df['timestamp'].dt.dayofweek
-                weekend_tx_ratio = (tx_df['dayofweek'] >= 5).mean()
-                night_tx_ratio = ((tx_df['hour'] >= 22) | (tx_df['hour'] <= 6)).mean()
-            else:
-                days_since_first_tx = 0
-                tx_frequency_per_day = 0
-                avg_time_between_tx_hours = 0
-                weekend_tx_ratio = 0.3
-                night_tx_ratio = 0.2
-            
-            # Unique proposals
-            unique_proposals = tx_df['proposal_id'].nunique() if 'proposal_id' in tx_df.columns else 0
-            
-            # Sybil score
-            sybil_score = row.get('sybil_score', 0.5)
+        tx_lists = (
+            [txs if isinstance(txs, list) else [] for txs in wallet_data['transactions']]
+            if 'transactions' in wallet_data.columns else [[] for _ in range(n_wallets)]
+        )
+        tx_counts = np.fromiter((len(txs) for txs in tx_lists), dtype=np.int64, count=n_wallets)
+        has_tx = tx_counts > 0
+        
+        # Flatten every wallet's transactions into one columnar frame; `codes`
+        # maps each transaction row back to its wallet's row index.
+        tx_df = pd.DataFrame([tx for txs in tx_lists for tx in txs])
+        codes = np.repeat(np.arange(n_wallets), tx_counts)
+        
+        # Amount features
+        if 'amount' in tx_df.columns:
+            amounts = tx_df['amount'].astype(np.float64).fillna(0.0)
+        else:
+            amounts = pd.Series(np.zeros(len(tx_df)))
+        amount_stats = amounts.groupby(codes, sort=True).agg(['mean', 'max', 'min', 'std'])
+        idx = amount_stats.index.to_numpy()
+        tx_amount_std = amount_stats['std'].to_numpy() * np.sqrt(
+            (tx_counts[idx] - 1) / tx_counts[idx]
+        )  # population std, as np.std
+        
+        features[:, 0] = tx_counts
+        features[idx, 1] = amount_stats['mean'].to_numpy()
+        features[idx, 8] = amount_stats['max'].to_numpy()
+        features[idx, 9] = amount_stats['min'].to_numpy()
+        features[idx, 10] = np.where(tx_counts[idx] > 1, np.nan_to_num(tx_amount_std), 0.0)
+        
+        # Time-based features (wallets without timestamps keep defaults)
+        features[has_tx, 11] = 0.3
+        features[has_tx, 12] = 0.2
+        if 'timestamp' in tx_df.columns:
+            timestamps = parse_timestamps(tx_df['timestamp'])
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_localize(None)
+            hours = timestamps.dt.hour
+            time_stats = pd.DataFrame({
+                'timestamp': timestamps,
+                'weekend': timestamps.dt.dayofweek >= 5,
+                'night': (hours >= 22) | (hours <= 6),
+            }).groupby(codes, sort=True).agg(
+                first_tx=('timestamp', 'min'),
+                last_tx=('timestamp', 'max'),
+                n_ts=('timestamp', 'count'),
+                weekend_tx_ratio=('weekend', 'mean'),
+                night_tx_ratio=('night', 'mean'),
+            )
+            time_stats = time_stats[time_stats['n_ts'] > 0]
+            idx = time_stats.index.to_numpy()
             
-            # Balance volatility
-            balance_history = row.get('balance_history', [])
-            if len(balance_history) > 1:
-                balance_volatility = np.std(balance_history) / (np.mean(balance_history) + 1e-6)
-            else:
-                balance_volatility = 0
+            span = time_stats['last_tx'] - time_stats['first_tx']
+            days_active = span.dt.days.to_numpy() + 1
+            n_ts = time_stats['n_ts'].to_numpy()
             
-            feature_vector = [
-                tx_count,
-                avg_tx_amount,
-                days_since_first_tx,
-                unique_proposals,
-                sybil_score,
-                balance_volatility,
-                tx_frequency_per_day,
-                avg_time_between_tx_hours,
-                max_tx_amount,
-                min_tx_amount,
-                tx_amount_std,
-                weekend_tx_ratio,
-                night_tx_ratio
+            features[idx, 2] = (datetime.now() - time_stats['first_tx']).dt.days.to_numpy()
+            features[idx, 6] = tx_counts[idx] / np.maximum(days_active, 1)
+            # Mean gap between sorted timestamps telescopes to span / (n - 1)
+            features[idx, 7] = np.where(
+                n_ts > 1, span.dt.total_seconds().to_numpy() / 3600 / np.maximum(n_ts - 1, 1), 0.0
+            )
+            features[idx, 11] = time_stats['weekend_tx_ratio'].to_numpy()
+            features[idx, 12] = time_stats['night_tx_ratio'].to_numpy()
+        
+        # Unique proposals
+        if 'proposal_id' in tx_df.columns:
+            unique_proposals = tx_df['proposal_id'].groupby(codes, sort=True).nunique()
+            features[unique_proposals.index.to_numpy(), 3] = unique_proposals.to_numpy()
+        
+        # Sybil score
+        if 'sybil_score' in wallet_data.columns:
+            features[:, 4] = wallet_data['sybil_score'].to_numpy(dtype=np.float64)
+        else:
+            features[:, 4] = 0.5
+        
+        # Balance volatility
+        if 'balance_history' in wallet_data.columns:
+            features[:, 5] = [
+                np.std(history) / (np.mean(history) + 1e-6)
+                if isinstance(history, (list, np.ndarray)) and len(history) > 1 else 0
+                for history in wallet_data['balance_history']
             ]
-            
-            features.append(feature_vector)
         
-        return np.array(features)
+        # No transactions - assign neutral features
+        features[~has_tx] = 0
+        
+        return features
     
     def fit(self, wallet_data: pd.DataFrame, labels: np.ndarray) -> Dict[str, Any]:
         """
@@ -179,7 +197,9 @@ class RiskScorer:
             Dictionary of training metrics
         """
         X = self.prepare_features(wallet_data)
-        X_scaled = self.scaler.fit_transform(X)
+        # Tree ensembles work in float32 internally; cast once, C-ordered, so
+        # fit/predict don't each copy-and-downcast the float64 scaler output
+        X_scaled = np.ascontiguousarray(self.scaler.fit_transform(X), dtype=np.float32)
         
         # Split for validation
         X_train, X_val, y_train, y_val = train_test_split(
@@ -208,9 +228,39 @@ class RiskScorer:
             'trained_at': datetime.now().isoformat()
         }
         
+        self._build_leaf_proba()
         self.is_fitted = True
         return self.training_metrics
     
+    def _build_leaf_proba(self):
+        """Precompute the leaf probability table for random forest models"""
+        self._leaf_proba = None
+        if not isinstance(self.model, RandomForestClassifier) or len(self.model.classes_) != 2:
+            return
+        
+        tables, offsets = [], []
+        n_nodes = 0
+        for tree in self.model.estimators_:
+            value = tree.tree_.value[:, 0, :]
+            tables.append(value[:, 1] / value.sum(axis=1))
+            offsets.append(n_nodes)
+            n_nodes += len(value)
+        
+        self._leaf_proba = (np.concatenate(tables), np.array(offsets, dtype=np.intp))
+    
+    def _score(self, X_scaled: np.ndarray) -> np.ndarray:
+        """P(risky) for already-scaled features"""
+        # Callers passing C-contiguous float32 avoid a copy here
+        X32 = np.ascontiguousarray(X_scaled, dtype=np.float32)
+        if self._leaf_proba is None or len(X32) > self.LEAF_TABLE_MAX_BATCH:
+            return self.model.predict_proba(X32)[:, 1]
+        
+        # Small batches: look up each tree's leaf directly and average the
+        # leaf probabilities, skipping predict_proba's per-call overhead.
+        table, offsets = self._leaf_proba
+        leaves = np.column_stack([tree.tree_.apply(X32) for tree in self.model.estimators_])
+        return table[leaves + offsets].mean(axis=1)
+    
     def predict_risk_score(self, wallet_data: pd.DataFrame) -> np.ndarray:
         """
         Predict risk scores for wallets.
@@ -227,7 +277,7 @@ class RiskScorer:
         X = self.prepare_features(wallet_data)
         X_scaled = self.scaler.transform(X)
         
-        return self.model.predict_proba(X_scaled)[:, 1]
+        return self._score(X_scaled)
     
     def is_risky(self, wallet_data: pd.DataFrame) -> np.ndarray:
         """
@@ -246,29 +296,40 @@ class RiskScorer:
         return dict(zip(self.feature_names, self.model.feature_importances_))
     
     def save(self, path: str):
-        """Save model to disk"""
+        """
+        Save model to disk.
+        
+        Uses joblib so the forest's NumPy arrays are stored as raw buffers
+        that load() can memory-map instead of copying.
+        """
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'wb') as f:
-            pickle.dump({
-                'model': self.model,
-                'scaler': self.scaler,
-                'threshold': self.threshold,
-                'feature_names': self.feature_names,
-                'training_metrics': self.training_metrics,
-                'model_type': self.model_type
-            }, f)
+        joblib.dump({
+            'model': self.model,
+            'scaler': self.scaler,
+            'threshold': self.threshold,
+            'feature_names': self.feature_names,
+            'training_metrics': self.training_metrics,
+            'model_type': self.model_type
+        }, path)
     
-    def load(self, path: str):
-        """Load model from disk"""
-        with open(path, 'rb') as f:
-            data = pickle.load(f)
-            self.model = data['model']
-            self.scaler = data['scaler']
-            self.threshold = data['threshold']
-            self.feature_names = data['feature_names']
-            self.training_metrics = data['training_metrics']
-            self.model_type = data['model_type']
-            self.is_fitted = True
+    def load(self, path: str, mmap_mode: Optional[str] = 'r'):
+        """
+        Load model from disk.
+        
+        Args:
+            path: File written by save() (plain pickles also load)
+            mmap_mode: joblib memory-map mode for array data; 'r' shares
+                read-only pages between inference processes, None copies
+        """
+        data = joblib.load(path, mmap_mode=mmap_mode)
+        self.model = data['model']
+        self.scaler = data['scaler']
+        self.threshold = data['threshold']
+        self.feature_names = data['feature_names']
+        self.training_metrics = data['training_metrics']
+        self.model_type = data['model_type']
+        self._build_leaf_proba()
+        self.is_fitted = True
 
 
 def generate_synthetic_training_data(n_samples: int = 1000) -> Tuple[pd.DataFrame, np.ndarray]:
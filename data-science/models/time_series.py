@@ -20,6 +20,8 @@ except ImportError:
 
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 
+from features.timestamps import parse_timestamps
+
 
 class DonationForecaster:
     """
@@ -55,15 +57,19 @@ class DonationForecaster:
         """
         # Ensure timestamp is datetime
         donations = donations.copy()
-        donations['timestamp'] = pd.to_datetime(donations['timestamp'])
+        donations['timestamp'] = parse_timestamps(donations['timestamp'])
+        
+        # Prophet rejects tz-aware ds; keep the local wall-clock day, as
+        # .dt.date used to
+        if donations['timestamp'].dt.tz is not None:
+            donations['timestamp'] = donations['timestamp'].dt.tz_localize(None)
         
         # Aggregate by day
-        daily = donations.groupby(donations['timestamp'].dt.date).agg({
+        daily = donations.groupby(donations['timestamp'].dt.normalize()).agg({
             'amount': 'sum'
         }).reset_index()
         
         daily.columns = ['ds', 'y']
-        daily['ds'] = pd.to_datetime(daily['ds'])
         
         # Fill missing dates with 0
         date_range = pd.date_range(
@@ -0,0 +1,23 @@
+"""
+Tests for A/B test variant assignment.
+"""
+import hashlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from experimentation.ab_testing import ABTest, Variant
+
+
+def test_assignment_matches_hexdigest_hashing():
+    test = ABTest(
+        name='cta_copy',
+        variants=[Variant('control', weight=0.5), Variant('treatment', weight=0.5)]
+    )
+
+    for i in range(200):
+        user_id = f'user_{i}'
+        hash_value = int(hashlib.md5(f'{user_id}:cta_copy'.encode()).hexdigest(), 16)
+        expected = 'control' if (hash_value % 10000) / 10000 < 0.5 else 'treatment'
+        assert test.assign_variant(user_id) == expected
@@ -0,0 +1,48 @@
+"""
+Tests for the wallet risk scoring helpers behind the API.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.endpoints import (
+    MAX_RISK_BATCH_SIZE, WalletRiskBatchRequest, WalletRiskRequest, _risk_inputs, _wallet_jitter
+)
+
+
+def test_wallet_jitter_is_per_address_and_bounded():
+    addresses = [f'0x{i:040x}' for i in range(2000)]
+    jitter = _wallet_jitter(addresses)
+
+    assert jitter.shape == (2000,)
+    assert jitter.min() >= -0.1 and jitter.max() < 0.1
+    # Same address, same noise, regardless of batch composition
+    np.testing.assert_array_equal(_wallet_jitter(addresses[::-1]), jitter[::-1])
+    assert len(np.unique(jitter)) == len(addresses)
+
+
+def test_risk_inputs_columns():
+    requests = [
+        WalletRiskRequest(wallet_address='0xa', sybil_score=0.2,
+                          transactions=[{'amount': 3}, {'amount': 4}]),
+        WalletRiskRequest(wallet_address='0xb'),
+    ]
+    sybil_scores, tx_counts, total_amounts, jitter = _risk_inputs(requests)
+
+    np.testing.assert_array_equal(sybil_scores, [0.2, 0.5])
+    np.testing.assert_array_equal(tx_counts, [2, 0])
+    np.testing.assert_array_equal(total_amounts, [7.0, 0.0])
+    np.testing.assert_array_equal(jitter, _wallet_jitter(['0xa', '0xb']))
+
+
+def test_batch_size_is_bounded():
+    wallet = {'wallet_address': '0xa'}
+    WalletRiskBatchRequest(wallets=[wallet] * MAX_RISK_BATCH_SIZE)
+
+    with pytest.raises(ValidationError):
+        WalletRiskBatchRequest(wallets=[wallet] * (MAX_RISK_BATCH_SIZE + 1))
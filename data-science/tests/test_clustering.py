@@ -0,0 +1,27 @@
+"""
+Tests for donor clustering.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.clustering import DonorClustering, generate_synthetic_donor_data
+
+
+@pytest.fixture
+def donor_data():
+    return generate_synthetic_donor_data(120)
+
+
+def test_optimal_k_parallel_matches_sequential(donor_data):
+    k_range = range(2, 5)
+    sequential = DonorClustering().get_optimal_k(donor_data, k_range)
+    parallel = DonorClustering().get_optimal_k(donor_data, k_range, n_jobs=2)
+
+    assert sequential['k'] == [2, 3, 4]
+    assert sequential['inertia'] == pytest.approx(parallel['inertia'])
+    assert sequential['silhouette'] == pytest.approx(parallel['silhouette'])
+    assert sequential['optimal_k'] == parallel['optimal_k']
@@ -0,0 +1,46 @@
+"""
+Tests for model prediction logging and stats.
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ds_logging.model_logger import ModelLogger
+
+
+@pytest.fixture
+def logger(tmp_path):
+    logger = ModelLogger(log_dir=str(tmp_path), async_write=False)
+    for model_name, latency in [('risk', 10.0), ('risk', 30.0), ('risk', 20.0), ('cluster', 40.0)]:
+        logger.log_prediction(model_name, {'x': 1}, 0.5, latency)
+    return logger
+
+
+def test_model_stats(logger):
+    assert logger.get_model_stats() == {
+        'total_predictions': 4,
+        'avg_latency_ms': 25.0,
+        'p50_latency_ms': 30.0,
+        'p95_latency_ms': 40.0,
+        'max_latency_ms': 40.0,
+        'min_latency_ms': 10.0,
+        'models': {
+            'risk': {'count': 3, 'avg_latency': 20.0},
+            'cluster': {'count': 1, 'avg_latency': 40.0},
+        }
+    }
+    assert logger.get_model_stats('cluster')['total_predictions'] == 1
+
+
+def test_read_logs_time_filter(logger):
+    now = datetime.now()
+    logs = logger.read_prediction_logs(start_time=now - timedelta(minutes=1))
+
+    assert len(logs) == 4
+    assert datetime.fromisoformat(logs[0]['timestamp']) <= now
+    assert logger.read_prediction_logs(start_time=now + timedelta(minutes=1)) == []
+    assert logger.read_prediction_logs(end_time=now - timedelta(minutes=1)) == []
@@ -0,0 +1,44 @@
+"""
+Tests for outlier detection features.
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.outlier_detection import OutlierDetector
+
+
+def test_history_features_match_per_row_scan():
+    start = datetime(2024, 3, 1)
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame({
+        'sender_wallet': rng.choice(['a', 'b', 'c'], 60),
+        'proposal_id': rng.choice(['p1', 'p2', 'p3', 'p4'], 60),
+        'timestamp': [start + timedelta(hours=float(h)) for h in rng.uniform(0, 240, 60)],
+    })
+    transactions = pd.DataFrame({
+        'sender_wallet': ['a', 'b', 'c', 'd', 'a'],
+        'timestamp': pd.to_datetime([start + timedelta(hours=h) for h in (100, 200, 5, 150, 239)]),
+    })
+
+    got = OutlierDetector._history_features(
+        transactions['timestamp'], transactions['sender_wallet'], history
+    )
+
+    for i, (sender, t) in enumerate(zip(transactions['sender_wallet'], transactions['timestamp'])):
+        prior = history[(history['sender_wallet'] == sender) & (history['timestamp'] < t)]
+        last_24h = prior[prior['timestamp'] >= t - timedelta(hours=24)]
+        last_7d = prior[prior['timestamp'] >= t - timedelta(days=7)]
+        since_last = (t - prior['timestamp'].max()).total_seconds() / 3600 if len(prior) else 168.0
+
+        assert got[0][i] == pytest.approx(since_last)
+        assert got[1][i] == len(last_24h)
+        assert got[2][i] == len(last_7d)
+        assert got[3][i] == last_24h['proposal_id'].nunique()
+
@@ -0,0 +1,44 @@
+"""
+Tests for the wallet risk scorer.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.risk_scorer import RiskScorer, generate_synthetic_training_data
+
+
+@pytest.fixture(scope='module')
+def fitted_scorer():
+    wallet_data, labels = generate_synthetic_training_data(300)
+    scorer = RiskScorer()
+    scorer.fit(wallet_data, labels)
+    return scorer, wallet_data
+
+
+def test_leaf_table_matches_predict_proba(fitted_scorer):
+    scorer, wallet_data = fitted_scorer
+    X_scaled = scorer.scaler.transform(scorer.prepare_features(wallet_data.head(50)))
+
+    expected = scorer.model.predict_proba(X_scaled.astype(np.float32))[:, 1]
+
+    assert scorer._leaf_proba is not None
+    np.testing.assert_allclose(scorer._score(X_scaled), expected, rtol=1e-12)
+
+
+def test_save_load_round_trip(fitted_scorer, tmp_path):
+    scorer, wallet_data = fitted_scorer
+    path = str(tmp_path / 'saved' / 'risk_scorer.pkl')
+    scorer.save(path)
+
+    loaded = RiskScorer()
+    loaded.load(path)
+
+    np.testing.assert_array_equal(
+        loaded.predict_risk_score(wallet_data.head(20)),
+        scorer.predict_risk_score(wallet_data.head(20))
+    )
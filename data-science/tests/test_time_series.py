@@ -0,0 +1,59 @@
+"""
+Tests for the donation forecaster's data preparation.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.time_series import DonationForecaster
+
+
+class TestPrepareData:
+    """Daily aggregation feeding Prophet / the moving-average fallback"""
+
+    def test_tz_aware_input_yields_naive_days(self):
+        donations = pd.DataFrame({
+            'timestamp': ['2024-01-01T10:00:00+00:00', '2024-01-01T23:30:00+00:00',
+                          '2024-01-03T08:00:00+00:00'],
+            'amount': [10.0, 5.0, 2.5],
+        })
+
+        daily = DonationForecaster().prepare_data(donations)
+
+        assert daily['ds'].dt.tz is None
+        assert list(daily['ds']) == list(pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03']))
+        assert list(daily['y']) == [15.0, 0.0, 2.5]
+
+    def test_tz_aware_input_keeps_local_day(self):
+        donations = pd.DataFrame({
+            'timestamp': ['2024-01-01T23:30:00+05:00'],
+            'amount': [1.0],
+        })
+
+        daily = DonationForecaster().prepare_data(donations)
+
+        assert list(daily['ds']) == [pd.Timestamp('2024-01-01')]
+
+    def test_non_iso_strings_still_parse(self):
+        donations = pd.DataFrame({
+            'timestamp': ['01/02/2024 10:00', '01/02/2024 18:00', '01/03/2024 09:00'],
+            'amount': [1.0, 2.0, 3.0],
+        })
+
+        daily = DonationForecaster().prepare_data(donations)
+
+        assert list(daily['ds']) == list(pd.to_datetime(['2024-01-02', '2024-01-03']))
+        assert list(daily['y']) == [3.0, 3.0]
+
+    def test_datetime_column_passes_through(self):
+        donations = pd.DataFrame({
+            'timestamp': pd.to_datetime(['2024-03-01 12:00', '2024-03-02 12:00']),
+            'amount': [4.0, 6.0],
+        })
+
+        daily = DonationForecaster().prepare_data(donations)
+
+        assert list(daily['y']) == [4.0, 6.0]
@@ -2,11 +2,11 @@
 Security API Endpoints
 FastAPI application for security monitoring and administration.
 """
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncio
 import sys
 from pathlib import Path
@@ -122,10 +122,13 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 # MONITORING ENDPOINTS
 # =============================================================================
 
-@app.get("/metrics")
+@app.get("/metrics", response_class=Response)
 async def get_prometheus_metrics():
     """Export metrics in Prometheus format"""
-    return metrics_collector.export_prometheus()
+    return Response(
+        content=metrics_collector.export_prometheus().encode(),
+        media_type="text/plain; version=0.0.4"
+    )
 
 
 @app.get("/api/v1/kpis")
@@ -347,18 +350,21 @@ async def run_retention_policies(
 # HEALTH CHECK
 # =============================================================================
 
+HEALTH_COMPONENTS = {
+    "auth": "ok",
+    "monitoring": "ok",
+    "siem": "ok",
+    "rate_limiter": "ok"
+}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "components": {
-            "auth": "ok",
-            "monitoring": "ok",
-            "siem": "ok",
-            "rate_limiter": "ok"
-        }
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "components": HEALTH_COMPONENTS
     }
 
 
@@ -377,4 +383,5 @@ if __name__ == "__main__":
     import uvicorn
     print("Starting DonCoin DAO Security API...")
     print("Open http://localhost:8070/docs for Swagger UI")
-    uvicorn.run(app, host="0.0.0.0", port=8070)
+    # "auto" selects uvloop/httptools when installed (uvicorn[standard]), else asyncio/h11
+    uvicorn.run(app, host="0.0.0.0", port=8070, loop="auto", http="auto")
@@ -11,20 +11,31 @@ from passlib.context import CryptContext
 from pydantic import BaseModel
 import os
 import sys
-import json
+import time
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from config.settings import AUTH_CONFIG, DEFAULT_ADMIN, LOGS_DIR
+from utils.jsonl import json_line
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=AUTH_CONFIG['bcrypt_rounds'],
+)
 
 # Bearer token scheme
 security = HTTPBearer()
 
+# Successfully decoded tokens are reused briefly so bursts of requests with the
+# same token skip the signature check. Entries never outlive the token's exp.
+TOKEN_CACHE_TTL_SECONDS = 1.0
+TOKEN_CACHE_MAX_SIZE = 1024
+_token_cache: Dict[str, tuple[float, "TokenData"]] = {}  # token -> (monotonic valid_until, data)
+
 # =============================================================================
 # MODELS
 # =============================================================================
@@ -88,19 +99,27 @@ def get_password_hash(password: str) -> str:
 
 def get_user(username: str) -> Optional[UserInDB]:
     """Get user from database"""
-    if username in USERS_DB:
-        user_dict = USERS_DB[username]
-        return UserInDB(**user_dict)
-    return None
+    user_dict = USERS_DB.get(username)
+    if user_dict is None:
+        return None
+    return UserInDB(**user_dict)
 
 
 def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
     """Authenticate user with username and password"""
     user = get_user(username)
     if not user:
+        # Spend the same bcrypt time as a real check so response timing
+        # does not reveal which usernames exist
+        pwd_context.dummy_verify()
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        # Stored hash used an older scheme or work factor; upgrade it in place
+        USERS_DB[username]['hashed_password'] = new_hash
+        user.hashed_password = new_hash
     return user
 
 
@@ -129,6 +148,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def decode_token(token: str) -> Optional[TokenData]:
     """Decode and validate a JWT token"""
+    now = time.monotonic()
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if now < cached[0]:
+            return cached[1]
+        # Expired entries are dropped lazily when they are next looked up
+        _token_cache.pop(token, None)
+    
     try:
         payload = jwt.decode(
             token, 
@@ -139,9 +166,18 @@ def decode_token(token: str) -> Optional[TokenData]:
         if username is None:
             return None
         token_scopes = payload.get("scopes", [])
-        return TokenData(username=username, scopes=token_scopes)
+        token_data = TokenData(username=username, scopes=token_scopes)
     except JWTError:
         return None
+    
+    if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+        _token_cache.clear()
+    ttl = TOKEN_CACHE_TTL_SECONDS
+    if payload.get("exp") is not None:
+        # exp is wall-clock; convert it to a monotonic deadline once here
+        ttl = min(ttl, float(payload["exp"]) - time.time())
+    _token_cache[token] = (now + ttl, token_data)
+    return token_data
 
 
 # =============================================================================
@@ -168,8 +204,8 @@ def log_admin_access(
     }
     
     log_file = LOGS_DIR / "admin_access.jsonl"
-    with open(log_file, 'a') as f:
-        f.write(json.dumps(log_entry) + '\n')
+    with open(log_file, 'ab') as f:
+        f.write(json_line(log_entry))
 
 
 def log_auth_event(
@@ -190,8 +226,8 @@ def log_auth_event(
     }
     
     log_file = LOGS_DIR / "auth_events.jsonl"
-    with open(log_file, 'a') as f:
-        f.write(json.dumps(log_entry) + '\n')
+    with open(log_file, 'ab') as f:
+        f.write(json_line(log_entry))
 
 
 # =============================================================================
@@ -212,22 +248,19 @@ async def get_current_user(
     if token_data is None:
         raise credentials_exception
     
-    user = get_user(token_data.username)
-    if user is None:
+    # One dict lookup and one model build; the password hash is not needed here
+    user_dict = USERS_DB.get(token_data.username)
+    if user_dict is None:
         raise credentials_exception
     
+    user = User(**user_dict)
     if user.disabled:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is disabled"
         )
     
-    return User(
-        username=user.username,
-        email=user.email,
-        is_admin=user.is_admin,
-        disabled=user.disabled
-    )
+    return user
 
 
 async def get_current_admin(
@@ -28,6 +28,14 @@ DATABASE_CONFIG = {
 
 DATABASE_URL = f"postgresql://{DATABASE_CONFIG['user']}:{DATABASE_CONFIG['password']}@{DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}/{DATABASE_CONFIG['name']}"
 
+# SQLAlchemy engine/pool options shared by the dashboard data providers
+DATABASE_ENGINE_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+    "pool_pre_ping": True,   # drop dead connections instead of failing a refresh
+    "pool_recycle": 1800,    # seconds; stay under server-side idle timeouts
+}
+
 # =============================================================================
 # REDIS CONFIGURATION (for rate limiting)
 # =============================================================================
@@ -49,6 +57,7 @@ AUTH_CONFIG = {
     "algorithm": "HS256",
     "access_token_expire_minutes": 30,
     "refresh_token_expire_days": 7,
+    "bcrypt_rounds": int(os.getenv("BCRYPT_ROUNDS", "12")),  # Work factor for new hashes
 }
 
 # Default admin credentials (CHANGE IN PRODUCTION!)
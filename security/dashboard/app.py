@@ -4,15 +4,16 @@ Multi-section dashboard with Overview, Firewall, SIEM, and Django/Map sections
 """
 import dash
 from dash import dcc, html, callback, Input, Output, State, ALL, ctx
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
 import os
+from collections import Counter
 import sys
 
 # Add parent directory to path
@@ -49,6 +50,26 @@ app = dash.Dash(
     title='DonCoin DAO - Security Operations Center'
 )
 
+# =============================================================================
+# SHARED COMPONENTS
+# =============================================================================
+
+# Static placeholders returned by the refresh callbacks; built once at import
+# instead of on every interval tick.
+KPI_STATUS_COLORS = {"ok": "success", "warning": "warning", "critical": "danger"}
+NO_KPI_DATA = html.P("No KPI data", className="text-muted")
+NO_ACTIVE_ALERTS = html.P("✓ No active alerts", className="text-success")
+NO_EVENTS = html.P("No events", className="text-muted")
+DATA_UNAVAILABLE = html.P("Data not available", className="text-muted")
+NO_BLOCKED_IPS = html.P("No blocked IPs", className="text-muted")
+NO_WHITELISTED_IPS = html.P("No whitelisted IPs", className="text-muted")
+NO_BLOCKED_REQUESTS = html.P("No blocked requests", className="text-muted")
+NO_TRANSACTIONS = html.P("No transactions", className="text-muted")
+NO_DATA = html.P("No data", className="text-muted")
+NO_DJANGO_REQUESTS = html.P("No Django requests logged yet", className="text-muted")
+NO_ACTIVE_SESSIONS = html.P("No active sessions", className="text-muted")
+
+
 # =============================================================================
 # NAVIGATION
 # =============================================================================
@@ -466,7 +487,7 @@ def update_overview(n):
     kpi_cards = dbc.Row([
         dbc.Col(create_kpi_mini_card(k, v), md=6, lg=3) 
         for k, v in kpis.items()
-    ]) if kpis else html.P("No KPI data", className="text-muted")
+    ]) if kpis else NO_KPI_DATA
     
     # Alerts
     if alerts:
@@ -478,7 +499,7 @@ def update_overview(n):
             for a in alerts[:5]
         ])
     else:
-        alerts_content = html.P("✓ No active alerts", className="text-success")
+        alerts_content = NO_ACTIVE_ALERTS
     
     # Events table
     events_table = create_events_table(events[:20])
@@ -496,8 +517,7 @@ def update_overview(n):
 
 
 def create_kpi_mini_card(name, data):
-    status_colors = {"ok": "success", "warning": "warning", "critical": "danger"}
-    color = status_colors.get(data.get("status", "ok"), "secondary")
+    color = KPI_STATUS_COLORS.get(data.get("status", "ok"), "secondary")
     config = MONITORING_KPIS.get(name, {})
     
     return dbc.Card([
@@ -514,7 +534,7 @@ def create_kpi_mini_card(name, data):
 
 def create_events_table(events):
     if not events:
-        return html.P("No events", className="text-muted")
+        return NO_EVENTS
     
     rows = []
     for e in events:
@@ -537,17 +557,21 @@ def create_timeline_chart(events):
     if not events:
         return go.Figure()
     
-    # Count events by hour
-    df = pd.DataFrame(events)
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df["hour"] = df["timestamp"].dt.floor("H")
-        counts = df.groupby("hour").size().reset_index(name="count")
-        
-        fig = px.area(counts, x="hour", y="count", 
-                      color_discrete_sequence=["#00bc8c"])
-    else:
-        fig = go.Figure()
+    # Count events by hour straight from the event dicts; at most a few
+    # dozen events per refresh, so a DataFrame round trip isn't worth it
+    counts = Counter()
+    for e in events:
+        ts = e.get("timestamp")
+        if ts:
+            counts[datetime.fromisoformat(ts).replace(minute=0, second=0, microsecond=0)] += 1
+    
+    fig = go.Figure()
+    if counts:
+        hours = sorted(counts)
+        fig.add_trace(go.Scatter(
+            x=hours, y=[counts[h] for h in hours],
+            mode="lines", fill="tozeroy", line=dict(color="#00bc8c")
+        ))
     
     fig.update_layout(
         template="plotly_dark",
@@ -573,12 +597,16 @@ def create_timeline_chart(events):
      Output("whitelist-count", "children"),
      Output("blocking-stats", "children"),
      Output("blocked-requests-log", "children")],
-    Input("refresh-interval", "n_intervals")
+    [Input("refresh-interval", "n_intervals"),
+     Input("current-section", "data")]
 )
-def update_firewall(n):
+def update_firewall(n, section):
+    # Hidden sections aren't rebuilt; switching back re-triggers via current-section
+    if section != "firewall":
+        raise PreventUpdate
+    
     if not DATA_AVAILABLE:
-        empty = html.P("Data not available", className="text-muted")
-        return empty, empty, 0, 0, empty, empty
+        return DATA_UNAVAILABLE, DATA_UNAVAILABLE, 0, 0, DATA_UNAVAILABLE, DATA_UNAVAILABLE
     
     blacklist = get_blacklist()
     whitelist = get_whitelist()
@@ -586,10 +614,10 @@ def update_firewall(n):
     blocked_reqs = get_blocked_requests(50)
     
     # Blacklist table
-    bl_table = create_ip_table(blacklist, "blacklist") if blacklist else html.P("No blocked IPs", className="text-muted")
+    bl_table = create_ip_table(blacklist, "blacklist") if blacklist else NO_BLOCKED_IPS
     
     # Whitelist table
-    wl_table = create_ip_table(whitelist, "whitelist") if whitelist else html.P("No whitelisted IPs", className="text-muted")
+    wl_table = create_ip_table(whitelist, "whitelist") if whitelist else NO_WHITELISTED_IPS
     
     # Stats
     stats_content = html.Div([
@@ -601,7 +629,7 @@ def update_firewall(n):
     ])
     
     # Blocked requests
-    blocked_log = create_blocked_log(blocked_reqs) if blocked_reqs else html.P("No blocked requests", className="text-muted")
+    blocked_log = create_blocked_log(blocked_reqs) if blocked_reqs else NO_BLOCKED_REQUESTS
     
     return bl_table, wl_table, len(blacklist), len(whitelist), stats_content, blocked_log
 
@@ -666,12 +694,15 @@ def add_ip(n_clicks, ip, reason, list_type):
      Input("siem-search", "value"),
      Input("siem-category", "value"),
      Input("siem-outcome", "value"),
-     Input("siem-ip-filter", "value")]
+     Input("siem-ip-filter", "value"),
+     Input("current-section", "data")]
 )
-def update_siem(n, query, category, outcome, ip_filter):
+def update_siem(n, query, category, outcome, ip_filter, section):
+    if section != "siem":
+        raise PreventUpdate
+    
     if not DATA_AVAILABLE:
-        empty = html.P("Data not available", className="text-muted")
-        return empty, 0, go.Figure(), empty
+        return DATA_UNAVAILABLE, 0, go.Figure(), DATA_UNAVAILABLE
     
     # Search logs
     logs = search_logs(
@@ -720,7 +751,7 @@ def update_siem(n, query, category, outcome, ip_filter):
             html.Span(f" → {t.get('to', '')[:20]}", className="ms-1")
         ], className="mb-1") for t in txs[:10]]
     else:
-        tx_items = [html.P("No transactions", className="text-muted")]
+        tx_items = [NO_TRANSACTIONS]
     
     return html.Div(log_items), len(logs), fig, html.Div(tx_items)
 
@@ -746,12 +777,15 @@ def download_logs(n_clicks, query, category):
      Output("top-cities", "children"),
      Output("django-endpoints", "children"),
      Output("active-sessions", "children")],
-    Input("refresh-interval", "n_intervals")
+    [Input("refresh-interval", "n_intervals"),
+     Input("current-section", "data")]
 )
-def update_geomap(n):
+def update_geomap(n, section):
+    if section != "geomap":
+        raise PreventUpdate
+    
     if not DATA_AVAILABLE:
-        empty = html.P("Data not available", className="text-muted")
-        return go.Figure(), empty, empty, empty, empty
+        return go.Figure(), DATA_UNAVAILABLE, DATA_UNAVAILABLE, DATA_UNAVAILABLE, DATA_UNAVAILABLE
     
     # Map
     map_data = get_connection_map_data()
@@ -800,14 +834,14 @@ def update_geomap(n):
             html.Span(f"{c['country']}", className="me-2"),
             dbc.Badge(c["count"], color="primary")
         ], className="mb-1") for c in stats.get("top_countries", [])[:10]
-    ]) if stats.get("top_countries") else html.P("No data", className="text-muted")
+    ]) if stats.get("top_countries") else NO_DATA
     
     cities = html.Div([
         html.Div([
             html.Span(f"{c['city']}", className="me-2"),
             dbc.Badge(c["count"], color="info")
         ], className="mb-1") for c in stats.get("top_cities", [])[:10]
-    ]) if stats.get("top_cities") else html.P("No data", className="text-muted")
+    ]) if stats.get("top_cities") else NO_DATA
     
     # Django endpoints
     django = get_django_endpoint_stats()
@@ -823,7 +857,7 @@ def update_geomap(n):
             html.Tbody(endpoint_rows)
         ], size="sm", hover=True)
     else:
-        endpoints_table = html.P("No Django requests logged yet", className="text-muted")
+        endpoints_table = NO_DJANGO_REQUESTS
     
     # Sessions
     sessions = get_active_sessions()
@@ -835,7 +869,7 @@ def update_geomap(n):
             html.Small(s.get("location", ""), className="text-muted")
         ], className="mb-2") for s in sessions[:10]]
     else:
-        session_items = [html.P("No active sessions", className="text-muted")]
+        session_items = [NO_ACTIVE_SESSIONS]
     
     return fig, countries, cities, endpoints_table, html.Div(session_items)
 
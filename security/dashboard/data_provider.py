@@ -13,13 +13,13 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-from config.settings import DATABASE_URL, MONITORING_KPIS, LOGS_DIR
+from config.settings import DATABASE_URL, DATABASE_ENGINE_OPTIONS, MONITORING_KPIS, LOGS_DIR
 import pandas as pd
 import json
 
 # Create database engine
 try:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **DATABASE_ENGINE_OPTIONS)
     SessionLocal = sessionmaker(bind=engine)
     DB_AVAILABLE = True
 except Exception as e:
@@ -234,32 +234,38 @@ def get_dashboard_stats() -> Dict[str, Any]:
         return get_fallback_stats()
     
     try:
-        # Count various entities
-        proposal_count = session.execute(text("SELECT COUNT(*) FROM base_proposal")).scalar() or 0
-        donation_count = session.execute(text("SELECT COUNT(*) FROM base_donation")).scalar() or 0
-        wallet_count = session.execute(text("SELECT COUNT(*) FROM base_wallet")).scalar() or 0
-        active_wallets = session.execute(text("SELECT COUNT(*) FROM base_wallet WHERE status = 'active'")).scalar() or 0
-        flagged_wallets = session.execute(text("SELECT COUNT(*) FROM base_wallet WHERE status = 'flagged'")).scalar() or 0
-        
-        # Get total donation amount
-        total_donations = session.execute(text("SELECT COALESCE(SUM(amount), 0) FROM base_donation")).scalar() or 0
-        
-        # Get recent events count
-        recent_events = session.execute(text("""
-            SELECT COUNT(*) FROM base_contractevent 
-            WHERE timestamp > NOW() - INTERVAL '24 hours'
-        """)).scalar() or 0
+        # Count various entities in a single round trip
+        (proposal_count, donation_count, total_donations, wallet_count,
+         active_wallets, flagged_wallets, recent_events) = session.execute(text("""
+            SELECT
+                (SELECT COUNT(*) FROM base_proposal),
+                d.donation_count,
+                d.total_donations,
+                w.wallet_count,
+                w.active_wallets,
+                w.flagged_wallets,
+                (SELECT COUNT(*) FROM base_contractevent
+                 WHERE timestamp > NOW() - INTERVAL '24 hours')
+            FROM
+                (SELECT COUNT(*) AS donation_count,
+                        COALESCE(SUM(amount), 0) AS total_donations
+                 FROM base_donation) d,
+                (SELECT COUNT(*) AS wallet_count,
+                        COUNT(*) FILTER (WHERE status = 'active') AS active_wallets,
+                        COUNT(*) FILTER (WHERE status = 'flagged') AS flagged_wallets
+                 FROM base_wallet) w
+        """)).one()
         
         session.close()
         
         return {
-            'total_proposals': int(proposal_count),
-            'total_donations': int(donation_count),
-            'total_donation_amount': float(total_donations),
-            'total_wallets': int(wallet_count),
-            'active_wallets': int(active_wallets),
-            'flagged_wallets': int(flagged_wallets),
-            'recent_events_24h': int(recent_events),
+            'total_proposals': int(proposal_count or 0),
+            'total_donations': int(donation_count or 0),
+            'total_donation_amount': float(total_donations or 0),
+            'total_wallets': int(wallet_count or 0),
+            'active_wallets': int(active_wallets or 0),
+            'flagged_wallets': int(flagged_wallets or 0),
+            'recent_events_24h': int(recent_events or 0),
             'db_connected': True
         }
         
@@ -5,6 +5,9 @@ Manages IP blacklist/whitelist and blocked request tracking
 import os
 import sys
 import json
+from bisect import bisect_left
+from collections import Counter
+from operator import itemgetter
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from pathlib import Path
@@ -14,11 +17,11 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from sqlalchemy import create_engine, text, Column, String, DateTime, Boolean
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from config.settings import DATABASE_URL, LOGS_DIR
+from config.settings import DATABASE_URL, DATABASE_ENGINE_OPTIONS, LOGS_DIR
 
 # Create database engine
 try:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **DATABASE_ENGINE_OPTIONS)
     SessionLocal = sessionmaker(bind=engine)
     Base = declarative_base()
     DB_AVAILABLE = True
@@ -202,6 +205,25 @@ def record_blocked_request(ip: str, reason: str, endpoint: str = "", user_agent:
     _save_blocked_requests(requests)
 
 
+_timestamp = itemgetter("timestamp")
+
+
+def _blocked_since(requests: List[Dict], cutoff: datetime) -> List[Dict]:
+    """
+    Blocked requests at or after cutoff.
+    Entries are appended in time order with naive isoformat() timestamps,
+    which sort lexicographically, so a binary search on the raw strings
+    finds the window without parsing any of them.
+    """
+    start = bisect_left(requests, cutoff.isoformat(), key=_timestamp)
+    return requests[start:]
+
+
+def _is_rate_limited(request: Dict) -> bool:
+    """Whether a blocked request was blocked by rate limiting"""
+    return "rate" in request.get("reason", "").lower()
+
+
 def get_blocked_requests(limit: int = 100) -> List[Dict[str, Any]]:
     """Get recent blocked requests"""
     requests = _load_blocked_requests()
@@ -218,27 +240,21 @@ def get_blocked_stats() -> Dict[str, Any]:
     """Get blocking statistics"""
     requests = _load_blocked_requests()
     
-    # Count by reason
-    reason_counts = {}
-    ip_counts = {}
-    
     # Only count last 24 hours
     cutoff = datetime.now() - timedelta(hours=24)
-    recent = [r for r in requests if datetime.fromisoformat(r["timestamp"]) > cutoff]
+    recent = _blocked_since(requests, cutoff)
     
-    for r in recent:
-        reason = r.get("reason", "Unknown")
-        ip = r.get("ip", "Unknown")
-        reason_counts[reason] = reason_counts.get(reason, 0) + 1
-        ip_counts[ip] = ip_counts.get(ip, 0) + 1
+    # Count by reason and IP
+    reason_counts = Counter(r.get("reason", "Unknown") for r in recent)
+    ip_counts = Counter(r.get("ip", "Unknown") for r in recent)
     
     # Top blocked IPs
-    top_ips = sorted(ip_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_ips = ip_counts.most_common(10)
     
     return {
         "total_blocked_24h": len(recent),
         "total_blocked_all": len(requests),
-        "by_reason": reason_counts,
+        "by_reason": dict(reason_counts),
         "top_blocked_ips": [{"ip": ip, "count": count} for ip, count in top_ips],
         "blacklist_size": len(get_blacklist()),
         "whitelist_size": len(get_whitelist())
@@ -255,14 +271,11 @@ def get_rate_limit_stats() -> Dict[str, Any]:
     # For now, generate from blocked requests with rate_limit reason
     requests = _load_blocked_requests()
     
-    rate_limited = [r for r in requests if "rate" in r.get("reason", "").lower()]
+    recent = _blocked_since(requests, datetime.now() - timedelta(hours=24))
     
     return {
-        "total_rate_limited": len(rate_limited),
-        "rate_limited_24h": len([
-            r for r in rate_limited 
-            if datetime.fromisoformat(r["timestamp"]) > datetime.now() - timedelta(hours=24)
-        ]),
+        "total_rate_limited": sum(map(_is_rate_limited, requests)),
+        "rate_limited_24h": sum(map(_is_rate_limited, recent)),
         "endpoints": {}  # Would be populated from actual rate limit middleware
     }
 
@@ -11,9 +11,12 @@ from typing import List, Dict, Any, Optional
 from pathlib import Path
 from collections import defaultdict
 
+import pandas as pd
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from config.settings import LOGS_DIR, DATABASE_URL
+from dashboard.siem_data import _read_jsonl_file
 
 # Cache for IP geolocation results
 GEO_CACHE_FILE = LOGS_DIR / "geo_cache.json"
@@ -138,18 +141,7 @@ def log_connection(ip: str, endpoint: str = "", user_agent: str = "",
 
 def get_connections(limit: int = 500) -> List[Dict[str, Any]]:
     """Get recent connections with geo data"""
-    if not CONNECTIONS_LOG_FILE.exists():
-        return []
-    
-    connections = []
-    with open(CONNECTIONS_LOG_FILE, 'r') as f:
-        for line in f:
-            try:
-                connections.append(json.loads(line.strip()))
-            except:
-                continue
-    
-    return list(reversed(connections[-limit:]))
+    return list(reversed(_read_jsonl_file(CONNECTIONS_LOG_FILE, limit)))
 
 
 def get_connection_map_data() -> Dict[str, Any]:
@@ -245,33 +237,33 @@ def get_django_endpoint_stats() -> Dict[str, Any]:
             except:
                 continue
     
-    # Aggregate by endpoint
-    endpoints = defaultdict(lambda: {"count": 0, "avg_time": 0, "errors": 0, "times": []})
+    if not requests:
+        return {"endpoints": [], "total_requests": 0, "total_endpoints": 0}
     
-    for req in requests:
-        path = req.get("path", "/")
-        endpoints[path]["count"] += 1
-        endpoints[path]["times"].append(req.get("response_time_ms", 0))
-        if req.get("status_code", 200) >= 400:
-            endpoints[path]["errors"] += 1
+    # Aggregate by endpoint, column-wise
+    df = pd.DataFrame({
+        "path": [req.get("path", "/") for req in requests],
+        "response_time_ms": [req.get("response_time_ms", 0) for req in requests],
+        "is_error": [req.get("status_code", 200) >= 400 for req in requests],
+    })
+    endpoints = df.groupby("path", sort=False).agg(
+        requests=("path", "size"),
+        avg_response_ms=("response_time_ms", "mean"),
+        errors=("is_error", "sum"),
+    )
     
-    # Calculate averages
-    result = []
-    for path, data in endpoints.items():
-        avg_time = sum(data["times"]) / len(data["times"]) if data["times"] else 0
-        result.append({
-            "endpoint": path,
-            "requests": data["count"],
-            "avg_response_ms": round(avg_time, 2),
-            "errors": data["errors"],
-            "error_rate": round(data["errors"] / data["count"] * 100, 1) if data["count"] > 0 else 0
-        })
+    # Derived columns and rounding in one vectorized pass each
+    endpoints["error_rate"] = (endpoints["errors"] / endpoints["requests"] * 100).round(1)
+    endpoints["avg_response_ms"] = endpoints["avg_response_ms"].round(2)
     
     # Sort by request count
-    result.sort(key=lambda x: x["requests"], reverse=True)
+    top = endpoints.sort_values("requests", ascending=False, kind="stable").head(20)
+    result = top.reset_index().rename(columns={"path": "endpoint"})[
+        ["endpoint", "requests", "avg_response_ms", "errors", "error_rate"]
+    ].to_dict("records")
     
     return {
-        "endpoints": result[:20],
+        "endpoints": result,
         "total_requests": len(requests),
         "total_endpoints": len(endpoints)
     }
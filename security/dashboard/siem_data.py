@@ -6,20 +6,21 @@ import os
 import sys
 import json
 import re
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from config.settings import LOGS_DIR, DATABASE_URL
+from config.settings import LOGS_DIR, DATABASE_URL, DATABASE_ENGINE_OPTIONS
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 # Create database engine
 try:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **DATABASE_ENGINE_OPTIONS)
     SessionLocal = sessionmaker(bind=engine)
     DB_AVAILABLE = True
 except Exception as e:
@@ -101,20 +102,107 @@ def log_access(resource: str, action: str, user: str, ip: str = "", allowed: boo
 # LOG READING
 # =============================================================================
 
+TAIL_CHUNK_SIZE = 64 * 1024
+# Appends larger than this since the last poll are skipped over with a fresh tail
+FOLLOW_MAX_APPEND_BYTES = 16 * TAIL_CHUNK_SIZE
+FOLLOW_STATE_MAX = 64
+
+# (path, limit) -> (inode, offset just past the last complete line, deque of lines)
+_follow_state: Dict[tuple, tuple] = {}
+# Dash runs callbacks on threaded workers; two polls of the same file must not
+# both read from the same offset and extend the shared deque twice
+_follow_lock = threading.Lock()
+
+
+def _read_tail(f, end: int, limit: int) -> tuple[int, bytes]:
+    """Read backwards from `end` until more than `limit` newlines are covered"""
+    pos = end
+    chunks = []
+    newlines = 0
+    # A trailing newline terminates the last line rather than starting a new one
+    while pos > 0 and newlines <= limit:
+        step = min(TAIL_CHUNK_SIZE, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step)
+        chunks.append(chunk)
+        newlines += chunk.count(b'\n')
+    return pos, b''.join(reversed(chunks))
+
+
+def tail_lines(filepath: Path, limit: int) -> List[str]:
+    """Return the last `limit` lines of a file, reading backwards from the end"""
+    if limit <= 0:
+        return []
+    
+    with open(filepath, 'rb') as f:
+        _, data = _read_tail(f, f.seek(0, os.SEEK_END), limit)
+    
+    return data.decode('utf-8', errors='replace').splitlines()[-limit:]
+
+
+def follow_lines(filepath: Path, limit: int) -> List[str]:
+    """
+    Return the last `limit` complete lines of an append-only log.
+    
+    Repeated calls for the same file and limit only read the bytes appended
+    since the previous call; a new inode or a shrunken file (rotation,
+    truncation) starts over with a fresh tail.
+    """
+    if limit <= 0:
+        return []
+    
+    key = (str(filepath), limit)
+    with _follow_lock:
+        with open(filepath, 'rb') as f:
+            st = os.fstat(f.fileno())
+            state = _follow_state.get(key)
+            if (state is None or state[0] != st.st_ino or st.st_size < state[1]
+                    or st.st_size - state[1] > FOLLOW_MAX_APPEND_BYTES):
+                offset, data = _read_tail(f, st.st_size, limit)
+                # A leading partial line, if any, is pushed out by maxlen
+                lines = deque(maxlen=limit)
+            else:
+                _, offset, lines = state
+                f.seek(offset)
+                data = f.read(st.st_size - offset)
+        
+        # Only newline-terminated lines are taken; a line still being written is
+        # picked up on the next call
+        last_newline = data.rfind(b'\n')
+        if last_newline >= 0:
+            lines.extend(data[:last_newline].decode('utf-8', errors='replace').split('\n'))
+            offset += last_newline + 1
+        
+        if key not in _follow_state and len(_follow_state) >= FOLLOW_STATE_MAX:
+            _follow_state.clear()
+        _follow_state[key] = (st.st_ino, offset, lines)
+        return list(lines)
+
+
 def _read_jsonl_file(filepath: Path, limit: int = 1000) -> List[Dict]:
     """Read a JSONL file and return last N entries"""
-    if not filepath.exists():
+    if limit <= 0 or not filepath.exists():
         return []
     
-    events = []
-    with open(filepath, 'r') as f:
-        for line in f:
+    # Only the tail of the file is read (and on later polls only what was
+    # appended since), so cost scales with the limit rather than the log size.
+    # The limit counts parsed entries: while blank or malformed lines leave the
+    # tail short, read twice as far back until enough parse or the whole file
+    # has been read.
+    window = limit
+    while True:
+        lines = follow_lines(filepath, window)
+        events = []
+        for line in lines:
             try:
-                events.append(json.loads(line.strip()))
+                events.append(json.loads(line))
             except:
                 continue
-    
-    return events[-limit:]
+        
+        if len(events) >= limit or len(lines) < window:
+            return events[-limit:]
+        window *= 2
 
 
 def get_siem_events(limit: int = 500) -> List[Dict[str, Any]]:
@@ -3,12 +3,13 @@ Rate Limiting Middleware for DonCoin DAO
 Implements per-IP and per-endpoint rate limiting with monitoring hooks.
 """
 from typing import Optional, Callable, Dict, Any
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
+from collections import OrderedDict, defaultdict, deque
 import time
-import json
-import asyncio
-from functools import wraps
+import math
+import heapq
+from functools import lru_cache, wraps
+from operator import itemgetter
 from pathlib import Path
 import sys
 
@@ -20,34 +21,68 @@ from starlette.responses import JSONResponse
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from config.settings import RATE_LIMIT_CONFIG, LOGS_DIR
+from utils.jsonl import json_line
+
+
+LIMIT_PERIODS = {
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+}
+
+
+@lru_cache(maxsize=64)
+def parse_limit(limit_str: str) -> tuple[int, int]:
+    """Parse limit string like '100/minute' into (count, seconds)"""
+    count, period = limit_str.split('/')
+    return int(count), LIMIT_PERIODS.get(period, 60)
 
 
 class InMemoryRateLimiter:
     """
-    Simple in-memory rate limiter.
+    Simple in-memory token-bucket rate limiter.
     For production, use Redis-backed implementation.
+    
+    Each key holds a bucket of up to ``count`` tokens that refills at
+    ``count / period`` tokens per second; a request spends one token.
+    
+    The service runs on a single event loop and a check never awaits, so
+    each check is atomic with respect to other requests and needs no lock.
     """
     
+    MAX_KEYS = 65536
+    # An overflow sweep trims the table down to this size, so sweeps are
+    # amortized over MAX_KEYS - SWEEP_TARGET_KEYS new keys
+    SWEEP_TARGET_KEYS = MAX_KEYS * 7 // 8
+    
     def __init__(self):
-        # Structure: {key: [(timestamp, count), ...]}
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.blocked_ips: Dict[str, datetime] = {}
-        self.lock = asyncio.Lock()
+        # key -> [tokens, last_refill_monotonic, capacity, rate], in LRU order
+        self._buckets: OrderedDict[str, list] = OrderedDict()
+        self.blocked_ips: Dict[str, float] = {}  # ip -> monotonic blocked-until
+    
+    def _sweep(self, now: float):
+        """
+        Shrink the bucket table after it overflows MAX_KEYS.
+        A bucket that has refilled to capacity behaves exactly like a
+        missing one, so those are dropped first and evicting them loses no
+        state. Only if that is not enough are the least recently used
+        buckets evicted. Throttled keys therefore cannot be pushed out
+        simply by flooding the table with new keys.
+        """
+        buckets = self._buckets
+        refilled = [
+            key for key, (tokens, last, capacity, rate) in buckets.items()
+            if tokens + (now - last) * rate >= capacity
+        ]
+        for key in refilled:
+            del buckets[key]
+        while len(buckets) > self.SWEEP_TARGET_KEYS:
+            buckets.popitem(last=False)
     
     def _parse_limit(self, limit_str: str) -> tuple[int, int]:
         """Parse limit string like '100/minute' into (count, seconds)"""
-        count, period = limit_str.split('/')
-        count = int(count)
-        
-        period_map = {
-            'second': 1,
-            'minute': 60,
-            'hour': 3600,
-            'day': 86400,
-        }
-        
-        seconds = period_map.get(period, 60)
-        return count, seconds
+        return parse_limit(limit_str)
     
     async def is_rate_limited(
         self,
@@ -60,54 +95,56 @@ class InMemoryRateLimiter:
         Returns:
             tuple of (is_limited, info_dict)
         """
-        async with self.lock:
-            # Check if IP is blocked
-            if key in self.blocked_ips:
-                if datetime.now() < self.blocked_ips[key]:
-                    remaining_seconds = (self.blocked_ips[key] - datetime.now()).seconds
+        # Check if IP is blocked
+        if self.blocked_ips:
+            blocked_until = self.blocked_ips.get(key)
+            if blocked_until is not None:
+                now = time.monotonic()
+                if now < blocked_until:
                     return True, {
                         'blocked': True,
-                        'retry_after': remaining_seconds,
+                        'retry_after': math.ceil(blocked_until - now),
                         'reason': 'IP blocked due to abuse'
                     }
-                else:
-                    del self.blocked_ips[key]
-            
-            max_requests, window_seconds = self._parse_limit(limit)
-            now = time.time()
-            window_start = now - window_seconds
-            
-            # Clean old entries
-            self.requests[key] = [
-                (ts, c) for ts, c in self.requests[key] 
-                if ts > window_start
-            ]
-            
-            # Count requests in window
-            request_count = sum(c for _, c in self.requests[key])
-            
-            if request_count >= max_requests:
-                return True, {
-                    'blocked': False,
-                    'limit': max_requests,
-                    'window': window_seconds,
-                    'current': request_count,
-                    'retry_after': int(window_seconds - (now - self.requests[key][0][0])) if self.requests[key] else window_seconds
-                }
-            
-            # Add request
-            self.requests[key].append((now, 1))
-            
-            return False, {
+                del self.blocked_ips[key]
+        
+        max_requests, window_seconds = parse_limit(limit)
+        rate = max_requests / window_seconds
+        now = time.monotonic()
+        
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) >= self.MAX_KEYS:
+                self._sweep(now)
+            bucket = [float(max_requests), now, max_requests, rate]
+            buckets[key] = bucket
+        else:
+            buckets.move_to_end(key)
+            # Refill lazily for the time elapsed since the last check
+            bucket[0] = min(max_requests, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        
+        if bucket[0] < 1:
+            return True, {
+                'blocked': False,
                 'limit': max_requests,
-                'remaining': max_requests - request_count - 1,
-                'reset': int(now + window_seconds),
+                'window': window_seconds,
+                'current': max_requests - int(bucket[0]),
+                'retry_after': math.ceil((1 - bucket[0]) / rate)
             }
+        
+        bucket[0] -= 1
+        
+        return False, {
+            'limit': max_requests,
+            'remaining': int(bucket[0]),
+            'reset': int(time.time() + (max_requests - bucket[0]) / rate),
+        }
     
     async def block_ip(self, ip: str, duration_seconds: int):
         """Block an IP for a specified duration"""
-        async with self.lock:
-            self.blocked_ips[ip] = datetime.now() + timedelta(seconds=duration_seconds)
+        self.blocked_ips[ip] = time.monotonic() + duration_seconds
 
 
 # Global rate limiter instance
@@ -139,8 +176,8 @@ def log_rate_limit_event(
     }
     
     log_file = LOGS_DIR / "rate_limit_events.jsonl"
-    with open(log_file, 'a') as f:
-        f.write(json.dumps(log_entry) + '\n')
+    with open(log_file, 'ab') as f:
+        f.write(json_line(log_entry))
 
 
 # =============================================================================
@@ -160,11 +197,22 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         "/api": RATE_LIMIT_CONFIG['api_limit'],
     }
     
+    # Paths exempt from rate limiting
+    EXEMPT_PATHS = frozenset({"/health", "/metrics"})
+    
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        # str.startswith checks a tuple of prefixes in one C call
+        self._limited_prefixes = tuple(self.ENDPOINT_LIMITS)
+        # Per-path decisions are cached; bounded so arbitrary paths can't grow it
+        self._get_limit_for_path = lru_cache(maxsize=1024)(self._get_limit_for_path)
+    
     def _get_limit_for_path(self, path: str) -> str:
         """Get rate limit for a specific path"""
-        for pattern, limit in self.ENDPOINT_LIMITS.items():
-            if path.startswith(pattern):
-                return limit
+        if path.startswith(self._limited_prefixes):
+            for pattern, limit in self.ENDPOINT_LIMITS.items():
+                if path.startswith(pattern):
+                    return limit
         return RATE_LIMIT_CONFIG['default_limit']
     
     def _get_client_ip(self, request: Request) -> str:
@@ -179,20 +227,22 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if not RATE_LIMIT_CONFIG['enabled']:
             return await call_next(request)
         
+        path = request.url.path
+        
         # Skip rate limiting for health checks
-        if request.url.path in ["/health", "/metrics"]:
+        if path in self.EXEMPT_PATHS:
             return await call_next(request)
         
         ip = self._get_client_ip(request)
-        limit = self._get_limit_for_path(request.url.path)
-        key = f"{ip}:{request.url.path.split('/')[1]}"  # Group by IP and first path segment
+        limit = self._get_limit_for_path(path)
+        key = f"{ip}:{path.split('/')[1]}"  # Group by IP and first path segment
         
         is_limited, info = await rate_limiter.is_rate_limited(key, limit)
         
         if is_limited:
             log_rate_limit_event(
                 ip_address=ip,
-                endpoint=request.url.path,
+                endpoint=path,
                 limit=limit,
                 exceeded=True,
                 request_count=info.get('current', 0),
@@ -214,10 +264,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             )
         
         # Add rate limit headers to response
+        get = info.get
         response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(info.get('limit', 100))
-        response.headers["X-RateLimit-Remaining"] = str(info.get('remaining', 0))
-        response.headers["X-RateLimit-Reset"] = str(info.get('reset', 0))
+        response.headers.update({
+            "X-RateLimit-Limit": str(get('limit', 100)),
+            "X-RateLimit-Remaining": str(get('remaining', 0)),
+            "X-RateLimit-Reset": str(get('reset', 0)),
+        })
         
         return response
 
@@ -269,28 +322,50 @@ def rate_limit(limit: str = "10/minute"):
 class BruteForceDetector:
     """Detect and respond to brute force attacks"""
     
+    # Idle keys are swept every this many failures, so spraying many
+    # usernames cannot grow the attempts table without bound
+    PRUNE_EVERY = 1000
+    
     def __init__(self, max_attempts: int = 5, window_seconds: int = 300, block_seconds: int = 900):
         self.max_attempts = max_attempts
         self.window_seconds = window_seconds
         self.block_seconds = block_seconds
-        self.attempts: Dict[str, list] = defaultdict(list)
+        # Only the newest max_attempts failures can decide a block, so each
+        # key keeps a bounded, time-ordered deque of monotonic timestamps
+        self.attempts: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.max_attempts))
+        self._failures_since_prune = 0
+    
+    def _prune(self, cutoff: float):
+        """Drop keys whose newest failure has left the window"""
+        stale = [key for key, attempts in self.attempts.items()
+                 if not attempts or attempts[-1] <= cutoff]
+        for key in stale:
+            del self.attempts[key]
     
     async def record_failure(self, ip: str, username: str) -> bool:
         """
         Record a failed login attempt.
         Returns True if IP should be blocked.
         """
-        now = time.time()
+        now = time.monotonic()
         key = f"{ip}:{username}"
+        cutoff = now - self.window_seconds
+        
+        self._failures_since_prune += 1
+        if self._failures_since_prune >= self.PRUNE_EVERY:
+            self._failures_since_prune = 0
+            self._prune(cutoff)
         
         # Clean old attempts
-        self.attempts[key] = [t for t in self.attempts[key] if t > now - self.window_seconds]
+        attempts = self.attempts[key]
+        while attempts and attempts[0] <= cutoff:
+            attempts.popleft()
         
         # Add this attempt
-        self.attempts[key].append(now)
+        attempts.append(now)
         
         # Check if should block
-        if len(self.attempts[key]) >= self.max_attempts:
+        if len(attempts) >= self.max_attempts:
             # Block the IP
             await rate_limiter.block_ip(ip, self.block_seconds)
             
@@ -299,7 +374,7 @@ class BruteForceDetector:
                 endpoint="/auth/login",
                 limit=f"{self.max_attempts}/{self.window_seconds}s",
                 exceeded=True,
-                request_count=len(self.attempts[key]),
+                request_count=len(attempts),
                 details={
                     "username": username,
                     "action": "blocked",
@@ -348,16 +423,12 @@ class RateLimitStats:
             "total_requests": self.total_requests,
             "blocked_requests": self.blocked_requests,
             "block_rate": self.blocked_requests / self.total_requests if self.total_requests > 0 else 0,
-            "top_blocked_endpoints": dict(sorted(
-                self.blocked_by_endpoint.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]),
-            "top_blocked_ips": dict(sorted(
-                self.blocked_by_ip.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]),
+            "top_blocked_endpoints": dict(heapq.nlargest(
+                10, self.blocked_by_endpoint.items(), key=itemgetter(1)
+            )),
+            "top_blocked_ips": dict(heapq.nlargest(
+                10, self.blocked_by_ip.items(), key=itemgetter(1)
+            )),
         }
 
 
@@ -5,9 +5,14 @@ Configurable alerts based on KPI thresholds.
 from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
+from collections import deque
 from enum import Enum
 import json
 import asyncio
+import heapq
+import time
+import operator
+from operator import attrgetter
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -31,7 +36,7 @@ class AlertStatus(Enum):
     RESOLVED = "resolved"
 
 
-@dataclass
+@dataclass(slots=True)
 class Alert:
     """Represents an alert instance"""
     alert_id: str
@@ -64,18 +69,57 @@ class Alert:
         }
 
 
+# Comparison operators accepted in "value <op> <threshold>" rule conditions
+CONDITION_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def compile_condition(condition: str) -> Optional[tuple[Callable, float]]:
+    """Parse "value > 60" into (operator.gt, 60.0); None if it isn't that simple form"""
+    parts = condition.split()
+    if len(parts) != 3 or parts[0] != "value" or parts[1] not in CONDITION_OPERATORS:
+        return None
+    try:
+        return CONDITION_OPERATORS[parts[1]], float(parts[2])
+    except ValueError:
+        return None
+
+
 class AlertManager:
     """
     Manages alert rules, firing, and notification.
     """
     
+    # How long get_alert_summary() may serve a cached result to pollers
+    SUMMARY_TTL_SECONDS = 3.0
+    
+    # Resolved alerts kept in memory; the oldest drop off once full
+    MAX_ALERT_HISTORY = 10000
+    
+    # Upper bound on a single notification channel so a hung SMTP/webhook
+    # peer cannot hold up the others or the rule checker loop
+    NOTIFICATION_TIMEOUT_SECONDS = 15.0
+    
     def __init__(self):
         self.rules = ALERT_CONFIG.get('rules', [])
+        # Rule conditions parsed once; check_rules() runs every 30s
+        self._compiled_conditions = {
+            rule['condition']: compile_condition(rule['condition']) for rule in self.rules
+        }
         self.active_alerts: Dict[str, Alert] = {}
-        self.alert_history: List[Alert] = []
+        self.alert_history: deque = deque(maxlen=self.MAX_ALERT_HISTORY)
         self.cooldowns: Dict[str, datetime] = {}  # rule_name -> last_fired
         self.notification_handlers: Dict[str, Callable] = {}
         
+        # (computed_at_monotonic, summary); dropped whenever alert state changes
+        self._summary_cache: Optional[tuple[float, Dict[str, Any]]] = None
+        
         # Register default handlers
         self._register_default_handlers()
     
@@ -99,10 +143,17 @@ class AlertManager:
         # Simple condition parser for expressions like "value > 60"
         condition = condition.replace("value", str(value))
         try:
-            return eval(condition)
-        except:
+            return bool(eval(condition))
+        except (SyntaxError, NameError, TypeError, ValueError):
             return False
     
+    def _condition_threshold(self, condition: str) -> float:
+        """Threshold of a rule condition, reusing the precompiled value when available"""
+        compiled = self._compiled_conditions.get(condition)
+        if compiled is not None:
+            return compiled[1]
+        return float(condition.split()[-1])
+    
     def _check_cooldown(self, rule_name: str, cooldown_minutes: int) -> bool:
         """Check if alert is in cooldown period"""
         if rule_name not in self.cooldowns:
@@ -118,14 +169,18 @@ class AlertManager:
             rule_name = rule['name']
             kpi = rule['kpi']
             condition = rule['condition']
-            severity = AlertSeverity(rule['severity'])
             cooldown = rule.get('cooldown_minutes', 5)
             
             # Get current KPI value
             current_value = metrics_collector.get_gauge(kpi)
             
-            # Evaluate condition
-            should_fire = self._evaluate_condition(condition, current_value)
+            # Evaluate condition (precompiled comparison, eval() only for other forms)
+            compiled = self._compiled_conditions.get(condition)
+            if compiled is not None:
+                compare, threshold = compiled
+                should_fire = compare(current_value, threshold)
+            else:
+                should_fire = self._evaluate_condition(condition, current_value)
             
             # Check if already firing
             is_firing = rule_name in self.active_alerts
@@ -151,13 +206,14 @@ class AlertManager:
             severity=AlertSeverity(rule['severity']),
             status=AlertStatus.FIRING,
             value=value,
-            threshold=float(rule['condition'].split()[-1]),  # Extract threshold from condition
+            threshold=self._condition_threshold(rule['condition']),
             message=f"{rule['name']}: {rule['kpi']} is {value} ({rule['condition']})",
             fired_at=datetime.utcnow()
         )
         
         self.active_alerts[rule['name']] = alert
         self.cooldowns[rule['name']] = datetime.utcnow()
+        self._summary_cache = None
         
         # Send notifications
         await self._send_notifications(alert)
@@ -174,17 +230,36 @@ class AlertManager:
         # Move to history
         self.alert_history.append(alert)
         del self.active_alerts[rule_name]
+        self._summary_cache = None
         
         # Notify resolution
         await self._send_notifications(alert)
     
     async def _send_notifications(self, alert: Alert):
-        """Send alert notifications via all enabled channels"""
+        """Send alert notifications via all enabled channels concurrently"""
+        pending = []
         for channel_name, handler in self.notification_handlers.items():
+            if asyncio.iscoroutinefunction(handler):
+                pending.append((
+                    channel_name,
+                    asyncio.wait_for(handler(alert), self.NOTIFICATION_TIMEOUT_SECONDS),
+                ))
+                continue
             try:
-                await handler(alert) if asyncio.iscoroutinefunction(handler) else handler(alert)
+                handler(alert)
             except Exception as e:
                 print(f"Failed to send {channel_name} notification: {e}")
+        
+        if not pending:
+            return
+        
+        # Latency is the slowest channel rather than the sum of all of them
+        results = await asyncio.gather(*(coro for _, coro in pending), return_exceptions=True)
+        for (channel_name, _), result in zip(pending, results):
+            if isinstance(result, asyncio.TimeoutError):
+                print(f"Failed to send {channel_name} notification: timed out")
+            elif isinstance(result, Exception):
+                print(f"Failed to send {channel_name} notification: {result}")
     
     def _notify_log(self, alert: Alert):
         """Log alert to file"""
@@ -255,6 +330,7 @@ class AlertManager:
             if alert.alert_id == alert_id:
                 alert.acknowledged = True
                 alert.acknowledged_by = acknowledged_by
+                self._summary_cache = None
                 return True
         return False
     
@@ -264,25 +340,34 @@ class AlertManager:
     
     def get_alert_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get alert history"""
-        return [alert.to_dict() for alert in sorted(
-            self.alert_history,
-            key=lambda x: x.fired_at,
-            reverse=True
-        )[:limit]]
+        newest = heapq.nlargest(limit, self.alert_history, key=attrgetter('fired_at'))
+        return [alert.to_dict() for alert in newest]
     
     def get_alert_summary(self) -> Dict[str, Any]:
-        """Get summary of alert status"""
-        return {
+        """Get summary of alert status (cached for SUMMARY_TTL_SECONDS)"""
+        now = time.monotonic()
+        if self._summary_cache is not None and now - self._summary_cache[0] < self.SUMMARY_TTL_SECONDS:
+            return dict(self._summary_cache[1])
+        
+        critical = warning = unacknowledged = 0
+        for alert in self.active_alerts.values():
+            if alert.severity is AlertSeverity.CRITICAL:
+                critical += 1
+            elif alert.severity is AlertSeverity.WARNING:
+                warning += 1
+            if not alert.acknowledged:
+                unacknowledged += 1
+        
+        cutoff = datetime.utcnow() - timedelta(hours=24)
+        summary = {
             "active_count": len(self.active_alerts),
-            "critical_count": sum(1 for a in self.active_alerts.values() 
-                                   if a.severity == AlertSeverity.CRITICAL),
-            "warning_count": sum(1 for a in self.active_alerts.values() 
-                                  if a.severity == AlertSeverity.WARNING),
-            "unacknowledged_count": sum(1 for a in self.active_alerts.values() 
-                                         if not a.acknowledged),
-            "last_24h_total": sum(1 for a in self.alert_history 
-                                   if a.fired_at > datetime.utcnow() - timedelta(hours=24))
+            "critical_count": critical,
+            "warning_count": warning,
+            "unacknowledged_count": unacknowledged,
+            "last_24h_total": sum(1 for a in self.alert_history if a.fired_at > cutoff)
         }
+        self._summary_cache = (now, summary)
+        return dict(summary)
 
 
 # Global alert manager
@@ -2,23 +2,25 @@
 Monitoring System for DonCoin DAO
 Tracks system KPIs, stores metrics, and provides data for dashboard.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 import json
 import time
-import statistics
 import threading
 from pathlib import Path
 import sys
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from config.settings import MONITORING_KPIS, LOGS_DIR
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricPoint:
     """Single metric data point"""
     timestamp: datetime
@@ -33,19 +35,86 @@ class MetricPoint:
         }
 
 
+class HistogramBuffer:
+    """
+    Fixed-size float64 ring buffer holding the most recent histogram values.
+    Keeps a running sum and monotonic min/max deques so the window's
+    sum, min and max are O(1) to read. An append updates all of these
+    together, so appends and snapshots are serialized by a per-buffer lock.
+    """
+    
+    __slots__ = ("values", "size", "index", "count", "seq", "total", "_min", "_max", "_lock")
+    
+    def __init__(self, size: int):
+        self.values = np.empty(size, dtype=np.float64)
+        self.size = size
+        self.index = 0
+        self.count = 0
+        self.seq = 0  # number of values ever appended
+        self.total = 0.0
+        self._min: deque = deque()  # (seq, value), values increasing
+        self._max: deque = deque()  # (seq, value), values decreasing
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def append(self, value: float):
+        value = float(value)
+        with self._lock:
+            if self.count == self.size:
+                self.total -= float(self.values[self.index])
+            else:
+                self.count += 1
+            self.values[self.index] = value
+            self.total += value
+            self.index = (self.index + 1) % self.size
+            if self.index == 0:
+                # Re-sum once per wrap so float drift never accumulates
+                self.total = float(self.values[:self.count].sum())
+            
+            seq = self.seq
+            self.seq += 1
+            oldest = self.seq - self.size
+            
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((seq, value))
+            if self._min[0][0] < oldest:
+                self._min.popleft()
+            
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((seq, value))
+            if self._max[0][0] < oldest:
+                self._max.popleft()
+    
+    def snapshot(self) -> Tuple[np.ndarray, float, float, float]:
+        """Consistent copy of (filled values, sum, min, max); values in storage order"""
+        with self._lock:
+            return self.values[:self.count].copy(), self.total, self._min[0][1], self._max[0][1]
+
+
 class MetricsCollector:
     """
     Collects and stores metrics for monitoring.
     Provides Prometheus-style metrics exposition.
     """
     
+    HISTOGRAM_SIZE = 1000
+    
     def __init__(self, retention_hours: int = 24):
         self.retention_hours = retention_hours
-        self.metrics: Dict[str, List[MetricPoint]] = defaultdict(list)
+        self.metrics: Dict[str, deque] = defaultdict(deque)
         self.counters: Dict[str, float] = defaultdict(float)
         self.gauges: Dict[str, float] = defaultdict(float)
-        self.histograms: Dict[str, List[float]] = defaultdict(list)
-        self.lock = threading.Lock()
+        self.histograms: Dict[str, HistogramBuffer] = defaultdict(
+            lambda: HistogramBuffer(self.HISTOGRAM_SIZE)
+        )
+        # Counters need locking: their += is a read-modify-write.
+        # Histogram buffers carry their own lock (see HistogramBuffer).
+        # Gauge writes and series appends are single GIL-atomic operations.
+        self._counter_lock = threading.Lock()
         
         # Initialize KPI metrics
         for kpi_id in MONITORING_KPIS:
@@ -54,47 +123,46 @@ class MetricsCollector:
     def _cleanup_old_metrics(self, metric_name: str):
         """Remove metrics older than retention period"""
         cutoff = datetime.utcnow() - timedelta(hours=self.retention_hours)
-        self.metrics[metric_name] = [
-            m for m in self.metrics[metric_name]
-            if m.timestamp > cutoff
-        ]
+        points = self.metrics[metric_name]
+        # Points are appended in time order, so expired ones sit on the left
+        try:
+            while points[0].timestamp <= cutoff:
+                points.popleft()
+        except IndexError:
+            pass
     
     def record_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """Record a gauge metric (current value)"""
-        with self.lock:
-            self.gauges[name] = value
-            self.metrics[name].append(MetricPoint(
-                timestamp=datetime.utcnow(),
-                value=value,
-                labels=labels
-            ))
-            self._cleanup_old_metrics(name)
+        self.gauges[name] = value
+        self.metrics[name].append(MetricPoint(
+            timestamp=datetime.utcnow(),
+            value=value,
+            labels=labels
+        ))
+        self._cleanup_old_metrics(name)
     
     def record_counter(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None):
         """Record a counter metric (cumulative)"""
-        with self.lock:
+        with self._counter_lock:
             self.counters[name] += value
-            self.metrics[name].append(MetricPoint(
-                timestamp=datetime.utcnow(),
-                value=self.counters[name],
-                labels=labels
-            ))
-            self._cleanup_old_metrics(name)
+            total = self.counters[name]
+        self.metrics[name].append(MetricPoint(
+            timestamp=datetime.utcnow(),
+            value=total,
+            labels=labels
+        ))
+        self._cleanup_old_metrics(name)
     
     def record_histogram(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """Record a histogram metric (distribution)"""
-        with self.lock:
-            self.histograms[name].append(value)
-            # Keep only last 1000 values for histogram
-            if len(self.histograms[name]) > 1000:
-                self.histograms[name] = self.histograms[name][-1000:]
-            
-            self.metrics[name].append(MetricPoint(
-                timestamp=datetime.utcnow(),
-                value=value,
-                labels=labels
-            ))
-            self._cleanup_old_metrics(name)
+        # The ring buffer overwrites the oldest value once HISTOGRAM_SIZE is reached
+        self.histograms[name].append(value)
+        self.metrics[name].append(MetricPoint(
+            timestamp=datetime.utcnow(),
+            value=value,
+            labels=labels
+        ))
+        self._cleanup_old_metrics(name)
     
     def get_gauge(self, name: str) -> float:
         """Get current gauge value"""
@@ -106,19 +174,22 @@ class MetricsCollector:
     
     def get_histogram_stats(self, name: str) -> Dict[str, float]:
         """Get histogram statistics"""
-        values = self.histograms.get(name, [])
-        if not values:
+        histogram = self.histograms.get(name)
+        if not histogram:
             return {"count": 0, "mean": 0, "p50": 0, "p95": 0, "p99": 0}
         
-        sorted_vals = sorted(values)
+        values, total, minimum, maximum = histogram.snapshot()
+        n = len(values)
+        ranks = [n // 2, int(n * 0.95), int(n * 0.99)]
+        p50, p95, p99 = np.partition(values, ranks)[ranks]
         return {
-            "count": len(values),
-            "mean": statistics.mean(values),
-            "min": min(values),
-            "max": max(values),
-            "p50": sorted_vals[len(sorted_vals) // 2],
-            "p95": sorted_vals[int(len(sorted_vals) * 0.95)],
-            "p99": sorted_vals[int(len(sorted_vals) * 0.99)]
+            "count": n,
+            "mean": total / n,
+            "min": minimum,
+            "max": maximum,
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99)
         }
     
     def get_metric_history(
@@ -129,17 +200,16 @@ class MetricsCollector:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Get historical metric data"""
-        with self.lock:
-            metrics = self.metrics.get(name, [])
-            
-            if since:
-                metrics = [m for m in metrics if m.timestamp >= since]
-            if until:
-                metrics = [m for m in metrics if m.timestamp <= until]
-            
-            # Return most recent
-            metrics = sorted(metrics, key=lambda x: x.timestamp, reverse=True)[:limit]
-            return [m.to_dict() for m in reversed(metrics)]
+        # list() snapshots the deque atomically, so readers need no lock
+        metrics = list(self.metrics.get(name, ()))
+        
+        if since:
+            metrics = [m for m in metrics if m.timestamp >= since]
+        if until:
+            metrics = [m for m in metrics if m.timestamp <= until]
+        
+        # Return most recent; points are already in time order
+        return [m.to_dict() for m in metrics[-limit:]] if limit > 0 else []
     
     def get_all_kpis(self) -> Dict[str, Dict[str, Any]]:
         """Get all KPI values with their configuration"""
@@ -164,28 +234,34 @@ class MetricsCollector:
         return result
     
     def export_prometheus(self) -> str:
-        """Export metrics in Prometheus format"""
-        lines = []
+        """Export metrics in Prometheus text format"""
+        parts = []
         
         # Gauges
         for name, value in self.gauges.items():
-            lines.append(f"# TYPE {name} gauge")
-            lines.append(f"{name} {value}")
+            parts.append(_series_header(name, "gauge"))
+            parts.append(f"{value}\n")
         
         # Counters
         for name, value in self.counters.items():
-            lines.append(f"# TYPE {name} counter")
-            lines.append(f"{name} {value}")
+            parts.append(_series_header(name, "counter"))
+            parts.append(f"{value}\n")
         
         # Histograms
-        for name, values in self.histograms.items():
-            if values:
-                stats = self.get_histogram_stats(name)
-                lines.append(f"# TYPE {name} histogram")
-                lines.append(f'{name}_count {stats["count"]}')
-                lines.append(f'{name}_sum {sum(values)}')
+        for name, histogram in self.histograms.items():
+            if histogram:
+                values, total, _, _ = histogram.snapshot()
+                parts.append(_series_header(name, "histogram"))
+                parts.append(f"{len(values)}\n{name}_sum {total}\n")
         
-        return "\n".join(lines)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _series_header(name: str, kind: str) -> str:
+    """TYPE line plus sample-name prefix; constant per series, built once"""
+    sample = f"{name}_count" if kind == "histogram" else name
+    return f"# TYPE {name} {kind}\n{sample} "
 
 
 # Global metrics collector
@@ -202,9 +278,23 @@ def record_event_lag(lag_seconds: float):
     metrics_collector.record_histogram("event_lag_distribution", lag_seconds)
 
 
+# Label sets are interned per label combination: every point recorded for
+# the same endpoint shares one dict instead of allocating its own for the
+# whole retention window. The returned dicts are shared and must not be
+# mutated.
+@lru_cache(maxsize=1024)
+def _endpoint_labels(endpoint: str) -> Dict[str, str]:
+    return {"endpoint": endpoint}
+
+
+@lru_cache(maxsize=1024)
+def _error_labels(endpoint: str, error_type: str) -> Dict[str, str]:
+    return {"endpoint": endpoint, "type": error_type}
+
+
 def record_api_latency(latency_ms: float, endpoint: str = ""):
     """Record API response latency"""
-    metrics_collector.record_histogram("api_response_latency", latency_ms, {"endpoint": endpoint})
+    metrics_collector.record_histogram("api_response_latency", latency_ms, _endpoint_labels(endpoint))
     
     # Update P95 gauge
     stats = metrics_collector.get_histogram_stats("api_response_latency")
@@ -213,7 +303,7 @@ def record_api_latency(latency_ms: float, endpoint: str = ""):
 
 def record_error(endpoint: str = "", error_type: str = ""):
     """Record an API error"""
-    metrics_collector.record_counter("error_count", 1, {"endpoint": endpoint, "type": error_type})
+    metrics_collector.record_counter("error_count", 1, _error_labels(endpoint, error_type))
     metrics_collector.record_counter("request_count", 1)
     
     # Calculate error rate (simple moving window)
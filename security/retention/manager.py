@@ -5,12 +5,15 @@ Manages data lifecycle, archiving, and deletion policies.
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from pathlib import Path
+from itertools import compress
 import json
 import os
 import shutil
 import gzip
 import sys
 
+import pandas as pd
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from config.settings import DATA_RETENTION_CONFIG, LOGS_DIR
@@ -89,34 +92,31 @@ class DataRetentionManager:
         archive_threshold = datetime.utcnow() - timedelta(days=archive_days)
         delete_threshold = datetime.utcnow() - timedelta(days=retention_days)
         
-        keep_entries = []
-        archive_entries = []
-        delete_count = 0
-        
-        # Process JSONL file
+        # Read every entry first, then classify them all in one vectorized
+        # pass. Entries without a parseable timestamp are kept.
+        lines = []
+        timestamps = []
         with open(log_file, 'r') as f:
             for line in f:
                 if not line.strip():
                     continue
-                
+                lines.append(line)
                 try:
-                    entry = json.loads(line)
-                    timestamp_str = entry.get('timestamp')
-                    if not timestamp_str:
-                        keep_entries.append(line)
-                        continue
-                    
-                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    
-                    if timestamp < delete_threshold:
-                        delete_count += 1
-                    elif timestamp < archive_threshold:
-                        archive_entries.append(line)
-                    else:
-                        keep_entries.append(line)
-                
-                except (json.JSONDecodeError, ValueError):
-                    keep_entries.append(line)
+                    timestamps.append(json.loads(line).get('timestamp'))
+                except (json.JSONDecodeError, AttributeError):
+                    timestamps.append(None)
+        
+        # Naive timestamps are written with utcnow(), so read everything as UTC
+        parsed = pd.to_datetime(
+            pd.Series(timestamps, dtype=object), utc=True, format='ISO8601', errors='coerce'
+        )
+        delete_mask = (parsed < pd.Timestamp(delete_threshold, tz='UTC')).to_numpy()
+        archive_mask = (parsed < pd.Timestamp(archive_threshold, tz='UTC')).to_numpy() & ~delete_mask
+        keep_mask = ~(delete_mask | archive_mask)
+        
+        keep_entries = list(compress(lines, keep_mask))
+        archive_entries = list(compress(lines, archive_mask))
+        delete_count = int(delete_mask.sum())
         
         # Archive old entries
         if archive_entries:
@@ -124,13 +124,11 @@ class DataRetentionManager:
             archive_file.parent.mkdir(parents=True, exist_ok=True)
             
             with gzip.open(archive_file, 'at') as f:
-                for entry in archive_entries:
-                    f.write(entry)
+                f.writelines(archive_entries)
         
         # Rewrite log file with kept entries
         with open(log_file, 'w') as f:
-            for entry in keep_entries:
-                f.write(entry)
+            f.writelines(keep_entries)
         
         result = {
             'status': 'success',
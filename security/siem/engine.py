@@ -6,15 +6,15 @@ from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
-import json
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from config.settings import SIEM_CONFIG, LOGS_DIR
+from utils.jsonl import json_line
 
 
 class EventCategory(Enum):
@@ -42,7 +42,10 @@ class CaseStatus(Enum):
     FALSE_POSITIVE = "false_positive"
 
 
-@dataclass
+CLOSED_CASE_STATUSES = frozenset({CaseStatus.RESOLVED, CaseStatus.FALSE_POSITIVE})
+
+
+@dataclass(slots=True)
 class SecurityEvent:
     """Represents a security-relevant event"""
     event_id: str
@@ -69,7 +72,7 @@ class SecurityEvent:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityCase:
     """Represents a security incident/case for investigation"""
     case_id: str
@@ -116,18 +119,25 @@ class CorrelationRule:
         self.action = action
         self.window_seconds = window_seconds
         self.threshold = threshold
+        
+        # Simple pattern matching for demo; the pattern text is interpreted
+        # once here rather than re-scanned for every event
+        pattern_lower = pattern.lower()
+        self.category: Optional[EventCategory] = None
+        self.outcome: Optional[str] = None
+        if "failed login" in pattern_lower:
+            self.category = EventCategory.AUTHENTICATION
+            self.outcome = "failure"
+        elif "rate limit" in pattern_lower:
+            self.category = EventCategory.RATE_LIMIT
     
     def matches(self, event: SecurityEvent) -> bool:
         """Check if event matches this rule's pattern"""
-        # Simple pattern matching for demo
-        if "failed login" in self.pattern.lower():
-            return (
-                event.category == EventCategory.AUTHENTICATION and
-                event.outcome == "failure"
-            )
-        elif "rate limit" in self.pattern.lower():
-            return event.category == EventCategory.RATE_LIMIT
-        return False
+        return (
+            self.category is not None and
+            event.category is self.category and
+            (self.outcome is None or event.outcome == self.outcome)
+        )
 
 
 class SIEMEngine:
@@ -135,17 +145,39 @@ class SIEMEngine:
     SIEM Engine for log collection, normalization, and correlation.
     """
     
+    # In-memory search window; the full stream is persisted to the log file
+    MAX_EVENTS = 10000
+    
+    # Window for the "last 24h" figures in get_case_summary
+    CASE_SUMMARY_WINDOW = timedelta(hours=24)
+    
     def __init__(self):
-        self.events: List[SecurityEvent] = []
+        self.events: deque = deque(maxlen=self.MAX_EVENTS)
         self.cases: Dict[str, SecurityCase] = {}
         self.event_counter = 0
         self.case_counter = 0
         
+        # Case summary state, kept up to date as cases open and close so the
+        # summary never walks every case ever created
+        self._open_cases_by_severity: Counter = Counter()
+        self._cases_created: deque = deque()  # created_at, oldest first
+        self._cases_closed: deque = deque()  # (closed_at, case), oldest first
+        
+        # Event log destination, resolved once rather than per event
+        self.log_file = Path(SIEM_CONFIG['log_file'])
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        
         # Event buffers for correlation
-        self.event_buffers: Dict[str, List[SecurityEvent]] = defaultdict(list)
+        # "rule:ip" -> time-ordered events inside the rule's window
+        self.event_buffers: Dict[str, deque] = defaultdict(deque)
         
-        # Load correlation rules from config
+        # Load correlation rules from config, indexed by the event category
+        # they watch so each event only visits rules that can match it
         self.correlation_rules = self._load_correlation_rules()
+        self._rules_by_category: Dict[EventCategory, List[CorrelationRule]] = defaultdict(list)
+        for rule in self.correlation_rules:
+            if rule.category is not None:
+                self._rules_by_category[rule.category].append(rule)
         
         # Response playbooks
         self.playbooks: Dict[str, Callable] = {}
@@ -215,31 +247,28 @@ class SIEMEngine:
     
     def _write_event_log(self, event: SecurityEvent):
         """Write event to SIEM log file"""
-        log_file = Path(SIEM_CONFIG['log_file'])
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(event.to_dict()) + '\n')
+        with open(self.log_file, 'ab') as f:
+            f.write(json_line(event.to_dict()))
     
     def _correlate_event(self, event: SecurityEvent):
         """Correlate event against rules"""
-        for rule in self.correlation_rules:
+        for rule in self._rules_by_category.get(event.category, ()):
             if rule.matches(event):
                 # Add to buffer for this rule
                 buffer_key = f"{rule.name}:{event.source_ip}"
-                self.event_buffers[buffer_key].append(event)
+                buffer = self.event_buffers[buffer_key]
+                buffer.append(event)
                 
-                # Clean old events from buffer
-                cutoff = datetime.utcnow() - timedelta(seconds=rule.window_seconds)
-                self.event_buffers[buffer_key] = [
-                    e for e in self.event_buffers[buffer_key]
-                    if e.timestamp > cutoff
-                ]
+                # Clean old events from buffer; they are in arrival order,
+                # so expired ones are all at the left end
+                cutoff = event.timestamp - timedelta(seconds=rule.window_seconds)
+                while buffer[0].timestamp <= cutoff:
+                    buffer.popleft()
                 
                 # Check threshold
-                if len(self.event_buffers[buffer_key]) >= rule.threshold:
-                    self._trigger_correlation(rule, self.event_buffers[buffer_key])
-                    self.event_buffers[buffer_key] = []  # Clear buffer
+                if len(buffer) >= rule.threshold:
+                    del self.event_buffers[buffer_key]  # Clear buffer
+                    self._trigger_correlation(rule, list(buffer))
     
     def _trigger_correlation(self, rule: CorrelationRule, events: List[SecurityEvent]):
         """Trigger correlation match - create case and execute playbook"""
@@ -255,6 +284,8 @@ class SIEMEngine:
         )
         
         self.cases[case.case_id] = case
+        self._open_cases_by_severity[case.severity] += 1
+        self._cases_created.append(case.created_at)
         
         # Execute playbook
         if rule.action in self.playbooks:
@@ -346,9 +377,14 @@ class SIEMEngine:
             return None
         
         if status:
+            was_open = case.status not in CLOSED_CASE_STATUSES
             case.status = status
-            if status in [CaseStatus.RESOLVED, CaseStatus.FALSE_POSITIVE]:
+            if status in CLOSED_CASE_STATUSES:
                 case.closed_at = datetime.utcnow()
+                self._cases_closed.append((case.closed_at, case))
+            is_open = status not in CLOSED_CASE_STATUSES
+            if was_open != is_open:
+                self._open_cases_by_severity[case.severity] += 1 if is_open else -1
         
         if assignee:
             case.assignee = assignee
@@ -368,19 +404,24 @@ class SIEMEngine:
     
     def get_case_summary(self) -> Dict[str, Any]:
         """Get summary of case statistics"""
-        now = datetime.utcnow()
-        last_24h = now - timedelta(hours=24)
+        last_24h = datetime.utcnow() - self.CASE_SUMMARY_WINDOW
+        
+        # Both deques are in time order, so entries leaving the window are
+        # all at the left end
+        created = self._cases_created
+        while created and created[0] <= last_24h:
+            created.popleft()
+        closed = self._cases_closed
+        while closed and closed[0][0] <= last_24h:
+            closed.popleft()
         
         return {
             "total_cases": len(self.cases),
-            "open_cases": sum(1 for c in self.cases.values() 
-                              if c.status not in [CaseStatus.RESOLVED, CaseStatus.FALSE_POSITIVE]),
-            "critical_open": sum(1 for c in self.cases.values()
-                                  if c.severity == CaseSeverity.CRITICAL and
-                                  c.status not in [CaseStatus.RESOLVED, CaseStatus.FALSE_POSITIVE]),
-            "new_last_24h": sum(1 for c in self.cases.values() if c.created_at > last_24h),
-            "resolved_last_24h": sum(1 for c in self.cases.values() 
-                                      if c.closed_at and c.closed_at > last_24h)
+            "open_cases": sum(self._open_cases_by_severity.values()),
+            "critical_open": self._open_cases_by_severity[CaseSeverity.CRITICAL],
+            "new_last_24h": len(created),
+            # A case closed twice only counts under its latest closed_at
+            "resolved_last_24h": sum(1 for closed_at, c in closed if c.closed_at is closed_at)
         }
     
     def search_events(
@@ -200,6 +200,25 @@ class TestMonitoring:
         collector.record_counter("test_counter", 5)
         assert collector.get_counter("test_counter") == 6
     
+    def test_metrics_counter_concurrent(self):
+        """Test concurrent increments are not lost"""
+        import threading
+        from monitoring.metrics import MetricsCollector
+        
+        collector = MetricsCollector()
+        
+        def bump():
+            for _ in range(1000):
+                collector.record_counter("test_concurrent_counter", 1)
+        
+        threads = [threading.Thread(target=bump) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert collector.get_counter("test_concurrent_counter") == 4000
+    
     def test_metrics_histogram(self):
         """Test histogram metric recording"""
         from monitoring.metrics import MetricsCollector
@@ -216,6 +235,58 @@ class TestMonitoring:
         assert stats['min'] == 10
         assert stats['max'] == 50
     
+    def test_prometheus_export_format(self):
+        """Test Prometheus text output for each series type"""
+        from monitoring.metrics import MetricsCollector
+        
+        collector = MetricsCollector()
+        collector.record_gauge("test_gauge", 1.5)
+        collector.record_counter("test_counter", 2)
+        collector.record_histogram("test_hist", 10)
+        collector.record_histogram("test_hist", 30)
+        
+        output = collector.export_prometheus()
+        assert "# TYPE test_gauge gauge\ntest_gauge 1.5\n" in output
+        assert "# TYPE test_counter counter\ntest_counter 2.0\n" in output
+        assert output.endswith("# TYPE test_hist histogram\ntest_hist_count 2\ntest_hist_sum 40.0\n")
+    
+    def test_histogram_concurrent_appends(self):
+        """Test concurrent writers keep the histogram window consistent"""
+        import threading
+        from monitoring.metrics import MetricsCollector
+        
+        collector = MetricsCollector()
+        size = collector.HISTOGRAM_SIZE
+        
+        def write(offset):
+            for i in range(size):
+                collector.record_histogram("test_concurrent", float(offset + i % 100))
+        
+        threads = [threading.Thread(target=write, args=(k * 1000,)) for k in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        values, total, minimum, maximum = collector.histograms["test_concurrent"].snapshot()
+        assert len(values) == size
+        assert total == pytest.approx(values.sum())
+        assert minimum == values.min()
+        assert maximum == values.max()
+    
+    def test_api_latency_visible_immediately(self):
+        """Test a recorded latency updates the P95 gauge without a later call"""
+        from monitoring.metrics import metrics_collector, record_api_latency
+        
+        record_api_latency(125.0, "/api/v1/kpis")
+        
+        stats = metrics_collector.get_histogram_stats("api_response_latency")
+        assert metrics_collector.get_gauge("api_response_latency") == stats['p95']
+        latest = metrics_collector.get_metric_history("api_response_latency", limit=1)[0]
+        assert latest['value'] == stats['p95']
+        history = metrics_collector.get_metric_history("api_response_latency", limit=2)
+        assert {"endpoint": "/api/v1/kpis"} in [point['labels'] for point in history]
+    
     def test_kpi_status_calculation(self):
         """Test KPI status calculation based on thresholds"""
         from monitoring.metrics import MetricsCollector
@@ -312,6 +383,48 @@ class TestAlerting:
         assert result is True
         assert test_alert.acknowledged is True
         assert test_alert.acknowledged_by == "testuser"
+    
+    def test_compiled_conditions_match_eval(self):
+        """Test precompiled rule conditions agree with the eval() parser"""
+        from monitoring.alerting import AlertManager, compile_condition
+        
+        manager = AlertManager()
+        
+        for rule in manager.rules:
+            compiled = compile_condition(rule['condition'])
+            assert compiled is not None
+            op, threshold = compiled
+            for value in (threshold - 1, threshold, threshold + 1):
+                assert op(value, threshold) == manager._evaluate_condition(rule['condition'], value)
+    
+    def test_alert_summary_counts(self):
+        """Test alert summary counts by severity and acknowledgment"""
+        from monitoring.alerting import Alert, AlertSeverity, AlertStatus, AlertManager
+        
+        manager = AlertManager()
+        
+        def make_alert(name, severity, fired_at):
+            return Alert(
+                alert_id=name, name=name, kpi="test", severity=severity,
+                status=AlertStatus.FIRING, value=100, threshold=50,
+                message="Test", fired_at=fired_at
+            )
+        
+        now = datetime.utcnow()
+        manager.active_alerts["a"] = make_alert("a", AlertSeverity.CRITICAL, now)
+        manager.active_alerts["b"] = make_alert("b", AlertSeverity.WARNING, now)
+        manager.active_alerts["b"].acknowledged = True
+        manager.active_alerts["c"] = make_alert("c", AlertSeverity.INFO, now)
+        manager.alert_history.append(make_alert("old", AlertSeverity.INFO, now - timedelta(hours=30)))
+        manager.alert_history.append(make_alert("new", AlertSeverity.INFO, now - timedelta(hours=1)))
+        
+        assert manager.get_alert_summary() == {
+            "active_count": 3,
+            "critical_count": 1,
+            "warning_count": 1,
+            "unacknowledged_count": 2,
+            "last_24h_total": 1
+        }
 
 
 # =============================================================================
@@ -364,7 +477,24 @@ class TestSIEM:
         # Search by outcome
         results = engine.search_events(outcome="failure")
         assert all(r['outcome'] == 'failure' for r in results)
-    
+
+    def test_event_dict_follows_category(self):
+        """Test that serialization reads the event's current category"""
+        from siem.engine import SIEMEngine, EventCategory
+
+        engine = SIEMEngine()
+        event = engine.ingest_event(
+            category=EventCategory.DATA_ACCESS,
+            source_ip="192.168.1.50",
+            action="read",
+            resource="/api/v1/siem/events",
+            outcome="success"
+        )
+        assert event.to_dict()['category'] == "data_access"
+
+        event.category = EventCategory.SUSPICIOUS_ACTIVITY
+        assert event.to_dict()['category'] == "suspicious_activity"
+
     def test_case_creation_on_correlation(self):
         """Test that cases are created when correlation rules match"""
         from siem.engine import SIEMEngine, EventCategory
@@ -387,6 +517,203 @@ class TestSIEM:
         # Note: Case creation depends on threshold in correlation rules
 
 
+# =============================================================================
+# DASHBOARD DATA TESTS
+# =============================================================================
+
+class TestSIEMDashboardData:
+    """Tests for the SOC dashboard log helpers"""
+
+    def test_csv_export_format(self, monkeypatch):
+        """Test CSV export output is byte-for-byte stable"""
+        from dashboard import siem_data
+
+        events = [
+            {"timestamp": "2024-01-01T00:00:00", "status_code": 200, "user": None,
+             "action": 'say "hi", bye'},
+            {"timestamp": "2024-01-01T00:01:00", "action": "line1\nline2"},
+        ]
+        monkeypatch.setattr(siem_data, "search_logs", lambda **params: events)
+
+        assert siem_data.export_logs(format="csv") == (
+            "action,status_code,timestamp,user\n"
+            'say "hi"; bye,200,2024-01-01T00:00:00,None\n'
+            "line1 line2,,2024-01-01T00:01:00,"
+        )
+
+    def test_csv_export_empty(self, monkeypatch):
+        """Test CSV export header when nothing matches"""
+        from dashboard import siem_data
+
+        monkeypatch.setattr(siem_data, "search_logs", lambda **params: [])
+
+        assert siem_data.export_logs(format="csv") == "timestamp,source,category,action,outcome\n"
+
+    def test_follow_lines_appends(self, tmp_path):
+        """Test that later polls pick up appended lines"""
+        from dashboard.siem_data import follow_lines
+
+        log = tmp_path / "events.jsonl"
+        log.write_text("a\nb\nc\n")
+        assert follow_lines(log, 2) == ["b", "c"]
+
+        with open(log, "a") as f:
+            f.write("d\ne")  # "e" is still being written
+        assert follow_lines(log, 2) == ["c", "d"]
+
+        with open(log, "a") as f:
+            f.write("\nf\n")
+        assert follow_lines(log, 2) == ["e", "f"]
+
+    def test_follow_lines_rotation(self, tmp_path):
+        """Test that a replaced or truncated file is read from scratch"""
+        import os
+        from dashboard.siem_data import follow_lines
+
+        log = tmp_path / "events.jsonl"
+        log.write_text("a\nb\n")
+        assert follow_lines(log, 3) == ["a", "b"]
+
+        rotated = tmp_path / "events.jsonl.new"
+        rotated.write_text("x\ny\n")
+        os.replace(rotated, log)  # new inode
+        assert follow_lines(log, 3) == ["x", "y"]
+
+        log.write_text("z\n")  # same inode, shrunk
+        assert follow_lines(log, 3) == ["z"]
+
+    def test_follow_lines_concurrent_polls(self, tmp_path):
+        """Test that concurrent polls do not duplicate appended lines"""
+        import threading
+        from dashboard.siem_data import follow_lines
+
+        log = tmp_path / "events.jsonl"
+        log.write_text("".join(f"{i}\n" for i in range(10)))
+        follow_lines(log, 50)
+        with open(log, "a") as f:
+            f.write("".join(f"{i}\n" for i in range(10, 20)))
+
+        results = []
+        barrier = threading.Barrier(8)
+
+        def poll():
+            barrier.wait()
+            results.append(follow_lines(log, 50))
+
+        threads = [threading.Thread(target=poll) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        expected = [str(i) for i in range(20)]
+        assert all(r == expected for r in results)
+
+    def test_read_jsonl_limit_counts_entries(self, tmp_path):
+        """Test that the limit counts parsed entries, not raw tail lines"""
+        import json
+        from dashboard.siem_data import _read_jsonl_file
+
+        log = tmp_path / "events.jsonl"
+        lines = [json.dumps({"n": i}) for i in range(4)] + ["", "not json"] * 20
+        log.write_text("\n".join(lines) + "\n")
+
+        assert _read_jsonl_file(log, 3) == [{"n": 1}, {"n": 2}, {"n": 3}]
+        # Fewer entries than the limit: everything in the file
+        assert _read_jsonl_file(log, 10) == [{"n": i} for i in range(4)]
+        assert _read_jsonl_file(log, 0) == []
+
+    def test_connections_skip_malformed_lines(self, tmp_path, monkeypatch):
+        """Test that malformed lines do not shorten the connections list"""
+        import json
+        from dashboard import geo_data
+
+        log = tmp_path / "connections.jsonl"
+        lines = [json.dumps({"ip": f"10.0.0.{i}"}) for i in range(6)]
+        lines.insert(4, "not json")
+        lines.insert(2, '{"ip": "10.0.0.')  # torn write
+        lines[-1:-1] = ["not json"] * 5
+        log.write_text("\n".join(lines) + "\n\n")
+        monkeypatch.setattr(geo_data, "CONNECTIONS_LOG_FILE", log)
+
+        connections = geo_data.get_connections(limit=3)
+
+        assert [c["ip"] for c in connections] == ["10.0.0.5", "10.0.0.4", "10.0.0.3"]
+
+    def test_blocked_since_window(self):
+        """Test the 24h blocked-request window matches parsing each timestamp"""
+        from dashboard.firewall_data import _blocked_since
+
+        now = datetime(2024, 1, 2, 12, 0, 0)
+        requests = [
+            {"ip": str(i), "timestamp": (now - timedelta(hours=h)).isoformat()}
+            for i, h in enumerate([48, 30, 24, 23.5, 1, 0])
+        ]
+        cutoff = now - timedelta(hours=24)
+
+        expected = [r for r in requests if datetime.fromisoformat(r["timestamp"]) >= cutoff]
+        assert _blocked_since(requests, cutoff) == expected
+        assert [r["ip"] for r in expected] == ["2", "3", "4", "5"]
+
+
+class TestJSONLines:
+    """Tests for the shared JSONL log serializer"""
+
+    def test_json_line(self):
+        """Test one newline-terminated JSON object per entry"""
+        import json
+        from utils.jsonl import json_line
+
+        entry = {"ip": "10.0.0.1", "count": 3, "details": {"ok": True, "user": None}}
+        line = json_line(entry)
+
+        assert line.endswith(b"\n") and line.count(b"\n") == 1
+        assert json.loads(line) == entry
+
+    def test_json_line_big_int(self):
+        """Test values orjson rejects still serialize"""
+        import json
+        from utils.jsonl import json_line
+
+        assert json.loads(json_line({"value": 2 ** 70})) == {"value": 2 ** 70}
+
+
+# =============================================================================
+# RETENTION TESTS
+# =============================================================================
+
+class TestRetention:
+    """Tests for data retention policies"""
+    
+    def test_log_rotation_classification(self, tmp_path):
+        """Test rotation keeps, archives and deletes entries by age"""
+        import gzip
+        import json
+        from retention.manager import DataRetentionManager
+        
+        manager = DataRetentionManager(archive_dir=tmp_path / "archive")
+        now = datetime.utcnow()
+        lines = [
+            json.dumps({"id": "recent", "timestamp": (now - timedelta(days=1)).isoformat()}),
+            json.dumps({"id": "old", "timestamp": (now - timedelta(days=60)).isoformat()}),
+            json.dumps({"id": "expired", "timestamp": (now - timedelta(days=120)).isoformat() + "Z"}),
+            json.dumps({"id": "no_timestamp"}),
+            json.dumps({"id": "bad_timestamp", "timestamp": "yesterday"}),
+            "not json",
+        ]
+        log = tmp_path / "api.jsonl"
+        log.write_text("\n".join(lines) + "\n")
+        
+        result = manager.process_log_rotation(log, "off_chain_operational")
+        
+        assert result == {'status': 'success', 'kept': 4, 'archived': 1, 'deleted': 1}
+        kept = log.read_text().splitlines()
+        assert kept == [lines[0], lines[3], lines[4], lines[5]]
+        archive, = (tmp_path / "archive" / "off_chain_operational").glob("*.jsonl.gz")
+        with gzip.open(archive, 'rt') as f:
+            assert f.read().splitlines() == [lines[1]]
+
+
 # =============================================================================
 # INTEGRATION TESTS
 # =============================================================================
@@ -405,6 +732,19 @@ class TestAPIIntegration:
         assert response.status_code == 200
         assert response.json()["status"] == "healthy"
     
+    def test_health_timestamp_is_aware_utc(self):
+        """Test health timestamp is timezone-aware UTC"""
+        from fastapi.testclient import TestClient
+        from api.endpoints import app
+        
+        client = TestClient(app)
+        first = datetime.fromisoformat(client.get("/health").json()["timestamp"])
+        second = datetime.fromisoformat(client.get("/health").json()["timestamp"])
+        
+        assert first.utcoffset() == timedelta(0)
+        assert second >= first
+        assert second - first < timedelta(seconds=1)
+    
     def test_login_flow(self):
         """Test complete login flow"""
         from fastapi.testclient import TestClient
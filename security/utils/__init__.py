@@ -0,0 +1,7 @@
+# Shared helpers for the security services
+from .jsonl import json_line, ORJSON_AVAILABLE
+
+__all__ = [
+    'json_line',
+    'ORJSON_AVAILABLE',
+]
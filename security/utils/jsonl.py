@@ -0,0 +1,22 @@
+"""
+JSONL log line serialization shared by the security services.
+"""
+from typing import Dict, Any
+import json
+
+# Use orjson for log lines when installed, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_line(obj: Dict[str, Any]) -> bytes:
+    """Serialize a log entry to one newline-terminated JSON line"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # Types orjson rejects (e.g. ints > 64 bit) go through json
+    return (json.dumps(obj) + '\n').encode()